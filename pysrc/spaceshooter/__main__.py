@@ -5,11 +5,12 @@ Main launcher
 """
 
 import sys
-import random
 import getopt
 from spaceshooter.arena import SpaceShooter, Controller, Arena
 from spaceshooter.game import Game
-from spaceshooter.sdefs import ARENA_HEIGHT, ARENA_WIDTH
+from spaceshooter.replay import Recorder, game_header
+from spaceshooter.sdefs import ARENA_HEIGHT, ARENA_WIDTH, KEYFRAME_TICKS,\
+    CHECK_TICKS
 from spaceshooter.stypes import Board
 
 
@@ -27,6 +28,10 @@ def __usage__(msg=None):
     print("-f font-name -- use font-name for default font",)
     print("-w -- use windowing mode instead of full screen",)
     print("-r -- reset any previous settings (including hi scores, so beware!),")
+    print("-s seed -- session random seed (the same seed plays the same game)")
+    print("-o file -- record all the input to a replay file")
+    print("-t ticks -- turbo mode: run as fast as possible, repaint every ticks (0: never)")
+    print("-a -- autopilot: the game plays itself (soak and benchmark runs)")
     print("-h -- print this help message and terminate")
     print()
     print("That's all, folks!")
@@ -35,9 +40,13 @@ def __usage__(msg=None):
 if __name__ == "__main__":
     startup_params = {'lastfont': None,
                       'windowing': False,
-                      'reset': False}
+                      'reset': False,
+                      'turbo': None,
+                      'seed': None,
+                      'record': None,
+                      'autopilot': False}
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "wf:hr", [])
+        opts, args = getopt.getopt(sys.argv[1:], "wf:hrt:s:o:a", [])
         for o, a in opts:
             if o == "-f":
                 if a.strip():
@@ -49,13 +58,28 @@ if __name__ == "__main__":
                 startup_params['windowing'] = True
             elif o == '-r':
                 startup_params['reset'] = True
+            elif o == '-t':
+                try:
+                    startup_params['turbo'] = int(a)
+                except ValueError:
+                    __usage__(f"Invalid number of ticks: {a}")
+                    sys.exit(1)
+            elif o == '-s':
+                try:
+                    startup_params['seed'] = int(a)
+                except ValueError:
+                    __usage__(f"Invalid seed: {a}")
+                    sys.exit(1)
+            elif o == '-o':
+                startup_params['record'] = a
+            elif o == '-a':
+                startup_params['autopilot'] = True
             else:
                 __usage__(f"Unknown option: {o}")
                 sys.exit(1)
     except getopt.GetoptError as ge:
         __usage__(str(ge))
         sys.exit(1)
-    random.seed()
     shooter = SpaceShooter(sys.argv)
     shooter.game = Game(shooter, startup_params)
     window = Controller(shooter)
@@ -70,5 +94,16 @@ if __name__ == "__main__":
         window.show()
     else:
         window.showFullScreen()
+    if startup_params['turbo'] is not None:
+        shooter.game.set_turbo(True, startup_params['turbo'])
+    if startup_params['record']:
+        shooter.game.start_recording(Recorder(startup_params['record'],
+                                              game_header(shooter.game),
+                                              keyframe_every=KEYFRAME_TICKS,
+                                              check_every=CHECK_TICKS))
     shooter.game.change_board(Board.WELCOME)
-    sys.exit(shooter.exec())
+    if startup_params['autopilot']:
+        shooter.game.set_autopilot(True)
+    status = shooter.exec()
+    shooter.game.stop_recording()
+    sys.exit(status)
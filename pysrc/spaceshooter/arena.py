@@ -5,8 +5,7 @@ Game Arena (Qt implementation)
 """
 
 # Standard library imports
-import random
-from importlib import resources
+import os
 
 # PySide imports
 from PySide6.QtWidgets import QApplication
@@ -26,10 +25,12 @@ from PySide6.QtCore import Qt
 
 # Local imports
 from spaceshooter.sdefs import ARENA_WIDTH, ARENA_HEIGHT, BOTTOM_BAR,\
-    STAGE_HEIGHT, MAX_NICK_LEN, DEFAULT_FONT
+    STAGE_HEIGHT, MAX_NICK_LEN, DEFAULT_FONT, TIMEOUT_PAINT
 from spaceshooter.slocales import locales
 from spaceshooter.stypes import MouseButton, MouseEvent, Mode, UserInput, \
-    SetupMode, Key, MovableType, MissileType, Board
+    SetupMode, Key, MovableType, Board
+from spaceshooter.sprites import IMAGES_PATH, sprite_files, map_sprites, register_sprites,\
+    sprite_meta
 
 APPLICATION_TITLE = "SpaceShooter"
 
@@ -194,12 +195,12 @@ class Arena(QLabel):
             self.shooter.brushes['bottom-bar'])
         # Indykatory
         indcolor = 'green'
-        if self.game.indicators < 7:
+        if self.game.state.indicators < 7:
             indcolor = 'yellow'
-        if self.game.indicators < 4:
+        if self.game.state.indicators < 4:
             indcolor = 'red'
         for ind in range(0, 10):
-            if ind < self.game.indicators:
+            if ind < self.game.state.indicators:
                 painter.drawPixmap(
                     10 + ind * 35,
                     STAGE_HEIGHT + 20,
@@ -209,7 +210,7 @@ class Arena(QLabel):
                     10 + ind * 35,
                     STAGE_HEIGHT + 20,
                     self.shooter.images['indicators']['black'])
-        for ind in range(self.game.lives):
+        for ind in range(self.game.state.lives):
             painter.drawPixmap(
                 380 + 50 * ind,
                 STAGE_HEIGHT + 20,
@@ -218,12 +219,12 @@ class Arena(QLabel):
         painter.setPen(self.shooter.pens['textbottom'])
         x = 600
         # TNT counter
-        if self.game.tnt > 0:
+        if self.game.state.tnt > 0:
             painter.drawPixmap(
                 x,
                 STAGE_HEIGHT + 10,
                 self.shooter.images['indicators']['tnt'])
-            text = f'{self.game.tnt:02}'
+            text = f'{self.game.state.tnt:02}'
             x += 60
             painter.drawText(
                 x,
@@ -231,12 +232,12 @@ class Arena(QLabel):
                 text)
             x += self.metrics['status-line'].horizontalAdvance(text) + 20
         # Shield Timer
-        if self.game.shield_timer > 0:
+        if self.game.state.is_active('shield'):
             painter.drawPixmap(
                 x,
                 STAGE_HEIGHT + 10,
                 self.shooter.images['indicators']['shield'])
-            text = f'{self.game.shield_timer:02}'
+            text = f'{self.game.state.seconds_left("shield"):02}'
             x += 50
             painter.drawText(
                 x,
@@ -244,12 +245,12 @@ class Arena(QLabel):
                 text)
             x += self.metrics['status-line'].horizontalAdvance(text) + 20
         # LightBall Timer
-        if self.game.lightball_timer > 0:
+        if self.game.state.is_active('light'):
             painter.drawPixmap(
                 x,
                 STAGE_HEIGHT + 5,
                 self.shooter.images['indicators']['light-ball'])
-            text = f'{self.game.lightball_timer:02}'
+            text = f'{self.game.state.seconds_left("light"):02}'
             x += 60
             painter.drawText(
                 x,
@@ -257,20 +258,20 @@ class Arena(QLabel):
                 text)
             x += self.metrics['status-line'].horizontalAdvance(text) + 20
         # Frozen Timer
-        if self.game.frozen_timer > 0:
+        if self.game.state.is_active('freeze'):
             painter.drawPixmap(
                 x,
                 STAGE_HEIGHT + 5,
                 self.shooter.images['indicators']['frozen-box'])
-            text = f'{self.game.frozen_timer:02}'
+            text = f'{self.game.state.seconds_left("freeze"):02}'
             x += 60
             painter.drawText(
                 x,
                 STAGE_HEIGHT + 50,
                 text)
         # Punkty:
-        if self.game.points > 0:
-            text = f'P: {self.game.points:04}'
+        if self.game.state.points > 0:
+            text = f'P: {self.game.state.points:04}'
             w = self.metrics['status-line'].horizontalAdvance(text) + 20
             painter.drawText(
                 ARENA_WIDTH - w,
@@ -295,7 +296,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         self.painter.setFont(self.fonts['logo'])
         self.painter.setPen(self.shooter.pens['textback'])
@@ -339,7 +340,7 @@ class Arena(QLabel):
         Meta-painter for Game-related boards
         :return: None
         """
-        painter = self.paint_subprocs[self.game.mode]
+        painter = self.paint_subprocs[self.game.state.mode]
         painter()
 
     def __paint_welcome(self):
@@ -349,11 +350,12 @@ class Arena(QLabel):
         """
         self.painter.begin(self.canvas)
         # Rysować odtąd...
+        rng = self.game.state.session.stream('welcome')
         for i in range(ARENA_HEIGHT // 20):
             color = QColor.fromRgb(
-                random.randint(0, 255),
-                random.randint(0, 255),
-                random.randint(0, 255))
+                rng.randint(0, 255),
+                rng.randint(0, 255),
+                rng.randint(0, 255))
             self.painter.setPen(QPen(color))
             self.painter.setBrush(QBrush(color))
             self.painter.drawRect(0, i * 20, ARENA_WIDTH, (i + 1) * 20)
@@ -371,7 +373,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         self.painter.setFont(self.fonts['logo'])
         self.painter.setPen(self.shooter.pens['textback'])
@@ -437,7 +439,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         # Back
         self.painter.setPen(self.shooter.pens['textback'])
@@ -514,7 +516,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         self.painter.setFont(self.fonts['logo'])
         self.painter.setPen(self.shooter.pens['textback'])
@@ -684,7 +686,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         e_t = locales['help']['title'][self.game.config['lang']]
         e_w = self.metrics['logo'].horizontalAdvance(e_t)
@@ -784,7 +786,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         self.painter.setFont(self.fonts['logo'])
         self.painter.setPen(QPen(self.shooter.colors['textback'], 2, Qt.SolidLine))
@@ -847,7 +849,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         self.painter.setFont(self.fonts['logo'])
         self.painter.setPen(self.shooter.pens['textback'])
@@ -910,7 +912,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         self.painter.setFont(self.fonts['logo'])
         l_t = locales['newscore']['title'][self.game.config['lang']]
@@ -1005,29 +1007,29 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         self.__update_pixmap_play(self.painter, False)
         level_text = locales[
                          'game']['level-x'][self.game.config['lang']] % {
-                         'l': self.game.level + 1}
+                         'l': self.game.state.level + 1}
         x_2 = (ARENA_WIDTH - self.metrics[
             'get-ready'].horizontalAdvance(level_text)) // 2
         self.painter.setFont(self.fonts['get-ready'])
         self.painter.setPen(self.shooter.pens['textback'])
         self.painter.drawText(x_2 + 5, 405, level_text)
         x_3 = 0
-        if self.game.get_ready > 0:
+        if self.game.state.get_ready > 0:
             self.painter.setFont(self.fonts['logo'])
             x_3 = (ARENA_WIDTH - self.metrics['logo'].horizontalAdvance(
-                f'{self.game.get_ready}')) // 2
-            self.painter.drawText(x_3 + 5, 605, f'{self.game.get_ready}')
+                f'{self.game.state.get_ready}')) // 2
+            self.painter.drawText(x_3 + 5, 605, f'{self.game.state.get_ready}')
         self.painter.setPen(self.shooter.pens['textfront'])
         self.painter.setFont(self.fonts['get-ready'])
         self.painter.drawText(x_2, 400, level_text)
-        if self.game.get_ready > 0:
+        if self.game.state.get_ready > 0:
             self.painter.setFont(self.fonts['logo'])
-            self.painter.drawText(x_3, 600, f'{self.game.get_ready}')
+            self.painter.drawText(x_3, 600, f'{self.game.state.get_ready}')
         self.__paint_bottom_bar(self.painter)
         # ... dotąd
         self.painter.end()
@@ -1046,71 +1048,45 @@ class Arena(QLabel):
         :return: None
         """
         # Rysować odtąd...
-        for obj in self.game.stars:
+        for obj in self.game.state.stars:
             obj.paint(painter)
         # Drops
         # (drops before movables)
-        for obj in self.game.drops:
-            obj.paint(painter)
+        self.game.state.entities.paint(painter, 'drops')
         # Movables
-        for movable in self.game.movables:
+        for movable in self.game.state.entities['movables']:
             movable.paint(painter)
             # Smoke
             if movable.etype in self.shooter.smoke_spots:
-                smoke = self.shooter.images['smokes'][self.game.smoke_counter]
+                smoke = sprite_meta(self.shooter.images['smokes'][self.game.state.smoke_counter])
                 for spot in self.shooter.smoke_spots[movable.etype]:
                     x, y = spot
-                    x += movable.x - smoke.width()
-                    y += movable.y - smoke.height()
-                    painter.drawPixmap(x, y, smoke)
+                    x += movable.x - smoke.w
+                    y += movable.y - smoke.h
+                    painter.drawPixmap(x, y, smoke.image)
         if paint_objects:
-            # IceBoxes:
-            for obj in self.game.iceboxes:
-                obj.paint(painter)
-            # Bombs
-            for obj in self.game.bombs:
-                obj.paint(painter)
-            # Medkids
-            for obj in self.game.medkits:
-                obj.paint(painter)
-            # LightBalls
-            for obj in self.game.lightballs:
-                obj.paint(painter)
-            # TNTs
-            for obj in self.game.tnts:
-                obj.paint(painter)
-            # Shields
-            for obj in self.game.shields:
-                obj.paint(painter)
-            # Meteorites
-            for obj in self.game.meteorites:
-                obj.paint(painter)
+            # Bonuses, bombs and meteorites:
+            self.game.state.entities.paint(painter, 'iceboxes', 'bombs', 'medkits', 'lightballs',
+                                           'tnts', 'shields', 'meteorites')
             # Player
-            self.game.player.paint(painter)
-            if self.game.shield_timer > 0:
-                painter.fillRect(QRect(self.game.player.shieldx,
-                                       self.game.player.shieldy,
-                                       self.game.player.shieldw,
-                                       self.game.player.shieldh),
+            self.game.state.player.paint(painter)
+            if self.game.state.is_active('shield'):
+                painter.fillRect(QRect(self.game.state.player.shieldx,
+                                       self.game.state.player.shieldy,
+                                       self.game.state.player.shieldw,
+                                       self.game.state.player.shieldh),
                                  self.shooter.brushes['shieldinter'])
                 painter.setPen(self.shooter.pens['shieldline'])
-                painter.drawRect(QRect(self.game.player.shieldx,
-                                       self.game.player.shieldy,
-                                       self.game.player.shieldw,
-                                       self.game.player.shieldh))
+                painter.drawRect(QRect(self.game.state.player.shieldx,
+                                       self.game.state.player.shieldy,
+                                       self.game.state.player.shieldw,
+                                       self.game.state.player.shieldh))
             # Enemies
-            self.game.enemymanager.paint(painter)
+            self.game.state.enemymanager.paint(painter)
             # Missiles
             self.paint_missiles(painter)
-            # Firemissiles
-            for obj in self.game.firemissiles:
-                obj.paint(painter)
-            # Boss
-            if self.game.boss:
-                self.game.boss.paint(painter)
-            # Explosions
-            for obj in self.game.explosions:
-                obj.paint(painter)
+            # Firemissiles and explosions
+            self.game.state.entities.paint(painter, 'firemissiles', 'explosions')
         self.__paint_bottom_bar(painter)
         # ... dotąd
 
@@ -1122,8 +1098,7 @@ class Arena(QLabel):
         :param painter: Painter used for painting
         :return: None
         """
-        for missile in self.game.missiles:
-            missile.paint(painter)
+        self.game.state.entities.paint(painter, 'missiles')
 
     def __paint_game_play(self):
         """
@@ -1203,7 +1178,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         x = locales['gameover']['win'][self.game.config['lang']]
         w_x = self.metrics['logo'].horizontalAdvance(x)
@@ -1251,7 +1226,7 @@ class Arena(QLabel):
         self.canvas.fill(self.shooter.colors['background'])
         self.painter.begin(self.canvas)
         # Rysować odtąd...
-        for star in self.game.stars:
+        for star in self.game.state.stars:
             star.paint(self.painter)
         e_t = locales['gameover']['title'][self.game.config['lang']]
         f_t = locales['gameover']['description'][self.game.config['lang']]
@@ -1414,243 +1389,26 @@ class SpaceShooter(QApplication):
             MovableType.FABRYKA2: [(95, 130), (165, 0), (253, 0), (328, 0)],
             MovableType.FABRYKA3: [(232, 0)]
         }
-        path = resources.path(__package__, "images")
-        self.images = {
-            'star': QPixmap(f"{path}/star.png"),
-            'players': [
-                QPixmap(f"{path}/aplayer0.png"),
-                QPixmap(f"{path}/aplayer1.png"),
-                QPixmap(f"{path}/aplayer2.png"),
-                QPixmap(f"{path}/asterowiec.png")
-            ],
-            'big_players': [
-                QPixmap(f"{path}/player0.png"),
-                QPixmap(f"{path}/player2.png"),
-                QPixmap(f"{path}/player3.png"),
-                QPixmap(f"{path}/sterowiec.png")
-            ],
-            'movables': {
-                MovableType.DZIALO: QPixmap(f"{path}/dzialo.png"),
-                MovableType.DOM1: QPixmap(f"{path}/dom1.png"),
-                MovableType.DOM2: QPixmap(f"{path}/dom2.png"),
-                MovableType.DOM3: QPixmap(f"{path}/dom3.png"),
-                MovableType.FABRYKA1: QPixmap(f"{path}/fabryka1.png"),
-                MovableType.FABRYKA2: QPixmap(f"{path}/fabryka2.png"),
-                MovableType.FABRYKA3: QPixmap(f"{path}/fabryka3.png"),
-                MovableType.WIEZOWIEC1: QPixmap(f"{path}/wiezowiec1.png"),
-                MovableType.WIEZOWIEC2: QPixmap(f"{path}/wiezowiec2.png"),
-                MovableType.WIEZOWIEC3: QPixmap(f"{path}/wiezowiec3.png")
-            },
-            'smokes': [
-                QPixmap(f"{path}/smoke-1.png"),
-                QPixmap(f"{path}/smoke-2.png"),
-                QPixmap(f"{path}/smoke-3.png"),
-                QPixmap(f"{path}/smoke-4.png")
-            ],
-            'enemies': [
-                QPixmap(f"{path}/enemy4.png"),
-                QPixmap(f"{path}/enemy5.png"),
-                QPixmap(f"{path}/enemy6.png"),
-                QPixmap(f"{path}/enemy7.png"),
-                QPixmap(f"{path}/enemy8.png"),
-                QPixmap(f"{path}/enemy9.png"),
-            ],
-            'explosions': [
-                QPixmap(f"{path}/explosion-1.png"),
-                QPixmap(f"{path}/explosion-2.png"),
-                QPixmap(f"{path}/explosion-3.png"),
-                QPixmap(f"{path}/explosion-2.png"),
-                QPixmap(f"{path}/explosion-1.png"),
-            ],
-            'missiles': {
-                MissileType.FROM: QPixmap(f"{path}/missile-2.png"),
-                MissileType.TO: QPixmap(f"{path}/missile-1.png"),
-                MissileType.TO_NW: QPixmap(f"{path}/missile-3.png"),
-                MissileType.TO_SW: QPixmap(f"{path}/missile-4.png"),
-                MissileType.TO_NWW: QPixmap(f"{path}/missile-5.png"),
-                MissileType.TO_SWW: QPixmap(f"{path}/missile-6.png")
-            },
-            'icons': {
-                'app': QPixmap(f"{path}/aicon.png"),
-                'pl': QPixmap(f"{path}/flag_pl.png"),
-                'en': QPixmap(f"{path}/flag_en.png"),
-                'next': QPixmap(f"{path}/next.png"),
-                'prev': QPixmap(f"{path}/prev.png")
-            },
-            'boss': QPixmap(f"{path}/pzm.png"),
-            'indicators': {
-                'red': QPixmap(f'{path}/indicator_red.png'),
-                'green': QPixmap(f'{path}/indicator_green.png'),
-                'yellow': QPixmap(f'{path}/indicator_yellow.png'),
-                'black': QPixmap(f'{path}/indicator_black.png'),
-                'player': QPixmap(f'{path}/player_indicator.png'),
-                'shield': QPixmap(f'{path}/shield-green.png'),
-                'tnt': QPixmap(f'{path}/tnt.png'),
-                'light-ball': QPixmap(f'{path}/light_ball.png'),
-                'frozen-box': QPixmap(f'{path}/frozen_box.png'),
-                'medkit': QPixmap(f'{path}/apteczka.png'),
-                'drop': QPixmap(f'{path}/drop.png'),
-                'bomb': QPixmap(f'{path}/bomba.png'),
-                'cup': QPixmap(f'{path}/cup.png')
-            }
-        }
-        self.timers = {
-            'welcome-event': QTimer(),
-            'stars-update-event': QTimer(),
-            'game-counter-event': QTimer(),
-            'movable-update-event': QTimer(),
-            'get-ready-event': QTimer(),
-            'game-update-event': QTimer(),
-            'paint-event': QTimer(),
-            'setup-enter-event': QTimer(),
-            'enemies-event': QTimer(),
-            'game-events': QTimer(),
-            'game-shield-event': QTimer(),
-            'game-freeze-event': QTimer(),
-            'game-light-event': QTimer(),
-            'newscore-event': QTimer(),
-            'bomb-timer': QTimer(),
-            'missile-timer': QTimer(),
-            'smoke-timer': QTimer()
-        }
-        self.timer_handlers = {
-            'stars-update-event': self.game_stars_event,
-            'game-counter-event': self.game_counter_event,
-            'movable-update-event': self.game_movable_update_event,
-            'get-ready-event': self.game_get_ready_event,
-            'game-update-event': self.game_update_event,
-            'paint-event': self.game_paint_event,
-            'welcome-event': self.game_welcome_event,
-            'setup-enter-event': self.setup_enter_event,
-            'enemies-event': self.game_enemies_event,
-            'game-events': self.game_events_event,
-            'game-shield-event': self.game_shield_event,
-            'game-freeze-event': self.game_freeze_event,
-            'game-light-event': self.game_light_event,
-            'newscore-event': self.newscore_event,
-            'bomb-timer': self.bomb_timer,
-            'missile-timer': self.missile_timer,
-            'smoke-timer': self.smoke_timer
-        }
-        for name, timer in self.timers.items():
-            timer.timeout.connect(self.timer_handlers[name])
+        self.images = register_sprites(map_sprites(
+            sprite_files,
+            lambda name: QPixmap(os.path.join(IMAGES_PATH, name))))
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.frame_event)
+        self.timer.start(TIMEOUT_PAINT)
         self.game = None
 
-    def newscore_event(self):
-        """
-        Newscore timer delegator
-        :return: None
-        """
-        self.game.newscore_event()
-
-    def game_enemies_event(self):
-        """
-        Enemies timer delegator
-        :return: None
-        """
-        self.game.enemies_event()
-
-    def game_events_event(self):
-        """
-        Game Events timer delegator
-        :return: None
-        """
-        self.game.events_event()
-
-    def game_welcome_event(self):
-        """
-        Welcome timer delegator
-        :return: None
-        """
-        self.game.welcome_event()
-
-    def game_movable_update_event(self):
-        """
-        Movable timer delegator
-        :return: None
-        """
-        self.game.movable_update_event()
-
-    def game_update_event(self):
-        """
-        Game update timer delegator
-        :return: None
-        """
-        self.game.game_update_event()
-
-    def game_shield_event(self):
-        """
-        Shield timer delegator
-        :return: None
-        """
-        self.game.shield_event()
-
-    def game_light_event(self):
-        """
-        Lightball timer delegator
-        :return: None
-        """
-        self.game.light_event()
-
-    def game_get_ready_event(self):
-        """
-        GetReady timer delegator
-        :return: None
-        """
-        self.game.get_ready_event()
-
-    def game_stars_event(self):
-        """
-        Stars timer delegator
-        :return: None
-        """
-        self.game.stars_update_event()
-
-    def game_paint_event(self):
-        """
-        Paint timer delegator
-        :return: None
-        """
-        self.game.game_paint_event()
-
-    def game_counter_event(self):
-        """
-        Counter timer delegator
-        :return: None
-        """
-        self.game.game_counter_event()
-
-    def game_freeze_event(self):
-        """
-        Freeze timer delegator
-        :return: None
-        """
-        self.game.freeze_event()
-
-    def setup_enter_event(self):
-        """
-        Setup timer delegator
-        :return: None
-        """
-        self.game.setup_enter_event()
-
-    def bomb_timer(self):
-        """
-        Bomb timer delegator
-        :return: None
-        """
-        self.game.bomb_timer()
-
-    def missile_timer(self):
+    def frame_event(self):
         """
-        Missile timer delegator
+        Frame timer delegator (the only timer, drives the master clock)
         :return: None
         """
-        self.game.missile_timer()
+        if self.game:
+            self.game.frame_event()
 
-    def smoke_timer(self):
+    def set_frame_timeout(self, timeout):
         """
-        Smoke timer delegator
+        Change frame timer interval
+        :param timeout: interval in miliseconds (0: as often as possible)
         :return: None
         """
-        self.game.smoke_timer()
+        self.timer.setInterval(timeout)
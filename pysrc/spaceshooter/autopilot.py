@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+
+"""
+Heuristic autopilot: plays the game on its own, dodging threats,
+chasing bonuses and enemies, firing, bombing guns and using TNT
+(input policy, see batch.get_policy, also used by Game.set_autopilot)
+"""
+
+from spaceshooter.stypes import UserInput, MissileType, MovableType, Options, Board, Mode,\
+    Key
+from spaceshooter.sdefs import ARENA_WIDTH, ARENA_HEIGHT, BOTTOM_BAR, MOVABLE_SPEED
+
+HORIZON = 12  # Number of object moves threats are followed for
+MARGIN = 30  # Extra distance kept from threats
+STEP = 20  # Single player move
+HOME_X = ARENA_WIDTH // 6  # Where the player waits when there is nothing to chase
+
+MOVES = (UserInput.TOP, UserInput.BOTTOM, UserInput.LEFT, UserInput.RIGHT)
+
+# Keys released on boards other than the game itself (endless soak sessions,
+# hiscores are skipped, so they are never polluted):
+BOARD_KEYS = {
+    Board.WELCOME: Key.KEY_ENTER,
+    Board.MENU: Key.KEY_ENTER,
+    Board.PLAYER: Key.KEY_ENTER,
+    Board.NEWSCORE: Key.KEY_ESCAPE,
+    Board.HISCORES: Key.KEY_ESCAPE
+}
+
+# Keys released in game modes other than Play:
+MODE_KEYS = {
+    Mode.PAUSED: Key.KEY_ENTER,
+    Mode.KILLED: Key.KEY_ENTER,
+    Mode.GAMEOVER: Key.KEY_ESCAPE,
+    Mode.CONGRATS: Key.KEY_ESCAPE
+}
+
+# Missile type -> single missile move:
+MISSILE_MOVES = {
+    MissileType.TO: (-12, 0),
+    MissileType.TO_NW: (-12, -12),
+    MissileType.TO_SW: (-12, 12),
+    MissileType.TO_NWW: (-12, -6),
+    MissileType.TO_SWW: (-12, 6)
+}
+
+# Player move -> (dx, dy) (None: stay in place):
+CANDIDATES = {
+    None: (0, 0),
+    UserInput.TOP: (0, -STEP),
+    UserInput.BOTTOM: (0, STEP),
+    UserInput.LEFT: (-STEP, 0),
+    UserInput.RIGHT: (STEP, 0)
+}
+
+
+def moving_threats(state):
+    """
+    Get all the objects that can hurt the player, with their single moves
+    :param state: GameState object
+    :return: generator of (object, dx, dy) tuples
+    """
+    for missile in state.entities['missiles']:
+        if missile.etype in MISSILE_MOVES:
+            yield (missile,) + MISSILE_MOVES[missile.etype]
+    for drop in state.entities['drops']:
+        yield drop, drop.speedx, drop.speedy
+    for enemy in state.enemymanager.enemies:
+        yield enemy, 0, 0
+    boss = state.enemymanager.boss
+    if boss:
+        yield boss, 0, boss.dy * boss.yspeed
+    if state.options_pos == Options.HARD:
+        for movable in state.entities['movables']:
+            yield movable, -MOVABLE_SPEED, 0
+
+
+def swept_boxes(state):
+    """
+    Get areas threats cover within the horizon (with a margin)
+    :param state: GameState object
+    :return: list of (left, top, right, bottom) tuples
+    """
+    boxes = []
+    for obj, dx, dy in moving_threats(state):
+        x0 = obj.x + min(0, dx * HORIZON)
+        x1 = obj.x + obj.w + max(0, dx * HORIZON)
+        y0 = obj.y + min(0, dy * HORIZON)
+        y1 = obj.y + obj.h + max(0, dy * HORIZON)
+        boxes.append((x0 - MARGIN, y0 - MARGIN, x1 + MARGIN, y1 + MARGIN))
+    return boxes
+
+
+def can_move(state, action):
+    """
+    Check if the player can make a move (the same limits as GameState.move_player)
+    :param state: GameState object
+    :param action: UserInput action (None: stay in place)
+    :return: True if the move changes player position (or stays in place)
+    """
+    player = state.player
+    if action == UserInput.TOP:
+        return player.y > 20
+    if action == UserInput.BOTTOM:
+        return player.y < ARENA_HEIGHT - BOTTOM_BAR - player.h - 20
+    if action == UserInput.RIGHT:
+        return player.x < ARENA_WIDTH - player.w - 20
+    if action == UserInput.LEFT:
+        return player.x > 20
+    return True
+
+
+def find_target(state):
+    """
+    Find the point the player is heading for: a useful bonus,
+    otherwise a row of the nearest enemy ahead
+    :param state: GameState object
+    :return: (x, y) of the player top-left corner wanted
+    """
+    player = state.player
+    bonuses = ('shields', 'tnts', 'lightballs', 'iceboxes')
+    if state.indicators < 10:
+        bonuses = bonuses + ('medkits',)
+    ahead = [x for x in state.entities.objects(*bonuses) if x.x + x.w > player.x]
+    if ahead:
+        bonus = min(ahead, key=lambda x: abs(x.x - player.x) + abs(x.y - player.y))
+        return bonus.x, bonus.y + bonus.h // 2 - player.h // 2
+    targets = [x for x in state.enemymanager.enemies if x.x > player.x + player.w]
+    if state.enemymanager.boss:
+        targets.append(state.enemymanager.boss)
+    if targets:
+        enemy = min(targets, key=lambda x: x.x)
+        return HOME_X, enemy.y + enemy.h // 2 - player.h // 2
+    return HOME_X, player.y
+
+
+def wants_fire(state):
+    """
+    Check if there is anything to shoot ahead of the player
+    :param state: GameState object
+    :return: True if so
+    """
+    player = state.player
+    if state.enemymanager.boss:
+        return True
+    for enemy in state.enemymanager.enemies:
+        if enemy.x > player.x:
+            return True
+    for movable in state.entities['movables']:
+        if movable.etype == MovableType.DZIALO and movable.x > player.x:
+            return True
+    return False
+
+
+def wants_bomb(state):
+    """
+    Check if a gun is right below the bomb bay
+    (bombs drift with the ground, so they fall straight onto it)
+    :param state: GameState object
+    :return: True if so
+    """
+    x = state.player.x + state.player.w // 4
+    for movable in state.entities['movables']:
+        if movable.etype == MovableType.DZIALO and movable.x <= x <= movable.x + movable.w:
+            return True
+    return False
+
+
+def wants_tnt(state):
+    """
+    Check if TNT is worth using: a crowd of enemies around, or nearly dead
+    :param state: GameState object
+    :return: True if so
+    """
+    if state.tnt <= 0:
+        return False
+    player = state.player
+    near = 0
+    for enemy in state.enemymanager.enemies:
+        if abs(enemy.x - player.x) < 400 and abs(enemy.y - player.y) < 400:
+            near += 1
+    return near >= 3 or (near > 0 and state.indicators <= 3)
+
+
+def threat_count(boxes, x0, y0, x1, y1):
+    """
+    Count threat areas overlapping a player position
+    :param boxes: list of (left, top, right, bottom) tuples (see swept_boxes)
+    :param x0: left edge of the player
+    :param y0: top edge of the player
+    :param x1: right edge of the player
+    :param y1: bottom edge of the player
+    :return: number of areas
+    """
+    return sum(1 for left, top, right, bottom in boxes
+               if x0 < right and left < x1 and y0 < bottom and top < y1)
+
+
+def move_cost(state, boxes, target, action):
+    """
+    Score a player move: threats first, distance to the target next
+    :param state: GameState object
+    :param boxes: list of threat areas (see swept_boxes)
+    :param target: (x, y) of the player top-left corner wanted (see find_target)
+    :param action: UserInput action (None: stay in place)
+    :return: (threats, distance) tuple, the lower the better
+    """
+    player = state.player
+    dx, dy = CANDIDATES[action]
+    x0 = player.x + dx
+    y0 = player.y + dy
+    danger = threat_count(boxes, x0, y0, x0 + player.w, y0 + player.h)
+    return danger, abs(target[0] - x0) + abs(target[1] - y0)
+
+
+def autopilot_policy(state, _rng):
+    """
+    Input policy: heuristic autopilot (deterministic, the random stream is unused)
+    :param state: GameState object
+    :param _rng: random.Random object
+    :return: list of UserInput actions
+    """
+    boxes = swept_boxes(state)
+    target = find_target(state)
+    # Staying in place is always possible, so there is at least one move:
+    moves = [x for x in CANDIDATES if can_move(state, x)]
+    best = min(moves, key=lambda x: move_cost(state, boxes, target, x))
+    actions = [best] if best is not None else []
+    if wants_fire(state):
+        actions.append(UserInput.FIRE)
+    if wants_bomb(state):
+        actions.append(UserInput.BOMB)
+    if wants_tnt(state):
+        actions.append(UserInput.TNT)
+    return actions
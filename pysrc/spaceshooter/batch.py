@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+
+"""
+Headless batch runner: plays many complete games
+across a process pool and aggregates the results
+"""
+
+import os
+import sys
+import time
+import getopt
+import importlib
+import multiprocessing
+from collections import namedtuple
+from spaceshooter.stypes import UserInput, Options, Mode
+from spaceshooter.sprites import load_sprites
+from spaceshooter.simulation import GameState
+from spaceshooter.sclock import ticks
+from spaceshooter.autopilot import autopilot_policy
+from spaceshooter.leaks import LeakDetector
+from spaceshooter.sutils import print_usage
+from spaceshooter.sdefs import TIMEOUT_PLAYER_MOVE, BATCH_MAX_TICKS
+
+MOVES = [UserInput.TOP, UserInput.BOTTOM, UserInput.LEFT, UserInput.RIGHT]
+
+
+class BatchParams(namedtuple('BatchParams', ('games', 'options', 'policy', 'seed', 'processes',
+                                             'max_ticks', 'leaks'),
+                             defaults=(100, tuple(Options), 'random', 0, None, BATCH_MAX_TICKS,
+                                       False))):
+    """
+    Parameters of a batch run (see run_batch):
+    * games -- number of games per option
+    * options -- Options to play
+    * policy -- input policy name (see get_policy)
+    * seed -- base seed (game number is added to it)
+    * processes -- number of worker processes (None: all the cores)
+    * max_ticks -- max number of ticks a single game may take
+    * leaks -- True to watch game object lists for leaks (see check_leaks)
+    """
+    __slots__ = ()
+
+
+def idle_policy(_state, _rng):
+    """
+    Input policy: do nothing at all
+    :param _state: GameState object
+    :param _rng: random.Random object
+    :return: list of UserInput actions
+    """
+    return []
+
+
+def random_policy(_state, rng):
+    """
+    Input policy: random moves, firing most of the time
+    :param _state: GameState object
+    :param rng: random.Random object
+    :return: list of UserInput actions
+    """
+    actions = [rng.choice(MOVES)]
+    if rng.random() < 0.7:
+        actions.append(UserInput.FIRE)
+    if rng.random() < 0.05:
+        actions.append(UserInput.BOMB)
+    if rng.random() < 0.01:
+        actions.append(UserInput.TNT)
+    return actions
+
+
+policies = {
+    'idle': idle_policy,
+    'random': random_policy,
+    'autopilot': autopilot_policy
+}
+
+
+def get_policy(name):
+    """
+    Resolve input policy by its name
+    :param name: registered policy name or module:function path
+    :return: policy callable (state, rng) -> list of UserInput actions
+    """
+    if name in policies:
+        return policies[name]
+    if ':' in name:
+        module, function = name.split(':', 1)
+        return getattr(importlib.import_module(module), function)
+    raise ValueError(f"Unknown input policy: {name}")
+
+
+def apply_action(state, action):
+    """
+    Pass a single user action to the simulation
+    :param state: GameState object
+    :param action: UserInput action
+    :return: None
+    """
+    if action in MOVES:
+        state.move_player(action)
+    else:
+        state.use_weapon(action)
+
+
+def play_ticks(job):
+    """
+    Play a single complete game headlessly, tick by tick
+    :param job: (seed, option, policy name, max ticks) tuple
+    :return: generator of GameState (the same object after every tick)
+    """
+    seed, option, policy_name, max_ticks = job
+    policy = get_policy(policy_name)
+    state = GameState(load_sprites(), option, seed=seed)
+    state.change_mode(Mode.INIT)
+    rng = state.streams.stream('policy')
+    period = ticks(TIMEOUT_PLAYER_MOVE)
+    while state.tick < max_ticks and state.mode not in (Mode.GAMEOVER, Mode.CONGRATS):
+        state.step()
+        if state.mode == Mode.PLAY and state.tick % period == 0:
+            for action in policy(state, rng):
+                apply_action(state, action)
+                if state.mode != Mode.PLAY:
+                    break
+        if state.mode == Mode.KILLED:
+            # The same as pressing Enter when killed:
+            state.process_killed()
+            state.change_mode(Mode.PLAY)
+        yield state
+
+
+def play_game(job, detector=None):
+    """
+    Play a single complete game headlessly
+    :param job: (seed, option, policy name, max ticks) tuple
+    :param detector: LeakDetector sampling game objects after every tick (if any)
+    :return: dictionary with game results
+    """
+    seed, option, _, _ = job
+    start = time.perf_counter()
+    state = None
+    for state in play_ticks(job):
+        if detector:
+            detector.sample(state.entities)
+    result = {
+        'seed': seed,
+        'option': option,
+        'points': state.points,
+        'level': state.level,
+        'lives_lost': 3 - max(state.lives, 0),
+        'mode': state.mode,
+        'ticks': state.tick,
+        'seconds': time.perf_counter() - start,
+        'worker': os.getpid()
+    }
+    if detector:
+        result['objects'] = detector.report()
+        result['growing'] = detector.growing()
+    return result
+
+
+def check_leaks(job):
+    """
+    Play a single complete game headlessly, watching game object lists for leaks
+    :param job: (seed, option, policy name, max ticks) tuple
+    :return: dictionary with game results (see play_game)
+    """
+    return play_game(job, LeakDetector())
+
+
+def run_batch(params):
+    """
+    Play a number of games for every option across a process pool
+    :param params: BatchParams object
+    :return: list of game results (see play_game)
+    """
+    get_policy(params.policy)  # Fail early on unknown policy
+    jobs = [(params.seed + i, option, params.policy, params.max_ticks)
+            for option in params.options
+            for i in range(params.games)]
+    with multiprocessing.Pool(params.processes) as pool:
+        return pool.map(check_leaks if params.leaks else play_game, jobs, chunksize=1)
+
+
+def summarize(results):
+    """
+    Aggregate game results per option and per worker
+    :param results: list of game results (see play_game)
+    :return: (per option, per worker) dictionaries
+    """
+    per_option = {}
+    for result in results:
+        entry = per_option.setdefault(result['option'], {
+            'games': 0,
+            'points': 0,
+            'lives_lost': 0,
+            'congrats': 0,
+            'levels': {}})
+        entry['games'] += 1
+        entry['points'] += result['points']
+        entry['lives_lost'] += result['lives_lost']
+        if result['mode'] == Mode.CONGRATS:
+            entry['congrats'] += 1
+        entry['levels'][result['level']] = entry['levels'].get(result['level'], 0) + 1
+    per_worker = {}
+    for result in results:
+        entry = per_worker.setdefault(result['worker'], {'ticks': 0, 'seconds': 0.0})
+        entry['ticks'] += result['ticks']
+        entry['seconds'] += result['seconds']
+    return per_option, per_worker
+
+
+def report(results):
+    """
+    Print aggregated game results
+    :param results: list of game results (see play_game)
+    :return: None
+    """
+    per_option, per_worker = summarize(results)
+    for option, entry in sorted(per_option.items()):
+        games = entry['games']
+        levels = ", ".join(f"{level}: {count}" for level, count in sorted(entry['levels'].items()))
+        print(f"{Options(option).name}: {games} games, "
+              f"avg points {entry['points'] / games:.1f}, "
+              f"avg lives lost {entry['lives_lost'] / games:.2f}, "
+              f"won {entry['congrats']}, "
+              f"levels reached {{{levels}}}")
+    for worker, entry in sorted(per_worker.items()):
+        speed = entry['ticks'] / entry['seconds'] if entry['seconds'] > 0 else 0
+        print(f"worker {worker}: {entry['ticks']} ticks, {speed:.0f} ticks/s")
+    report_leaks(results)
+
+
+def report_leaks(results):
+    """
+    Print peak lengths of game object lists and the lists leaking
+    (only games watched for leaks are reported, see check_leaks)
+    :param results: list of game results
+    :return: None
+    """
+    peaks = {}
+    for result in results:
+        for name, (_, peak, _, retained) in result.get('objects', {}).items():
+            old_peak, old_retained = peaks.get(name, (0, 0))
+            peaks[name] = max(old_peak, peak), max(old_retained, retained)
+    for name, (peak, retained) in peaks.items():
+        print(f"{name}: peak {peak}, max invalid retained {retained}")
+    for result in results:
+        if result.get('growing'):
+            print(f"LEAK: {Options(result['option']).name} game {result['seed']}: "
+                  f"{', '.join(result['growing'])} growing without bound")
+
+
+def leaking(results):
+    """
+    Check if any game object list grew without bound in any game
+    :param results: list of game results (see check_leaks)
+    :return: True if so
+    """
+    return any(result.get('growing') for result in results)
+
+
+def __usage__(msg=None):
+    print_usage("Spaceshooter headless batch runner", "", [
+        "-n games -- number of games per game option (default: 100)",
+        "-o options -- comma separated game options, e.g. EASY,HARD (default: all)",
+        "-p policy -- input policy: idle, random, autopilot or module:function (default: random)",
+        "-j processes -- number of worker processes (default: all the cores)",
+        "-s seed -- base random seed (default: 0)",
+        "-m ticks -- max number of ticks per game",
+        "-l -- debug mode: watch game object lists for leaks, fail if any grows without bound",
+        "-h -- print this help message and terminate"], msg)
+
+
+if __name__ == "__main__":
+    batch_params = {}
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "n:o:p:j:s:m:lh", [])
+        for o, a in opts:
+            if o == "-n":
+                batch_params['games'] = int(a)
+            elif o == "-o":
+                batch_params['options'] = [Options[x.strip().upper()] for x in a.split(",")]
+            elif o == "-p":
+                batch_params['policy'] = a
+            elif o == "-j":
+                batch_params['processes'] = int(a)
+            elif o == "-s":
+                batch_params['seed'] = int(a)
+            elif o == "-m":
+                batch_params['max_ticks'] = int(a)
+            elif o == "-l":
+                batch_params['leaks'] = True
+            elif o == "-h":
+                __usage__()
+                sys.exit(0)
+    except (getopt.GetoptError, ValueError, KeyError) as ge:
+        __usage__(str(ge))
+        sys.exit(1)
+    batch_results = run_batch(BatchParams(**batch_params))
+    report(batch_results)
+    if leaking(batch_results):
+        sys.exit(1)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+
+"""
+Component tables: game objects of a single kind kept as rows of a table,
+with a column per component attribute (position, collider, motion, sprite,
+lifetime), processed column by column by systems instead of object by object
+"""
+
+import sys
+import math
+from collections import namedtuple
+from itertools import compress
+from operator import add, and_
+from spaceshooter.sdefs import ARENA_WIDTH, ARENA_HEIGHT, BONUS_SPEEDX
+from spaceshooter.sprites import sprite_meta
+
+
+class BoxView:  # pylint: disable=no-member
+    """
+    Behaviour of read-only row views with position, collider, sprite and validity
+    (mixed into namedtuples, see Projectile and Bonus)
+    """
+    __slots__ = ()
+
+    def is_valid(self):
+        """
+        Check if object shall still exist
+        :return: True if so
+        """
+        return self.valid
+
+    def collides(self, rect):
+        """
+        Check if collides with a rectangle
+        :param rect: Rectangle to check
+        :return: True if collides, false otherwise
+        """
+        return rect is not None and self.x < rect.x + rect.w and rect.x < self.x + self.w and \
+            self.y < rect.y + rect.h and rect.y < self.y + self.h
+
+    def paint(self, painter):
+        """
+        Paint object on a bitmap
+        :param painter: bitmap to paint
+        :return: None
+        """
+        painter.drawPixmap(self.x, self.y, self.image)
+
+
+class Bonus(BoxView, namedtuple('Bonus', ('x', 'y', 'w', 'h', 'basey', 'speedx', 'valid',
+                                          'image'))):
+    """
+    Read-only view of a single bonus (see Bonuses)
+    """
+    __slots__ = ()
+
+
+class Explosion(namedtuple('Explosion', ('x', 'y', 'frame', 'frames', 'images', 'valid'))):
+    """
+    Read-only view of a single explosion (see Explosions)
+    """
+    __slots__ = ()
+
+    def is_valid(self):
+        """
+        Check if explosion shall still exist
+        :return: True if so
+        """
+        return self.valid
+
+
+class Components:
+    """
+    Table of game objects of a single kind: a list per column (see columns),
+    a row per object. Rows are read through views (see view),
+    systems work on whole columns, dead rows are removed in bulk by compact().
+    """
+    columns = ('valid',)
+    view = None  # Type of row views (a namedtuple of the columns)
+
+    def __init__(self):
+        """
+        Create empty table
+        """
+        self.valid = []
+
+    def __len__(self):
+        """
+        Get number of rows (including dead ones not compacted yet)
+        :return: number of rows
+        """
+        return len(self.valid)
+
+    def __iter__(self):
+        """
+        Iterate over rows
+        :return: iterator of views
+        """
+        return map(self.view, *(getattr(self, name) for name in self.columns))
+
+    def compact(self):
+        """
+        Remove all the dead rows at once
+        :return: None
+        """
+        if False in self.valid:
+            valid = self.valid
+            for name in self.columns:
+                setattr(self, name, list(compress(getattr(self, name), valid)))
+
+    def size(self):
+        """
+        Get memory taken by the table and its columns (values are not counted)
+        :return: size in bytes
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self.__dict__) + \
+            sum(sys.getsizeof(getattr(self, name)) for name in self.columns)
+
+
+class Boxes(Components):
+    """
+    Table of objects with position (x, y), collider (w, h) and sprite (image)
+    """
+    def __init__(self):
+        """
+        Create empty table
+        """
+        super().__init__()
+        self.x = []
+        self.y = []
+        self.w = []
+        self.h = []
+        self.image = []
+
+    def place(self, x, y, image):
+        """
+        Add position, collider (taken from the image) and sprite of a new live object
+        (the other columns are up to the caller)
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param image: object image
+        :return: None
+        """
+        meta = sprite_meta(image)
+        self.x.append(x)
+        self.y.append(y)
+        self.w.append(meta.w)
+        self.h.append(meta.h)
+        self.valid.append(True)
+        self.image.append(image)
+
+    @staticmethod
+    def keep(valid, x, y, w, h):
+        """
+        Check if a moved object is still valid and within the arena
+        (kinds leaving the arena in a specific way have their own rules)
+        :param valid: current validity
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param w: width
+        :param h: height
+        :return: True if so
+        """
+        return valid and x <= ARENA_WIDTH and x + w > 0 and y <= ARENA_HEIGHT and y + h > 0
+
+    def cull(self):
+        """
+        Invalidate all the objects gone off the screen (see keep)
+        :return: None
+        """
+        self.valid = list(map(self.keep, self.valid, self.x, self.y, self.w, self.h))
+
+    def collides(self, index, rect):
+        """
+        Check if an object collides with a rectangle
+        :param index: row index
+        :param rect: Rectangle to check
+        :return: True if collides, false otherwise
+        """
+        x = self.x[index]
+        y = self.y[index]
+        return x < rect.x + rect.w and rect.x < x + self.w[index] and \
+            y < rect.y + rect.h and rect.y < y + self.h[index]
+
+    def hits(self, rect):
+        """
+        Find all the objects colliding with a rectangle
+        :param rect: Rectangle to check
+        :return: list of row indices
+        """
+        if rect is None:
+            return []
+        x0, y0, x1, y1 = rect.x, rect.y, rect.x + rect.w, rect.y + rect.h
+        return [i for i, (x, y, w, h) in enumerate(zip(self.x, self.y, self.w, self.h))
+                if x < x1 and x0 < x + w and y < y1 and y0 < y + h]
+
+    def sprites(self):
+        """
+        Get images of all the objects with their top-left corners
+        :return: iterator of (image, x, y) tuples
+        """
+        return zip(self.image, self.x, self.y)
+
+    def paint(self, painter):
+        """
+        Paint all the objects on a bitmap
+        :param painter: bitmap to paint
+        :return: None
+        """
+        for image, x, y in zip(self.image, self.x, self.y):
+            painter.drawPixmap(x, y, image)
+
+
+class Bonuses(Boxes):
+    """
+    Bonuses drifting leftwards along a sine wave (moved by sine_motion):
+    sine motion component is the middle of the wave (basey) and speedx
+    """
+    columns = Bonus._fields
+    view = Bonus
+
+    def __init__(self):
+        """
+        Create empty table
+        """
+        super().__init__()
+        self.basey = []
+        self.speedx = []
+
+    def add(self, x, y, image):
+        """
+        Add a new bonus
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner (the middle of the wave)
+        :param image: bonus image
+        :return: None
+        """
+        self.place(x, y, image)
+        self.basey.append(y)
+        self.speedx.append(BONUS_SPEEDX)
+
+    @staticmethod
+    def keep(valid, x, y, w, h):
+        """
+        Check if a moved bonus is still valid, i.e. not gone past the left edge
+        :param valid: current validity
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param w: width
+        :param h: height
+        :return: True if so
+        """
+        return valid and x + w > 0
+
+
+class Medkits(Bonuses):
+    """
+    Medical kits (caught: health points)
+    """
+
+
+class Shields(Bonuses):
+    """
+    Shields (caught: the player is not hurt for a while)
+    """
+
+
+class Tnts(Bonuses):
+    """
+    TNTs (caught: one more TNT to use)
+    """
+
+
+class LightBalls(Bonuses):
+    """
+    Light balls (caught: 3 missiles in a single shot for a while)
+    """
+
+
+class IceBoxes(Bonuses):
+    """
+    Ice boxes (caught: all the enemies stop and do not shoot
+    and all the missiles disappear for a while)
+    """
+
+
+class Explosions(Components):
+    """
+    Explosions: position of the middle (x, y) and lifetime component,
+    current frame of all the frames (images), advanced by animate
+    """
+    columns = Explosion._fields
+    view = Explosion
+
+    def __init__(self):
+        """
+        Create empty table
+        """
+        super().__init__()
+        self.x = []
+        self.y = []
+        self.frame = []
+        self.frames = []
+        self.images = []
+
+    def add(self, x, y, images):
+        """
+        Add a new explosion
+        :param x: X coordinate of the middle
+        :param y: Y coordinate of the middle
+        :param images: explosion images (all the frames)
+        :return: None
+        """
+        self.x.append(x)
+        self.y.append(y)
+        self.frame.append(0)
+        self.frames.append(len(images))
+        self.images.append(images)
+        self.valid.append(True)
+
+    def sprites(self):
+        """
+        Get current frames of all the live explosions with their top-left corners
+        :return: generator of (image, x, y) tuples
+        """
+        for x, y, frame, images, valid in zip(self.x, self.y, self.frame, self.images,
+                                              self.valid):
+            if valid:
+                meta = sprite_meta(images[frame])
+                yield meta.image, x - meta.cx, y - meta.cy
+
+    def paint(self, painter):
+        """
+        Paint current frames of all the live explosions on a bitmap
+        :param painter: bitmap to paint
+        :return: None
+        """
+        for image, x, y in self.sprites():
+            painter.drawPixmap(x, y, image)
+
+
+def sine_motion(table):
+    """
+    System moving all the rows of a table along their sine waves (see Bonuses),
+    the ones gone off the screen are left to be culled (see Boxes.cull)
+    :param table: Bonuses table
+    :return: None
+    """
+    sin = math.sin
+    xs = table.x
+    table.x = list(map(add, xs, table.speedx))
+    table.y = [basey + int(100 * sin(x / 100)) for basey, x in zip(table.basey, xs)]
+
+
+def animate(table):
+    """
+    System advancing all the rows of a table to their next frames (see Explosions),
+    the ones past their last frame are invalidated
+    :param table: Explosions table
+    :return: None
+    """
+    more = [frame < frames - 1 for frame, frames in zip(table.frame, table.frames)]
+    table.frame = list(map(add, table.frame, more))
+    table.valid = list(map(and_, table.valid, more))
@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+
+"""
+Monte-Carlo difficulty analyzer: plays many headless games
+for every game option across a process pool, breaks them down per level
+and streams per level records into a compact columnar file
+"""
+
+import sys
+import time
+import zlib
+import getopt
+import statistics
+import multiprocessing
+from spaceshooter.stypes import Options, Mode, DamageSource
+from spaceshooter.sevents import GameEvent, EnemyEvent
+from spaceshooter.batch import play_ticks, get_policy, BatchParams
+from spaceshooter.replay import encode_varint, decode_varint, encode_signed, decode_signed
+from spaceshooter.sutils import print_usage
+from spaceshooter.sdefs import TIMEOUT_TICK
+
+COLUMNS_MAGIC = b"SSCF"
+COLUMNS_VERSION = 1
+CHUNK_ROWS = 4096  # Rows buffered before a chunk is written
+
+# Level outcomes:
+CLEARED = 0  # Next level reached (or congrats)
+DIED = 1  # Game over in this level
+TIMEOUT = 2  # Out of ticks in this level
+OUTCOMES = ('cleared', 'died', 'timeout')
+
+DAMAGE_COLUMNS = {x: f"damage_{x.name.lower()}" for x in DamageSource}
+EVENT_COLUMNS = {x: f"event_{x.name.lower()}" for x in GameEvent if x != GameEvent.NONE}
+
+# Columns of a single record (one per game and level played):
+COLUMNS = ('seed', 'option', 'level', 'outcome', 'ticks', 'play_ticks', 'points',
+           'lives_lost') + tuple(DAMAGE_COLUMNS.values()) + \
+          ('waves', 'enemies') + tuple(EVENT_COLUMNS.values())
+
+
+class ColumnWriter:
+    """
+    Writes records column by column: every chunk of rows stores
+    each column as zigzag varints, compressed on its own
+    """
+    def __init__(self, filename, columns, chunk_rows=CHUNK_ROWS):
+        """
+        Create file and write its header
+        :param filename: file to write
+        :param columns: column names
+        :param chunk_rows: rows buffered before a chunk is written
+        """
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.rows = []
+        self.fh = open(filename, "wb")  # pylint: disable=consider-using-with
+        header = bytearray(COLUMNS_MAGIC + bytes([COLUMNS_VERSION]))
+        encode_varint(len(columns), header)
+        for name in columns:
+            encoded = name.encode("UTF-8")
+            encode_varint(len(encoded), header)
+            header += encoded
+        self.fh.write(header)
+
+    def add(self, row):
+        """
+        Add a single record
+        :param row: column name -> integer dictionary
+        :return: None
+        """
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered rows as a chunk
+        :return: None
+        """
+        if not self.rows:
+            return
+        chunk = bytearray()
+        encode_varint(len(self.rows), chunk)
+        for name in self.columns:
+            data = bytearray()
+            for row in self.rows:
+                encode_signed(row[name], data)
+            data = zlib.compress(data, 9)
+            encode_varint(len(data), chunk)
+            chunk += data
+        self.fh.write(chunk)
+        self.fh.flush()
+        self.rows = []
+
+    def close(self):
+        """
+        Write remaining rows and close the file
+        :return: None
+        """
+        self.flush()
+        self.fh.close()
+
+
+def read_columns(filename):
+    """
+    Read a columnar file
+    :param filename: file written with ColumnWriter
+    :return: column name -> list of integers dictionary
+    """
+    with open(filename, "rb") as fh:
+        data = fh.read()
+    if data[:4] != COLUMNS_MAGIC or data[4] != COLUMNS_VERSION:
+        raise ValueError(f"Not a columnar file: {filename}")
+    count, pos = decode_varint(data, 5)
+    names = []
+    for _ in range(count):
+        size, pos = decode_varint(data, pos)
+        names.append(data[pos:pos + size].decode("UTF-8"))
+        pos += size
+    columns = {name: [] for name in names}
+    while pos < len(data):
+        rows, pos = decode_varint(data, pos)
+        for name in names:
+            size, pos = decode_varint(data, pos)
+            chunk = zlib.decompress(data[pos:pos + size])
+            pos += size
+            offset = 0
+            values = columns[name]
+            for _ in range(rows):
+                value, offset = decode_signed(chunk, offset)
+                values.append(value)
+    return columns
+
+
+def analyze_game(job):
+    """
+    Play a single complete game headlessly, recording every level played
+    :param job: (seed, option, policy name, max ticks) tuple
+    :return: list of records (column name -> integer dictionaries)
+    """
+    seed, option, _, _ = job
+    rows = []
+    current = {}
+
+    def damage(source):
+        """
+        Count a hit taken in current level
+        :param source: DamageSource of the hit
+        :return: None
+        """
+        current[DAMAGE_COLUMNS[source]] += 1
+
+    state = None
+    level = None
+    events_seen = 0
+    waves_seen = 0
+    for state in play_ticks(job):
+        if state.on_damage is None:
+            state.on_damage = damage
+        if state.level != level:
+            if current:
+                current['outcome'] = CLEARED
+                rows.append(dict(current))
+            level = state.level
+            current.update(dict.fromkeys(COLUMNS, 0))
+            current.update({'seed': seed, 'option': option, 'level': level,
+                            'start_tick': state.tick, 'start_points': state.points,
+                            'start_lives': state.lives})
+            events_seen = 0
+            waves_seen = 0
+        if state.mode == Mode.PLAY:
+            current['play_ticks'] += 1
+        # Spawn pressure: events taken from the queues since the last tick
+        # (queues are rebuilt for every level, see set_level of the managers):
+        events = state.eventmanager
+        for event in events.eventq[events_seen:events.eventpos]:
+            if event != GameEvent.NONE:
+                current[EVENT_COLUMNS[event]] += 1
+        events_seen = events.eventpos
+        enemies = state.enemymanager
+        if enemies.eventpos > waves_seen:
+            for event in enemies.eventq[waves_seen:enemies.eventpos]:
+                if event != EnemyEvent.NONE:
+                    current['waves'] += 1
+            current['enemies'] += len(enemies.enemies)
+            waves_seen = enemies.eventpos
+        current['ticks'] = state.tick - current['start_tick']
+        current['points'] = state.points - current['start_points']
+        current['lives_lost'] = current['start_lives'] - max(state.lives, 0)
+    if current:
+        if state.mode == Mode.GAMEOVER:
+            current['outcome'] = DIED
+        elif state.mode == Mode.CONGRATS:
+            current['outcome'] = CLEARED
+        else:
+            current['outcome'] = TIMEOUT
+        rows.append(current)
+    return [{name: int(row[name]) for name in COLUMNS} for row in rows]
+
+
+def run_analysis(filename, params):
+    """
+    Play a number of games for every option across a process pool,
+    streaming per level records into a columnar file as games finish
+    :param filename: file to write
+    :param params: BatchParams object (leaks are not watched)
+    :return: number of records written
+    """
+    get_policy(params.policy)  # Fail early on unknown policy
+    jobs = [(params.seed + i, option, params.policy, params.max_ticks)
+            for option in params.options
+            for i in range(params.games)]
+    writer = ColumnWriter(filename, COLUMNS)
+    count = 0
+    try:
+        with multiprocessing.Pool(params.processes) as pool:
+            for rows in pool.imap_unordered(analyze_game, jobs, chunksize=1):
+                for row in rows:
+                    writer.add(row)
+                count += len(rows)
+    finally:
+        writer.close()
+    return count
+
+
+def percentiles(values):
+    """
+    Get 10th, 50th and 90th percentile
+    :param values: list of numbers
+    :return: (p10, p50, p90) tuple
+    """
+    if len(values) < 2:
+        value = values[0] if values else 0
+        return value, value, value
+    deciles = statistics.quantiles(values, n=10, method='inclusive')
+    return deciles[0], deciles[4], deciles[8]
+
+
+def summarize(columns):
+    """
+    Aggregate records per option and level
+    :param columns: column name -> values dictionary (see read_columns)
+    :return: (option, level) -> statistics dictionary
+    """
+    groups = {}
+    for i, key in enumerate(zip(columns['option'], columns['level'])):
+        groups.setdefault(key, []).append(i)
+    summary = {}
+    for key, rows in sorted(groups.items()):
+        minutes = sum(columns['play_ticks'][i] for i in rows) * TIMEOUT_TICK / 60000
+        damage = {x: sum(columns[name][i] for i in rows) for x, name in DAMAGE_COLUMNS.items()}
+        summary[key] = {
+            'records': len(rows),
+            'outcomes': {name: sum(1 for i in rows if columns['outcome'][i] == outcome)
+                         for outcome, name in enumerate(OUTCOMES)},
+            'ticks': percentiles([columns['ticks'][i] for i in rows]),
+            'damage': damage,
+            'waves_per_minute': sum(columns['waves'][i] for i in rows) / minutes
+            if minutes else 0.0,
+            'enemies_per_minute': sum(columns['enemies'][i] for i in rows) / minutes
+            if minutes else 0.0,
+            'events_per_minute': {x: sum(columns[name][i] for i in rows) / minutes
+                                  if minutes else 0.0
+                                  for x, name in EVENT_COLUMNS.items()}
+        }
+    return summary
+
+
+def report(columns):
+    """
+    Print difficulty distributions per option and level
+    :param columns: column name -> values dictionary (see read_columns)
+    :return: None
+    """
+    for (option, level), entry in summarize(columns).items():
+        outcomes = ", ".join(f"{name} {count}" for name, count in entry['outcomes'].items())
+        hits = sum(entry['damage'].values())
+        damage = ", ".join(f"{x.name.lower()} {100 * count / hits:.0f}%"
+                           for x, count in entry['damage'].items()) if hits else "none"
+        events = ", ".join(f"{x.name.lower()} {rate:.1f}"
+                           for x, rate in entry['events_per_minute'].items() if rate > 0)
+        print(f"{Options(option).name} level {level}: {entry['records']} games ({outcomes})")
+        print(f"\tticks p10/p50/p90: {'/'.join(f'{x:.0f}' for x in entry['ticks'])}")
+        print(f"\tdamage: {hits} hits ({damage})")
+        print(f"\tper minute: {entry['waves_per_minute']:.1f} waves, "
+              f"{entry['enemies_per_minute']:.1f} enemies, events: {events}")
+
+
+def __usage__(msg=None):
+    print_usage("Spaceshooter difficulty analyzer", "[file]", [
+        "-n games -- number of games per game option (default: 1000)",
+        "-o options -- comma separated game options, e.g. EASY,HARD (default: all)",
+        "-p policy -- input policy: idle, random, autopilot or module:function "
+        "(default: autopilot)",
+        "-j processes -- number of worker processes (default: all the cores)",
+        "-s seed -- base random seed (default: 0)",
+        "-m ticks -- max number of ticks per game",
+        "-r -- report only, do not play",
+        "-h -- print this help message and terminate"], msg, about=(
+            "Plays games and writes per level records into file (default: difficulty.ssc),",
+            "then prints their distributions; with -r only prints ones of an existing file."))
+
+
+if __name__ == "__main__":
+    analysis_params = {'games': 1000, 'policy': 'autopilot'}
+    report_only = False
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "n:o:p:j:s:m:rh", [])
+        for o, a in opts:
+            if o == "-n":
+                analysis_params['games'] = int(a)
+            elif o == "-o":
+                analysis_params['options'] = [Options[x.strip().upper()] for x in a.split(",")]
+            elif o == "-p":
+                analysis_params['policy'] = a
+            elif o == "-j":
+                analysis_params['processes'] = int(a)
+            elif o == "-s":
+                analysis_params['seed'] = int(a)
+            elif o == "-m":
+                analysis_params['max_ticks'] = int(a)
+            elif o == "-r":
+                report_only = True
+            elif o == "-h":
+                __usage__()
+                sys.exit(0)
+        if len(args) > 1:
+            raise ValueError("Too many files")
+    except (getopt.GetoptError, ValueError, KeyError) as ge:
+        __usage__(str(ge))
+        sys.exit(1)
+    output = args[0] if args else "difficulty.ssc"
+    if not report_only:
+        start = time.perf_counter()
+        written = run_analysis(output, BatchParams(**analysis_params))
+        print(f"{written} records written in {time.perf_counter() - start:.1f} s")
+    report(read_columns(output))
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+"""
+Registry of all the game objects: a bucket per object kind,
+created, moved, painted, compacted and cleared by the same generic paths
+"""
+
+from itertools import chain
+from spaceshooter.primi import Enemy, Meteorite, memory_report
+from spaceshooter.components import Components, Medkits, Shields, Tnts, LightBalls, IceBoxes,\
+    Explosions, sine_motion, animate
+from spaceshooter.projectiles import Missiles, FireMissiles, Bombs, Drops
+from spaceshooter.pools import Pools
+from spaceshooter.terrain import Terrain
+from spaceshooter.sdefs import POOL_CAP
+from spaceshooter.sutils import compact
+
+# Bucket name -> type of its objects, or of its container
+# (in state hash order, see GameState.digest):
+BUCKETS = {
+    'iceboxes': IceBoxes,
+    'bombs': Bombs,
+    'lightballs': LightBalls,
+    'medkits': Medkits,
+    'missiles': Missiles,
+    'firemissiles': FireMissiles,
+    'tnts': Tnts,
+    'shields': Shields,
+    'meteorites': Meteorite,
+    'drops': Drops,
+    'explosions': Explosions,
+    'movables': Terrain,
+    'enemies': Enemy
+}
+
+# Buckets kept as component tables (see components and projectiles modules):
+STORES = tuple(name for name, kind in BUCKETS.items() if issubclass(kind, Components))
+
+# Buckets kept in containers of their own, creating and compacting their objects
+# (component tables and the terrain strip, see terrain module):
+CONTAINED = tuple(name for name, kind in BUCKETS.items()
+                  if issubclass(kind, (Components, Terrain)))
+
+# Bucket name -> system moving all the rows of its component table at once
+# (projectiles move themselves, objects of other buckets are moved one by one):
+SYSTEMS = {
+    'iceboxes': sine_motion,
+    'lightballs': sine_motion,
+    'medkits': sine_motion,
+    'tnts': sine_motion,
+    'shields': sine_motion,
+    'explosions': animate
+}
+
+# Types of short-lived objects taken from pools:
+POOLED = (Enemy,)
+
+
+class Entities:
+    """
+    All the game objects, in a bucket per kind (see BUCKETS):
+    a list of objects, a component table (projectiles, bonuses, explosions)
+    or the Terrain strip for movables.
+    Buckets are only emptied by replacing them (see clear),
+    so loops walking a bucket are never disturbed.
+    """
+    def __init__(self, pool_cap=POOL_CAP):
+        """
+        Create empty registry
+        :param pool_cap: max number of free objects kept per pooled type
+        """
+        self.pools = Pools(POOLED, pool_cap)
+        self.buckets = {name: Entities.__empty(name) for name in BUCKETS}
+
+    @staticmethod
+    def __empty(name):
+        """
+        Create an empty bucket
+        :param name: bucket name
+        :return: empty list or container
+        """
+        return BUCKETS[name]() if name in CONTAINED else []
+
+    def __getitem__(self, name):
+        """
+        Get a bucket
+        :param name: bucket name
+        :return: list of objects or container
+        """
+        return self.buckets[name]
+
+    def count(self, name):
+        """
+        Get number of objects in a bucket
+        (dead ones not compacted yet included)
+        :param name: bucket name
+        :return: number of objects
+        """
+        return len(self.buckets[name])
+
+    def counts(self):
+        """
+        Get number of objects in every bucket
+        :return: bucket name -> number of objects dictionary
+        """
+        return {name: len(bucket) for name, bucket in self.buckets.items()}
+
+    def census(self):
+        """
+        Get number of objects and of invalid ones (not compacted yet) in every bucket
+        :return: bucket name -> (number of objects, number of invalid ones) dictionary
+        """
+        return {name: (len(bucket),
+                       bucket.valid.count(False) if name in STORES
+                       else sum(not obj.valid for obj in bucket))
+                for name, bucket in self.buckets.items()}
+
+    def objects(self, *names):
+        """
+        Iterate over objects of some buckets, bucket after bucket
+        (rows of component tables are given as views)
+        :param names: bucket names
+        :return: iterator of objects
+        """
+        return chain.from_iterable(self.buckets[name] for name in names)
+
+    def spawn(self, name, *args, **kwargs):
+        """
+        Create a new object in a bucket (taken from its pool, if pooled)
+        :param name: bucket name
+        :param args: arguments of type constructor (or of container add method)
+        :param kwargs: keyword arguments of type constructor
+        :return: object created (None for component tables)
+        """
+        bucket = self.buckets[name]
+        if name in CONTAINED:
+            return bucket.add(*args, **kwargs)
+        kind = BUCKETS[name]
+        obj = self.pools.acquire(kind, *args, **kwargs) if kind in POOLED else \
+            kind(*args, **kwargs)
+        bucket.append(obj)
+        return obj
+
+    def move(self, *names):
+        """
+        Move all the objects of some buckets (see SYSTEMS)
+        :param names: bucket names
+        :return: None
+        """
+        for name in names:
+            bucket = self.buckets[name]
+            if name in SYSTEMS:
+                SYSTEMS[name](bucket)
+            elif name in STORES:
+                bucket.move()
+            else:
+                for obj in bucket:
+                    obj.move()
+
+    def cull(self, *names):
+        """
+        Remove all the objects of some buckets gone off the screen
+        (component tables cull their rows at once, other objects one by one)
+        :param names: bucket names
+        :return: None
+        """
+        for name in names:
+            bucket = self.buckets[name]
+            if name in STORES:
+                bucket.cull()
+            else:
+                for obj in bucket:
+                    obj.cull()
+        self.compact(*names)
+
+    def paint(self, painter, *names):
+        """
+        Paint all the objects of some buckets, bucket after bucket
+        :param painter: Painter to draw by
+        :param names: bucket names
+        :return: None
+        """
+        for name in names:
+            bucket = self.buckets[name]
+            if name in STORES:
+                bucket.paint(painter)
+            else:
+                for obj in bucket:
+                    obj.paint(painter)
+
+    def compact(self, *names):
+        """
+        Remove invalid objects of some buckets (all of them if none given),
+        giving pooled ones back to their pools
+        :param names: bucket names
+        :return: None
+        """
+        for name in names or BUCKETS:
+            bucket = self.buckets[name]
+            if name in CONTAINED:
+                bucket.compact()
+            elif BUCKETS[name] in POOLED:
+                self.pools.compact(bucket)
+            else:
+                compact(bucket)
+
+    def clear(self, *names):
+        """
+        Remove all the objects of some buckets (all of them if none given),
+        giving pooled ones back to their pools
+        :param names: bucket names
+        :return: None
+        """
+        for name in names or BUCKETS:
+            if BUCKETS[name] in POOLED:
+                self.pools.release_all(self.buckets[name])
+            self.buckets[name] = Entities.__empty(name)
+
+    def get_state(self):
+        """
+        Get registry state for a snapshot (pools are left out)
+        :return: bucket name -> bucket dictionary
+        """
+        return dict(self.buckets)
+
+    def set_state(self, state):
+        """
+        Restore registry state from a snapshot
+        :param state: bucket name -> bucket dictionary (see get_state)
+        :return: None
+        """
+        self.buckets = dict(state)
+        self.pools.recount(self.objects(*(name for name, kind in BUCKETS.items()
+                                          if kind in POOLED)))
+
+    def memory_report(self, others=()):
+        """
+        Get memory taken by all the objects per type
+        (component tables are reported as a whole, see Components.size)
+        :param others: other objects to include (e.g. the player)
+        :return: type name -> (count, size in bytes) dictionary
+        """
+        report = memory_report(chain(others, self.objects(*(name for name in BUCKETS
+                                                            if name not in STORES))))
+        for name in STORES:
+            store = self.buckets[name]
+            report[type(store).__name__] = (len(store), store.size())
+        return report
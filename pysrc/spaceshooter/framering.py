@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+
+"""
+Shared memory ring of frames for headless games run in worker processes:
+frames and state arrays are written in place into shared memory,
+only slot numbers go through queues
+(NumPy is only needed by this module)
+"""
+
+import os
+import multiprocessing
+from collections import namedtuple
+from multiprocessing import shared_memory
+import numpy as np
+from spaceshooter.batch import play_ticks, get_policy
+from spaceshooter.render import FrameRenderer
+from spaceshooter.sclock import ticks
+from spaceshooter.sdefs import TIMEOUT_PAINT
+
+# State array of every frame (the same order as the columns):
+STATE_FIELDS = ('job', 'tick', 'mode', 'points', 'level', 'lives', 'indicators',
+                'player_x', 'player_y')
+ALIGNMENT = 64  # Every array starts at a cache line
+
+
+class FrameParams(namedtuple('FrameParams', ('width', 'height', 'grayscale', 'every', 'slots',
+                                             'processes'),
+                             defaults=(160, 90, False, ticks(TIMEOUT_PAINT), 64, None))):
+    """
+    Geometry of frames and of the ring they go through (see stream_frames):
+    * width -- frame width
+    * height -- frame height
+    * grayscale -- True for (height x width) frames, False for RGB ones
+    * every -- ticks between frames
+    * slots -- number of ring slots
+    * processes -- number of worker processes (None: all the cores)
+    """
+    __slots__ = ()
+
+    def shape(self):
+        """
+        Get shape of a single frame
+        :return: (height, width) or (height, width, 3) tuple
+        """
+        return (self.height, self.width) if self.grayscale else (self.height, self.width, 3)
+
+
+def frame_fields(params):
+    """
+    Get record layout of rendered frames
+    :param params: FrameParams object
+    :return: field name -> (shape, dtype) dictionary
+    """
+    shape = params.shape()
+    return {'frame': (shape, np.uint8),
+            'state': ((len(STATE_FIELDS),), np.int64)}
+
+
+class FrameRing:
+    """
+    Fixed number of fixed layout records (slots) in a single shared memory block.
+    Producers take free slots, fill their arrays in place and commit them;
+    the consumer gets committed slots as NumPy views of the shared memory
+    and releases them when done. Any number of producers is fine.
+    The ring is created by the consumer before worker processes are started.
+    """
+    def __init__(self, slots, fields):
+        """
+        Create ring
+        :param slots: number of slots
+        :param fields: field name -> (shape, dtype) dictionary (see frame_fields)
+        """
+        self.slots = slots
+        self.fields = fields
+        self.offsets = {}
+        size = 0
+        for name, (shape, dtype) in fields.items():
+            self.offsets[name] = size
+            size += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // ALIGNMENT) * ALIGNMENT
+        self.slot_size = size
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, slots * size))
+        self.creator = os.getpid()
+        self.free = multiprocessing.Queue()
+        self.filled = multiprocessing.Queue()
+        for slot in range(slots):
+            self.free.put(slot)
+        self.views = self.__views()
+
+    def __views(self):
+        """
+        Map arrays of all the slots onto the shared memory
+        :return: list of field name -> array dictionaries
+        """
+        return [{name: np.ndarray(shape, dtype, buffer=self.shm.buf,
+                                  offset=slot * self.slot_size + self.offsets[name])
+                 for name, (shape, dtype) in self.fields.items()}
+                for slot in range(self.slots)]
+
+    def __getstate__(self):
+        """
+        Get state for a worker process (shared memory is attached by name)
+        :return: state dictionary
+        """
+        state = self.__dict__.copy()
+        state['shm'] = self.shm.name
+        del state['views']
+        return state
+
+    def __setstate__(self, state):
+        """
+        Attach to the ring in a worker process
+        :param state: state dictionary (see __getstate__)
+        :return: None
+        """
+        self.__dict__.update(state)
+        self.shm = shared_memory.SharedMemory(name=state['shm'])
+        self.views = self.__views()
+
+    def acquire(self, timeout=None):
+        """
+        Take a free slot (producer side)
+        :param timeout: seconds to wait (None: forever)
+        :return: (slot, field name -> array dictionary) tuple
+        """
+        slot = self.free.get(timeout=timeout)
+        return slot, self.views[slot]
+
+    def commit(self, slot):
+        """
+        Pass a filled slot to the consumer (producer side)
+        :param slot: slot number (see acquire)
+        :return: None
+        """
+        self.filled.put(slot)
+
+    def finish(self):
+        """
+        Tell the consumer one of the producers is done (producer side)
+        :return: None
+        """
+        self.filled.put(None)
+
+    def get(self, timeout=None):
+        """
+        Get the oldest committed slot (consumer side)
+        :param timeout: seconds to wait (None: forever)
+        :return: (slot, field name -> array dictionary) tuple, (None, None) if a producer is done
+        """
+        slot = self.filled.get(timeout=timeout)
+        if slot is None:
+            return None, None
+        return slot, self.views[slot]
+
+    def release(self, slot):
+        """
+        Give a slot back to the producers (consumer side)
+        :param slot: slot number (see get)
+        :return: None
+        """
+        self.free.put(slot)
+
+    def close(self):
+        """
+        Detach from the ring, the process that created it also frees the shared memory
+        (views of the ring must not be used any more)
+        :return: None
+        """
+        self.views = []
+        self.shm.close()
+        if os.getpid() == self.creator:
+            self.shm.unlink()
+
+
+def write_frames(ring, jobs, params):
+    """
+    Play games and write their frames into a ring (worker process)
+    :param ring: FrameRing object
+    :param jobs: list of (job index, (seed, option, policy name, max ticks)) tuples
+    :param params: FrameParams object
+    :return: None
+    """
+    try:
+        for index, job in jobs:
+            renderer = None  # Every game loads its own images
+            for state in play_ticks(job):
+                if state.tick % params.every:
+                    continue
+                if renderer is None:
+                    renderer = FrameRenderer(state.images, params.width, params.height,
+                                             params.grayscale)
+                slot, views = ring.acquire()
+                renderer.render(state, out=views['frame'])
+                views['state'][:] = (index, state.tick, state.mode.value, state.points,
+                                     state.level, state.lives, state.indicators,
+                                     state.player.x if state.player else 0,
+                                     state.player.y if state.player else 0)
+                ring.commit(slot)
+    finally:
+        ring.finish()
+        ring.close()
+
+
+def stream_frames(jobs, params=FrameParams()):
+    """
+    Play games across worker processes and get their frames through a FrameRing.
+    Frames of a single game come in order, frames of different games are interleaved.
+    :param jobs: list of (seed, option, policy name, max ticks) tuples
+    :param params: FrameParams object
+    :return: generator of (frame, state) views, valid until the next item is taken
+    """
+    for job in jobs:
+        get_policy(job[2])  # Fail early on unknown policy
+    processes = min(params.processes or multiprocessing.cpu_count(), len(jobs))
+    ring = FrameRing(params.slots, frame_fields(params))
+    indexed = list(enumerate(jobs))
+    workers = [multiprocessing.Process(target=write_frames,
+                                       args=(ring, indexed[i::processes], params),
+                                       daemon=True)
+               for i in range(processes)]
+    try:
+        for worker in workers:
+            worker.start()
+        running = len(workers)
+        while running:
+            slot, views = ring.get()
+            if slot is None:
+                running -= 1
+                continue
+            try:
+                yield views['frame'], views['state']
+            finally:
+                ring.release(slot)
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        ring.close()
@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+
+"""
+Input fuzzer: drives headless games with random (or board-guided) input
+at uncapped speed, checks game invariants after every tick
+and minimizes failing input into replay files
+"""
+
+import os
+import sys
+import time
+import getopt
+import random
+import multiprocessing
+from collections import namedtuple
+from spaceshooter.replay import Recorder, headless_game, KEY_PRESSED, KEY_RELEASED,\
+    MOUSE_PRESSED
+from spaceshooter.sconfig import ShooterConfig
+from spaceshooter.slocales import locales
+from spaceshooter.stypes import Key, Board, Mode, MouseButton, MouseEvent
+from spaceshooter.sclock import ticks
+from spaceshooter.sutils import print_usage
+from spaceshooter.sdefs import TIMEOUT_GAME_UPDATE, ARENA_WIDTH, ARENA_HEIGHT
+
+FUZZ_SUFFIX = ".ssr"
+MAX_OBJECTS = 512  # Max length of any game object list
+RETAIN_TICKS = 2 * ticks(TIMEOUT_GAME_UPDATE)  # Max Play ticks an invalid object may stay listed
+MINIMIZE_RUNS = 500  # Max number of runs spent on minimizing a single failure
+MAX_DELAY = 40  # Max ticks between two inputs
+QUIT_CHANCE = 0.002  # Chance of Q key in guided input (leaves the game or quits it)
+
+# Boards painted by Arena (the same as keys of Arena.paint_procs),
+# Quit closes the window instead:
+PAINTED_BOARDS = (Board.WELCOME, Board.MENU, Board.GAME, Board.OPTIONS, Board.HISCORES,
+                  Board.SETUP, Board.HELP, Board.ABOUT, Board.NEWSCORE, Board.PLAYER)
+# Game modes painted by Arena (the same as keys of Arena.paint_subprocs):
+PAINTED_MODES = (Mode.INIT, Mode.PREPARE, Mode.PLAY, Mode.PAUSED, Mode.KILLED,
+                 Mode.GAMEOVER, Mode.CONGRATS)
+
+# Keys that do something on some board:
+KEYS = (Key.KEY_ENTER, Key.KEY_ESCAPE, Key.KEY_Q, Key.KEY_LEFT, Key.KEY_RIGHT, Key.KEY_TOP,
+        Key.KEY_BOTTOM, Key.KEY_SPACE, Key.KEY_B, Key.KEY_T, Key.KEY_BACKSPACE, Key.KEY_F1,
+        Key.KEY_A, Key.KEY_Z, Key.KEY_0, Key.KEY_DASH, Key.NONE)
+
+# Game mode -> keys guided input sticks to (Play mode: the keys the game is played with):
+GUIDED_KEYS = {
+    Mode.PAUSED: (Key.KEY_ENTER,),
+    Mode.KILLED: (Key.KEY_ENTER,),
+    Mode.GAMEOVER: (Key.KEY_ESCAPE,),
+    Mode.CONGRATS: (Key.KEY_ESCAPE,)
+}
+
+# Board -> game attribute with rectangles worth clicking on:
+RECTANGLES = {
+    Board.MENU: 'menu_rectangles',
+    Board.OPTIONS: 'options_rectangles',
+    Board.PLAYER: 'player_rectangles'
+}
+
+
+def fuzz_header(seed):
+    """
+    Build replay header of a fuzzed session (default configuration,
+    made-up font metrics)
+    :param seed: session seed
+    :return: replay header
+    """
+    return {
+        'seed': seed,
+        'config': ShooterConfig().dumps(),
+        'metrics': {
+            name: {'height': 40,
+                   'advances': {label: 30 * len(label)
+                                for lang in locales[name] if lang != 'title'
+                                for label in locales[name][lang]}}
+            for name in ['menu', 'options']}
+    }
+
+
+class InvariantChecker:
+    """
+    Checks game invariants, tick after tick
+    """
+    def __init__(self):
+        """
+        Create checker
+        """
+        self.invalid_since = {}  # id of invalid object -> Play tick it was seen invalid first
+        self.tick = 0  # Master clock tick of the last check
+        self.play_ticks = 0  # Ticks run in Play mode (objects are only updated then)
+
+    def check(self, game):
+        """
+        Check all the invariants
+        :param game: Game object
+        :return: None if fine, (invariant, details) tuple otherwise
+        """
+        return self.check_board(game) or self.check_state(game.state) or \
+            self.check_objects(game)
+
+    @staticmethod
+    def check_board(game):
+        """
+        Check if current board (and game mode) can be painted and handles keys
+        :param game: Game object
+        :return: None if fine, (invariant, details) tuple otherwise
+        """
+        state = game.state
+        if game.board not in PAINTED_BOARDS and not game.arena.closed:
+            return 'paint-board', f"no paint procedure for {game.board.name}"
+        if game.board not in game.keyrelease_events and not game.arena.closed:
+            return 'key-board', f"no key handler for {game.board.name}"
+        if game.board == Board.GAME:
+            if state.mode not in PAINTED_MODES:
+                return 'paint-mode', f"no paint procedure for {state.mode.name}"
+            if state.mode not in game.keyreleasegame_events:
+                return 'key-mode', f"no key handler for {state.mode.name}"
+        return None
+
+    @staticmethod
+    def check_state(state):
+        """
+        Check if player indicators and lives are within their limits
+        :param state: GameState object
+        :return: None if fine, (invariant, details) tuple otherwise
+        """
+        if not 0 <= state.indicators <= 10:
+            return 'indicators', f"indicators: {state.indicators}"
+        if state.lives > 3:
+            return 'lives', f"lives: {state.lives}"
+        return None
+
+    def check_objects(self, game):
+        """
+        Check if game object lists stay bounded, with no invalid objects retained
+        for longer than the game updates take
+        :param game: Game object
+        :return: None if fine, (invariant, details) tuple otherwise
+        """
+        state = game.state
+        if game.clock.ticks != self.tick:
+            self.tick = game.clock.ticks
+            if state.mode == Mode.PLAY:
+                self.play_ticks += 1
+        tick = self.play_ticks
+        invalid = {}
+        for name, objects in state.entities.buckets.items():
+            if len(objects) > MAX_OBJECTS:
+                return 'bounded', f"{len(objects)} {name}"
+            for obj in objects:
+                if not obj.valid:
+                    since = self.invalid_since.get(id(obj), tick)
+                    if tick - since > RETAIN_TICKS:
+                        return 'retained', f"invalid {type(obj).__name__} in {name} " \
+                                           f"for {tick - since} ticks"
+                    invalid[id(obj)] = since
+        self.invalid_since = invalid
+        return None
+
+
+def random_input(game, rng, guided):
+    """
+    Draw a single input event
+    :param game: Game object
+    :param rng: random.Random object
+    :param guided: True to click rectangles of current board more often
+        and to stick to the keys that matter in current game mode
+    :return: (delay, kind, argument) tuple
+    """
+    delay = rng.randint(0, MAX_DELAY)
+    roll = rng.random()
+    if roll < 0.1:
+        rectangles = getattr(game, RECTANGLES.get(game.board, ''), None)
+        if guided and rectangles:
+            rect = rng.choice(rectangles)
+            event = MouseEvent(rect.x + rect.w / 2, rect.y + rect.h / 2, MouseButton.LEFT)
+        else:
+            event = MouseEvent(rng.uniform(0, ARENA_WIDTH), rng.uniform(0, ARENA_HEIGHT),
+                               rng.choice(list(MouseButton)))
+        return delay, MOUSE_PRESSED, event
+    kind = KEY_PRESSED if roll < 0.4 else KEY_RELEASED
+    if not guided:
+        key = rng.choice(KEYS)
+    elif rng.random() < QUIT_CHANCE:
+        key = Key.KEY_Q
+    elif game.board == Board.GAME and game.state.mode == Mode.PLAY:
+        key = rng.choice(list(game.config.db['keys'].values()) + [Key.KEY_ESCAPE])
+    elif game.board == Board.GAME and game.state.mode in GUIDED_KEYS:
+        key = rng.choice(GUIDED_KEYS[game.state.mode])
+    else:
+        key = rng.choice([x for x in KEYS if x != Key.KEY_Q])
+    return delay, kind, key
+
+
+class Session:
+    """
+    A single headless game fed with input events, checked after every tick
+    """
+    def __init__(self, header, recorder=None):
+        """
+        Create session
+        :param header: replay header (see fuzz_header)
+        :param recorder: replay.Recorder to record the session with (None: no recording)
+        """
+        self.game = headless_game(header)
+        self.checker = InvariantChecker()
+        self.handlers = {
+            KEY_PRESSED: self.game.keypressed,
+            KEY_RELEASED: self.game.keyreleased,
+            MOUSE_PRESSED: self.game.mouse_pressed
+        }
+        if recorder:
+            self.game.start_recording(recorder)
+
+    def feed(self, event):
+        """
+        Run the clock tick by tick, checking invariants, then pass an input event
+        :param event: (delay, kind, argument) tuple
+        :return: None if fine, (invariant, details) tuple otherwise
+        """
+        delay, kind, arg = event
+        try:
+            for _ in range(delay):
+                self.game.clock.run(1)
+                failure = self.checker.check(self.game)
+                if failure:
+                    return failure
+            self.handlers[kind](arg)
+            return self.checker.check(self.game)
+        except Exception as exc:  # pylint: disable=broad-except
+            return 'exception', f"{type(exc).__name__}: {exc}"
+
+    def closed(self):
+        """
+        Check if the game has been quit
+        :return: True if so
+        """
+        return self.game.arena.closed
+
+
+def run_events(header, events):
+    """
+    Run a sequence of input events in a new session
+    :param header: replay header (see fuzz_header)
+    :param events: list of (delay, kind, argument) tuples
+    :return: (failure or None, number of events fed) tuple
+    """
+    session = Session(header)
+    for i, event in enumerate(events):
+        failure = session.feed(event)
+        if failure:
+            return failure, i + 1
+        if session.closed():
+            return None, i + 1
+    return None, len(events)
+
+
+def minimize(header, events, invariant):
+    """
+    Minimize failing input (delta debugging): drop chunks of events
+    as long as the same invariant still fails
+    :param header: replay header (see fuzz_header)
+    :param events: list of (delay, kind, argument) tuples
+    :param invariant: name of the failing invariant
+    :return: minimized list of events
+    """
+    runs = [0]
+
+    def fails(candidate):
+        """
+        Check if input still fails the same way
+        :param candidate: list of events
+        :return: True if so
+        """
+        runs[0] += 1
+        failure, _ = run_events(header, candidate)
+        return failure is not None and failure[0] == invariant
+
+    chunks = 2
+    while len(events) >= 2 and runs[0] < MINIMIZE_RUNS:
+        size = -(-len(events) // chunks)
+        for start in range(0, len(events), size):
+            if runs[0] >= MINIMIZE_RUNS:
+                break
+            candidate = events[:start] + events[start + size:]
+            if fails(candidate):
+                events = candidate
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            chunks = min(chunks * 2, len(events))
+    return events
+
+
+def save_failure(filename, header, events):
+    """
+    Record input events into a replay file
+    :param filename: replay file
+    :param header: replay header (see fuzz_header)
+    :param events: list of (delay, kind, argument) tuples
+    :return: None
+    """
+    session = Session(header, Recorder(filename, header))
+    for event in events:
+        if session.feed(event) or session.closed():
+            break
+    session.game.stop_recording()
+
+
+def fuzz(job):
+    """
+    Fuzz a number of inputs: sessions are played one after another
+    (a new one as soon as the game is quit) until the first failure,
+    which is minimized then
+    :param job: (seed, number of inputs, guided, output directory or None) tuple
+    :return: dictionary with fuzzing results
+    """
+    seed, inputs, guided, directory = job
+    start = time.perf_counter()
+    header = fuzz_header(seed)
+    rng = random.Random(seed)
+    result = {
+        'seed': seed,
+        'inputs': 0,
+        'sessions': 0,
+        'ticks': 0,
+        'boards': set(),
+        'modes': set(),
+        'failure': None,
+        'minimized': None,
+        'replay': None
+    }
+    events = []
+    failure = None
+    while result['inputs'] < inputs and not failure:
+        session = Session(header)
+        result['sessions'] += 1
+        events = []
+        while result['inputs'] < inputs and not session.closed():
+            event = random_input(session.game, rng, guided)
+            events.append(event)
+            result['inputs'] += 1
+            failure = session.feed(event)
+            result['boards'].add(session.game.board)
+            result['modes'].add(session.game.state.mode)
+            if failure:
+                break
+        result['ticks'] += session.game.clock.ticks
+    if failure:
+        invariant, _ = failure
+        events = minimize(header, events, invariant)
+        result['failure'] = failure
+        result['minimized'] = len(events)
+        if directory:
+            result['replay'] = os.path.join(directory, f"fuzz-{seed}-{invariant}{FUZZ_SUFFIX}")
+            save_failure(result['replay'], header, events)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+class FuzzParams(namedtuple('FuzzParams', ('jobs', 'inputs', 'seed', 'guided', 'processes',
+                                           'directory'),
+                            defaults=(100, 5000, 0, True, None, None))):
+    """
+    Parameters of a fuzzing run (see run_fuzz):
+    * jobs -- number of fuzzing jobs (every one with its own seed)
+    * inputs -- number of input events per job
+    * seed -- base seed (job number is added to it)
+    * guided -- True to click rectangles of current board more often
+    * processes -- number of worker processes (None: all the cores)
+    * directory -- directory to save minimized failures to (None: do not save)
+    """
+    __slots__ = ()
+
+
+def run_fuzz(params):
+    """
+    Fuzz across a process pool
+    :param params: FuzzParams object
+    :return: list of fuzzing results (see fuzz)
+    """
+    jobs = [(params.seed + i, params.inputs, params.guided, params.directory)
+            for i in range(params.jobs)]
+    with multiprocessing.Pool(params.processes) as pool:
+        return pool.map(fuzz, jobs, chunksize=1)
+
+
+def report(results, seconds):
+    """
+    Print fuzzing results
+    :param results: list of fuzzing results (see fuzz)
+    :param seconds: wall time taken
+    :return: number of failed jobs
+    """
+    failed = 0
+    for result in results:
+        if result['failure']:
+            failed += 1
+            invariant, details = result['failure']
+            print(f"seed {result['seed']}: {invariant}: {details} "
+                  f"(input {result['inputs']}, minimized to {result['minimized']})"
+                  + (f" -> {result['replay']}" if result['replay'] else ""))
+    inputs = sum(x['inputs'] for x in results)
+    boards = set().union(*(x['boards'] for x in results)) if results else set()
+    modes = set().union(*(x['modes'] for x in results)) if results else set()
+    print(f"{len(results)} jobs, {sum(x['sessions'] for x in results)} sessions, "
+          f"{failed} failed, {inputs} inputs, "
+          f"{sum(x['ticks'] for x in results)} ticks in {seconds:.1f} s "
+          f"({3600 * inputs / seconds if seconds > 0 else 0:.0f} inputs/hour)")
+    print(f"boards: {', '.join(x.name for x in sorted(boards))}")
+    print(f"modes: {', '.join(x.name for x in sorted(modes))}")
+    return failed
+
+
+def __usage__(msg=None):
+    print_usage("Spaceshooter input fuzzer", "", [
+        "-n jobs -- number of fuzzing jobs, every one with its own seed (default: 100)",
+        "-i inputs -- number of inputs per job (default: 5000)",
+        "-r -- random input only (default: guided by current board)",
+        "-o directory -- save minimized failures as replays into directory",
+        "-j processes -- number of worker processes (default: all the cores)",
+        "-s seed -- base random seed (default: 0)",
+        "-h -- print this help message and terminate"], msg)
+
+
+if __name__ == "__main__":
+    fuzz_params = {}
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "n:i:ro:j:s:h", [])
+        for o, a in opts:
+            if o == "-n":
+                fuzz_params['jobs'] = int(a)
+            elif o == "-i":
+                fuzz_params['inputs'] = int(a)
+            elif o == "-r":
+                fuzz_params['guided'] = False
+            elif o == "-o":
+                fuzz_params['directory'] = a
+            elif o == "-j":
+                fuzz_params['processes'] = int(a)
+            elif o == "-s":
+                fuzz_params['seed'] = int(a)
+            elif o == "-h":
+                __usage__()
+                sys.exit(0)
+    except (getopt.GetoptError, ValueError) as ge:
+        __usage__(str(ge))
+        sys.exit(1)
+    started = time.perf_counter()
+    sys.exit(1 if report(run_fuzz(FuzzParams(**fuzz_params)), time.perf_counter() - started) else 0)
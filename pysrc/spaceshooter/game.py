@@ -6,25 +6,29 @@ Main Game class
 
 import os
 
-from spaceshooter.stypes import UserInput, Key, Options, MissileType, MovableType,\
-    FireballDirection, Board, Mode, SetupMode
-from spaceshooter.primi import Rect, Missile, Player, Movable, Explosion, Bomb,\
-    FireMissile, Star
+from spaceshooter.stypes import UserInput, Key, Options, Board, Mode, SetupMode
+from spaceshooter.primi import Rect
 from spaceshooter.sconfig import ShooterConfig
 from spaceshooter.slocales import locales
-from spaceshooter.sdefs import star_ids, ARENA_HEIGHT, ARENA_WIDTH, TIMEOUT_PAINT, TIMEOUT_WELCOME,\
-    TIMEOUT_SMOKE, TIMEOUT_GET_READY, TIMEOUT_NEWSCORE, TIMEOUT_GAME_EVENTS, MAX_LEVEL,\
-    TIMEOUT_SETUP_ENTER, TIMEOUT_ENEMIES_EVENTS, TIMEOUT_GAME_UPDATE, TIMEOUT_GAME_COUNTER,\
-    MAX_NICK_LEN, BOTTOM_BAR, TIMEOUT_MISSILE_LOCK, TIMEOUT_SHIELD, TIMEOUT_LIGHT,\
-    TIMEOUT_BOMB_LOCK, SHIELD_TIMER, TIMEOUT_FREEZE, MAX_PLAYER_INDEX, LIGHTBALL_TIMER,\
-    FROZEN_TIMER
-from spaceshooter.managers import EventManager, EnemyManager
+from spaceshooter.sdefs import ARENA_HEIGHT, ARENA_WIDTH, TIMEOUT_WELCOME,\
+    TIMEOUT_NEWSCORE, TIMEOUT_SETUP_ENTER, TIMEOUT_TICK, TIMEOUT_PAINT, MAX_NICK_LEN,\
+    MAX_PLAYER_INDEX, TURBO_BATCH_TICKS, TIMEOUT_PLAYER_MOVE
+from spaceshooter.simulation import GameState
+from spaceshooter.sclock import Clock
+from spaceshooter.snapshot import ImageIndex
+from spaceshooter.autopilot import autopilot_policy, MOVES, BOARD_KEYS, MODE_KEYS
 
 
 class Game:
     """
     Main Game class, with all logic here
     """
+    transient = ('shooter', 'arena', 'recorder', 'state', 'clock', 'config',
+                 'mousepress_events', 'keyrelease_events', 'keypress_events',
+                 'keyreleasegame_events', 'keypressgame_events', 'board_initializers',
+                 'setupmode_initializers', 'turbo', 'render_every', 'painted_tick',
+                 'image_index', 'autopilot')
+
     def __init__(self, shooter, params=None):
         """
         Create game instance
@@ -33,14 +37,21 @@ class Game:
         if params:
             lastfont = params.get('lastfont', None)
             read = params.get('reset', False)
+            seed = params.get('seed', None)
+            config = params.get('config', None)
         else:
             lastfont = None
             read = False
-        self.config = ShooterConfig(
-            filename=os.path.expanduser("~/.spaceshooterrc"),
-            lastfont=lastfont)
-        if read:
-            self.config.read()
+            seed = None
+            config = None
+        if config:
+            self.config = config
+        else:
+            self.config = ShooterConfig(
+                filename=os.path.expanduser("~/.spaceshooterrc"),
+                lastfont=lastfont)
+            if read:
+                self.config.read()
         self.counter = {
             'welcome': 1
         }
@@ -55,7 +66,8 @@ class Game:
         ]
         self.shooter = shooter
         self.arena = None
-        self.mode = Mode.NONE
+        self.recorder = None  # Input recorder, if any (see replay.Recorder)
+        self.image_index = None  # Images indexed for snapshots, built when needed
         # Setup-related
         self.setupmode = SetupMode.DISPLAY
         self.temp_setup = {}
@@ -143,15 +155,6 @@ class Game:
             Board.QUIT: self.__init_quit,
             Board.NEWSCORE: self.__init_newscore
         }
-        self.mode_initializers = {
-            Mode.INIT: self.__init_init,  # Yes.
-            Mode.PREPARE: self.__init_prepare,
-            Mode.PLAY: self.__init_play,
-            Mode.PAUSED: self.__init_paused,
-            Mode.KILLED: self.__init_killed,
-            Mode.GAMEOVER: self.__init_gameover,
-            Mode.CONGRATS: self.__init_congrats
-        }
         self.setupmode_initializers = {
             SetupMode.DISPLAY: self.__init_display,
             SetupMode.ENTER: self.__init_enter
@@ -166,36 +169,24 @@ class Game:
         self.options_pos = self.config['lastmode']
         # Game settings:
         self.nick = ""
-        # Game objects:
-        self.iceboxes = []
-        self.bombs = []
-        self.lightballs = []
-        self.medkits = []
-        self.missiles = []
-        self.firemissiles = []
-        self.boss = None
-        self.tnts = []
-        self.tnt = 0
-        self.shields = []
-        self.meteorites = []
-        self.drops = []
-        self.explosions = []
-        # Game-related:
         self.player_index = 0
-        self.points = 750
-        self.level = -1
-        self.lives = 3
-        self.indicators = 10
-        self.stars = Star.from_factory(
-            star_ids,
-            self.shooter.images['star'])
-        self.shield_timer = 0
-        self.frozen_timer = 0
-        self.lightball_timer = 0
-        self.movable_factory = None
-        self.movables = []
-        self.get_ready_counter = 0
-        self.get_ready = 3
+        # Game simulation:
+        self.state = GameState(self.shooter.images, self.options_pos, self.player_index, seed)
+        # Master clock (every periodic job is derived from its ticks):
+        self.clock = Clock()
+        self.clock.add('simulation-step', self.step_event)
+        self.clock.add('welcome-event', self.welcome_event)
+        self.clock.add('setup-enter-event', self.setup_enter_event)
+        self.clock.add('newscore-event', self.newscore_event)
+        self.clock.add('keyframe-event', self.keyframe_event)
+        self.clock.add('check-event', self.check_event)
+        self.clock.add('autopilot-event', self.autopilot_event)
+        self.clock.start('simulation-step', TIMEOUT_TICK)
+        # Turbo mode (uncapped simulation speed):
+        self.turbo = False
+        self.render_every = 0
+        self.painted_tick = 0
+        self.autopilot = False  # Autopilot plays instead of the user (see set_autopilot)
         self.menu_rectangles = []
         self.options_rectangles = []
         self.lang_rectangles = []
@@ -220,18 +211,8 @@ class Game:
                    self.shooter.images['icons']['next'].width(),
                    self.shooter.images['icons']['next'].height())
         self.player_rectangles.append(r_x)
-        self.eventmanager = EventManager(self, self.shooter)
-        self.enemymanager = EnemyManager(self, self.shooter)
         # Newscore
         self.newscore_counter = 0
-        # Player related
-        self.player = None
-        # Bombs related
-        self.bomb_lock = False
-        # Missiles related
-        self.missile_lock = False
-        # Smoke related
-        self.smoke_counter = 0
 
     def __has_key_setup(self, key):
         """
@@ -247,7 +228,7 @@ class Game:
         :param _: unused
         :return: None
         """
-        self.shooter.timers['stars-update-event'].start(TIMEOUT_PAINT)
+        self.clock.stop('welcome-event')
         self.change_board(Board.MENU)
 
     def __mousepress_player(self, event):
@@ -305,7 +286,7 @@ class Game:
         :param event: Event to process
         :return: None
         """
-        if self.mode in [Mode.GAMEOVER, Mode.CONGRATS]:
+        if self.state.mode in [Mode.GAMEOVER, Mode.CONGRATS]:
             if self.lang_rectangles[0].contains(event.x, event.y):
                 self.config['lang'] = 'pl'
                 self.__update_menu_rectangles()
@@ -438,6 +419,8 @@ class Game:
         :param event: Event to handle
         :return: None
         """
+        if self.recorder:
+            self.recorder.mouse_pressed(self.clock.ticks, event)
         self.mousepress_events[self.board](event)
 
     def __update_menu_rectangles(self):
@@ -483,14 +466,11 @@ class Game:
 
     def __change_mode(self, mode):
         """
-        Change game mode, then execute its initial action
+        Change game mode (handled by the simulation)
         :param mode: Mode to change to
         :return: None
         """
-        if mode != self.mode:
-            self.mode = mode
-            initializer = self.mode_initializers[mode]
-            initializer()
+        self.state.change_mode(mode)
 
     def __change_setup(self, setup):
         """
@@ -514,49 +494,25 @@ class Game:
         Initialize Welcome board
         :return: None
         """
-        self.shooter.timers['welcome-event'].start(TIMEOUT_WELCOME)
-        self.shooter.timers['paint-event'].start(TIMEOUT_PAINT)
-
-    def __stop_timers(self):
-        """
-        Stop all game-related timers
-        """
-        for event in ["game-counter-event",
-                      "movable-update-event",
-                      "get-ready-event",
-                      "game-update-event",
-                      "setup-enter-event",
-                      "enemies-event",
-                      "game-events",
-                      "game-shield-event",
-                      "game-freeze-event",
-                      "game-light-event",
-                      "smoke-timer"
-                      ]:
-            self.shooter.timers[event].stop()
+        self.clock.start('welcome-event', TIMEOUT_WELCOME)
 
     def __init_menu(self):
         """
         Initialize menu board
         :return: None
         """
-        self.player = None
         self.__update_menu_rectangles()
-        self.__stop_timers()
-        self.shooter.timers['setup-enter-event'].stop()
-
-    def __init_congrats(self):
-        """
-        Initialize Congratulations board
-        :return: None
-        """
-        self.__stop_timers()
+        # Leaving the game (if any) stops the simulation:
+        self.__change_mode(Mode.NONE)
+        self.clock.stop('setup-enter-event')
 
     def __init_game(self):
         """
         Initialize Game board
         :return: None
         """
+        self.state.options_pos = self.options_pos
+        self.state.player_index = self.player_index
         self.__change_mode(Mode.INIT)
 
     def __init_options(self):
@@ -572,7 +528,7 @@ class Game:
         Initialize HiScores board
         :return: None
         """
-        self.shooter.timers['newscore-event'].stop()
+        self.clock.stop('newscore-event')
 
     def __init_setup(self):
         """
@@ -600,7 +556,7 @@ class Game:
         Initialize NewScore board
         :return: None
         """
-        self.shooter.timers['newscore-event'].start(TIMEOUT_NEWSCORE)
+        self.clock.start('newscore-event', TIMEOUT_NEWSCORE)
 
     def __init_display(self):
         """
@@ -623,119 +579,15 @@ class Game:
             self.config.get_key(UserInput.TNT),
         ]
         self.temp_position = 0
-        self.shooter.timers['setup-enter-event'].start(TIMEOUT_SETUP_ENTER)
+        self.clock.start('setup-enter-event', TIMEOUT_SETUP_ENTER)
         self.setup_counter = 0
 
-    def __init_init(self):
-        """
-        Very first game initializer
-        :return: None
-        """
-        self.points = 0
-        self.level = -1
-        self.lives = 3
-        self.indicators = 10
-        self.tnt = 3
-        self.eventmanager = EventManager(self, self.shooter)
-        self.enemymanager = EnemyManager(self, self.shooter)
-        self.__change_mode(Mode.PREPARE)
-        self.shooter.timers['smoke-timer'].start(TIMEOUT_SMOKE)
-
-    def __init_prepare(self):
-        """
-        Game prepare initializer
-        :return: None
-        """
-        if self.level < MAX_LEVEL:
-            self.level += 1
-        self.enemymanager.clear()
-        self.enemymanager.set_level(self.level)
-        self.eventmanager.set_level(self.level)
-        self.medkits = []
-        self.missiles = []
-        self.firemissiles = []
-        self.tnts = []
-        self.shields = []
-        self.shield_timer = 0
-        self.frozen_timer = 0
-        self.lightball_timer = 0
-        self.lightballs = []
-        self.drops = []
-        self.iceboxes = []
-        self.movable_factory = MovableType.get_from_factory(self.level)
-        self.bombs = []
-        movs = []
-        for _ in range(0, 16):
-            movs.append(next(self.movable_factory))
-        self.movables = Movable.from_factory(movs,
-                                             ARENA_WIDTH,
-                                             self.shooter.images['movables'])
-        if not self.player:
-            self.player = Player(200, 400,
-                                 self.shooter.images['players'][self.player_index])
-        self.shooter.timers['get-ready-event'].start(TIMEOUT_GET_READY)
-
-    def __init_play(self):
-        """
-        Perform all the actions necessary to start the game
-        :return: None
-        """
-        self.game_counter = 0
-        option = self.options_pos % 3
-        timeout_ge = TIMEOUT_GAME_EVENTS - 100 * (option + self.level)
-        timeout_ee = TIMEOUT_ENEMIES_EVENTS - 100 * (option + self.level)
-        self.shooter.timers['game-update-event'].start(TIMEOUT_GAME_UPDATE)
-        self.shooter.timers['game-counter-event'].start(TIMEOUT_GAME_COUNTER)
-        self.shooter.timers['game-events'].start(timeout_ge)
-        self.shooter.timers['enemies-event'].start(timeout_ee)
-        self.shooter.timers['smoke-timer'].start(TIMEOUT_SMOKE)
-
-    def __init_paused(self):
-        """
-        Perform all the actions needed when paused
-        :return: None
-        """
-        self.shooter.timers['game-update-event'].stop()
-        self.shooter.timers['game-counter-event'].stop()
-        self.shooter.timers['game-events'].stop()
-        self.shooter.timers['enemies-event'].stop()
-        self.shooter.timers['smoke-timer'].stop()
-
-    def __init_killed(self):
-        """
-        Perform all the actions needed when killed
-        :return: None
-        """
-        self.__stop_timers()
-        # No enemies while killed and waiting for RET key:
-        self.enemymanager.clear()
-        # Clear any event objects on the board:
-        self.missiles = []
-        self.tnts = []
-        self.firemissiles = []
-        self.medkits = []
-        self.shields = []
-        self.drops = []
-        self.lightballs = []
-        # Clear any other timers:
-        self.lightball_timer = 0
-        self.shield_timer = 0
-        self.frozen_timer = 0
-        self.bombs = []
-
     def __init_help(self):
         """
         Initial actions done when help (no actions)
         :return: None
         """
 
-    def __init_gameover(self):
-        """
-        Initial actions done when game over
-        :return: None
-        """
-        self.__stop_timers()
-
     def __keyrelease_player(self, key):
         """
         Key handler for Player board
@@ -760,7 +612,7 @@ class Game:
         :return: None
         """
         if key in (Key.KEY_ESCAPE, Key.KEY_Q):
-            if self.config.is_hiscore(self.points):
+            if self.config.is_hiscore(self.state.points):
                 self.change_board(Board.NEWSCORE)
             else:
                 self.change_board(Board.HISCORES)
@@ -771,7 +623,7 @@ class Game:
         :param _k: unused
         :return: None
         """
-        self.shooter.timers['stars-update-event'].start(TIMEOUT_PAINT)
+        self.clock.stop('welcome-event')
         self.change_board(Board.MENU)
 
     def __keyrelease_menu(self, key):
@@ -797,8 +649,8 @@ class Game:
         :param key: Key to handle
         :return: None
         """
-        if self.mode in self.keyreleasegame_events:
-            handler = self.keyreleasegame_events[self.mode]
+        if self.state.mode in self.keyreleasegame_events:
+            handler = self.keyreleasegame_events[self.state.mode]
             handler(key)
 
     def __keypress_game(self, key):
@@ -807,8 +659,8 @@ class Game:
         :param key: Key to handle
         :return: None
         """
-        if self.mode in self.keypressgame_events:
-            handler = self.keypressgame_events[self.mode]
+        if self.state.mode in self.keypressgame_events:
+            handler = self.keypressgame_events[self.state.mode]
             handler(key)
 
     def __keyrelease_options(self, key):
@@ -924,7 +776,7 @@ class Game:
                     self.nick = "".join(n_list)
             elif key == Key.KEY_ENTER:
                 if len(self.nick) > 0:
-                    self.config.add_hiscore(self.nick, self.points)
+                    self.config.add_hiscore(self.nick, self.state.points)
                 self.change_board(Board.HISCORES)
 
     def __keyrelease_init(self, key):
@@ -943,19 +795,7 @@ class Game:
         :return: None
         """
         if key in self.useractions:
-            action = self.useractions[key]
-            if action == UserInput.TOP:
-                if self.player.y > 20:
-                    self.player.go_up()
-            elif action == UserInput.BOTTOM:
-                if self.player.y < ARENA_HEIGHT - BOTTOM_BAR - self.player.height - 20:
-                    self.player.go_down()
-            elif action == UserInput.RIGHT:
-                if self.player.x < ARENA_WIDTH - self.player.width - 20:
-                    self.player.go_right()
-            elif action == UserInput.LEFT:
-                if self.player.x > 20:
-                    self.player.go_left()
+            self.state.move_player(self.useractions[key])
 
     def __keyrelease_play(self, key):
         """
@@ -964,29 +804,11 @@ class Game:
         :return: None
         """
         if key == Key.KEY_Q:
-            self.__stop_timers()
             self.change_board(Board.MENU)
         elif key == Key.KEY_ESCAPE:
-            self.shooter.timers['movable-update-event'].stop()
             self.__change_mode(Mode.PAUSED)
         elif key in self.useractions:
-            action = self.useractions[key]
-            if action == UserInput.FIRE:
-                if self.lightball_timer > 0:
-                    self.__create_firemissile(
-                        self.player.x + self.player.w,
-                        self.player.y + self.player.h // 2)
-                else:
-                    self.__create_missile(
-                        self.player.x + self.player.w,
-                        self.player.y + self.player.h // 2,
-                        MissileType.FROM)
-            elif action == UserInput.BOMB:
-                self.__create_bomb(
-                    self.player.x + self.player.w // 4,
-                    self.player.y + self.player.h)
-            elif action == UserInput.TNT:
-                self.__explode_tnt()
+            self.state.use_weapon(self.useractions[key])
 
     def __keyrelease_paused(self, key):
         """
@@ -997,7 +819,6 @@ class Game:
         if key == Key.KEY_Q:
             self.change_board(Board.MENU)
         elif key == Key.KEY_ENTER:
-            self.shooter.timers['movable-update-event'].start(TIMEOUT_PAINT)
             self.__change_mode(Mode.PLAY)
 
     def __keyrelease_killed(self, key):
@@ -1009,8 +830,7 @@ class Game:
         if key == Key.KEY_Q:
             self.change_board(Board.MENU)
         elif key == Key.KEY_ENTER:
-            self.__process_killed()
-            self.shooter.timers['movable-update-event'].start(TIMEOUT_PAINT)
+            self.state.process_killed()
             self.__change_mode(Mode.PLAY)
 
     def __keyrelease_help(self, key):
@@ -1032,525 +852,225 @@ class Game:
                    Key.KEY_ESCAPE]:
             self.change_board(
                 Board.NEWSCORE if self.config.is_hiscore(
-                    self.points) else Board.HISCORES)
+                    self.state.points) else Board.HISCORES)
 
-    def __process_killed(self):
+    def set_turbo(self, enabled, render_every=0):
         """
-        Process killed player
+        Switch turbo mode: simulation runs as fast as possible
+        instead of following wall time
+        :param enabled: True to enable turbo mode, False to disable
+        :param render_every: repaint every that many ticks (0: never repaint)
         :return: None
         """
-        if self.lives > 0:
-            self.indicators = 10
-        self.__stop_timers()
-        self.enemymanager.clear()
-        self.missiles = []
-        self.medkits = []
-        self.shields = []
-        self.tnts = []
-        self.lightballs = []
-        self.drops = []
-        self.iceboxes = []
-        self.explosions = []
+        self.turbo = enabled
+        self.render_every = render_every
+        self.painted_tick = self.clock.ticks
+        self.clock.last = None
+        self.shooter.set_frame_timeout(0 if enabled else TIMEOUT_PAINT)
 
-    def game_paint_event(self):
+    def set_autopilot(self, enabled):
         """
-        Generic paint event
+        Switch autopilot: it plays the game instead of the user
+        :param enabled: True to enable autopilot, False to disable
         :return: None
         """
-        self.arena.paint()
-
-    def stars_update_event(self):
-        """
-        Move all stars according to their policy
-        :return: None
-        """
-        for star in self.stars:
-            star.move()
-
-    def welcome_event(self):
-        """
-        Welcome event handler
-        :return: None
-        """
-        if self.counter['welcome'] > 0:
-            self.counter['welcome'] -= 1
+        self.autopilot = enabled
+        if enabled:
+            self.clock.start('autopilot-event', TIMEOUT_PLAYER_MOVE)
         else:
-            self.shooter.timers['welcome-event'].stop()
-            self.shooter.timers['stars-update-event'].start(TIMEOUT_PAINT)
-            self.change_board(Board.MENU)
+            self.clock.stop('autopilot-event')
 
-    def game_counter_event(self):
+    def autopilot_event(self):
         """
-        Game counter event handler
+        Autopilot event: let the autopilot press keys, just like the user
+        (so its games are recorded and replayed as any other ones)
         :return: None
         """
-        self.game_counter += 1
-
-    def __add_movable(self):
-        """
-        Append new movable from generator
-        :return: None
-        """
-        last = self.movables[-1]
-        x = last.x + last.image.width()  # no spacing, as requested
-        new_type = next(self.movable_factory)
-        new_movable = Movable(x,
-                              self.shooter.images['movables'][new_type],
-                              new_type)
-        self.movables.append(new_movable)
-
-    def movable_update_event(self):
-        """
-        Move all movables according to their policy
-        :return: None
-        """
-        for movable in self.movables:
-            movable.move()
-        if not self.movables[0].is_valid():
-            self.movables.pop(0)
-            self.__add_movable()
-
-    def get_ready_event(self):
-        """
-        Get-ready event handler
-        :return: None
-        """
-        if self.get_ready > 0:
-            self.get_ready -= 1
+        if self.board == Board.GAME and self.state.mode == Mode.PLAY:
+            # The policy does not draw random numbers, so no stream is passed:
+            for action in autopilot_policy(self.state, None):
+                key = self.config.db['keys'].get(action)
+                if key is None:
+                    continue
+                if action in MOVES:
+                    self.keypressed(key)
+                else:
+                    self.keyreleased(key)
+                if self.state.mode != Mode.PLAY:
+                    break
+        elif self.board == Board.GAME:
+            if self.state.mode in MODE_KEYS:
+                self.keyreleased(MODE_KEYS[self.state.mode])
+        elif self.board == Board.MENU and self.menu_pos > 0:
+            self.keyreleased(Key.KEY_TOP)
+        elif self.board in BOARD_KEYS:
+            self.keyreleased(BOARD_KEYS[self.board])
+
+    def frame_event(self):
+        """
+        Frame event: advance the master clock by wall time passed, then paint
+        (in turbo mode run a batch of ticks and paint only every few ticks)
+        :return: None
+        """
+        if self.turbo:
+            count = TURBO_BATCH_TICKS
+            if self.render_every > 0:
+                # Batch stops right at the next repaint:
+                count = min(count, self.painted_tick + self.render_every - self.clock.ticks)
+            self.clock.run(count)
+            if 0 < self.render_every <= self.clock.ticks - self.painted_tick:
+                self.painted_tick = self.clock.ticks
+                self.game_paint_event()
         else:
-            self.shooter.timers['get-ready-event'].stop()
-            self.shooter.timers['movable-update-event'].start(TIMEOUT_PAINT)
-            self.__change_mode(Mode.PLAY)
+            self.clock.update()
+            self.game_paint_event()
 
-    def keyreleased(self, key):
+    def game_paint_event(self):
         """
-        Generic key handler -- released event
-        :param key: Key to handle
+        Generic paint event
         :return: None
         """
-        if self.board in self.keyrelease_events:
-            self.keyrelease_events[self.board](key)
+        self.arena.paint()
 
-    def keypressed(self, key):
+    def get_state(self):
         """
-        Generic key handler -- pressed event
-        :param key: Key to handle
-        :return: None
+        Get game state for a snapshot (see snapshot module)
+        :return: dictionary of attributes
         """
-        if self.board in self.keypress_events:
-            self.keypress_events[self.board](key)
-
-    def __create_missile(self, x, y, etype):
-        """
-        Create new missile
-        :param x: Missile X coordinate
-        :param y: Missile Y coordinate
-        :param etype: Missile type
-        :return: None
-        """
-        if not self.missile_lock:
-            self.missile_lock = True
-            self.shooter.timers['missile-timer'].start(TIMEOUT_MISSILE_LOCK)
-            image = self.shooter.images['missiles'][etype]
-            self.missiles.append(Missile(x, y, etype, image))
-
-    def game_update_event(self):
-        """
-        Move all objects according to their policies
-        :return: None
-        """
-        # Missiles
-        for missile in self.missiles:
-            missile.move()
-        for firemissile in self.firemissiles:
-            firemissile.move()
-        # IceBoxes:
-        for icebox in self.iceboxes:
-            icebox.move()
-        # Bombs
-        for bomb in self.bombs:
-            bomb.move()
-        # Medkids
-        for medkit in self.medkits:
-            medkit.move()
-        # LightBalls
-        for lightball in self.lightballs:
-            lightball.move()
-        # TNTs
-        for tnt in self.tnts:
-            tnt.move()
-        # Shields
-        for shield in self.shields:
-            shield.move()
-        # Enemies
-        if self.frozen_timer == 0:
-            self.enemymanager.move()
-        # Meteorites
-        for meteorite in self.meteorites:
-            meteorite.move()
-        # Drops
-        for drop in self.drops:
-            drop.move()
-        for explosion in self.explosions:
-            explosion.move()
-        self.explosions = [x for x in self.explosions if x.is_valid()]
-        self.__check_collision_shield()
-        self.__check_collision_medkit()
-        self.__check_collision_tnt()
-        self.__check_collision_missiles()
-        self.__check_collision_drops()
-        self.__check_collision_enemies()
-        self.__check_collision_lightball()
-        self.__check_collision_icebox()
-        self.__check_collision_bomb()
-        self.__check_collision_movables()
-
-    def enemies_event(self):
-        """
-        Process enemy manager run
-        :return:
-        """
-        if not self.enemymanager.run():
-            if self.level == MAX_LEVEL:
-                if self.lives == 0:
-                    self.__change_mode(Mode.GAMEOVER)
-                else:
-                    self.explosions.append(
-                        Explosion(self.boss.x + self.boss.image.width() // 2,
-                                  self.boss.y + self.boss.image.height() // 2,
-                                  self.shooter.images['explosions']))
-                    self.__change_mode(Mode.CONGRATS)
-            else:
-                self.__change_mode(Mode.PREPARE)
+        state = {k: v for k, v in self.__dict__.items() if k not in Game.transient}
+        state['state'] = self.state.get_state()
+        ticks, jobs = self.clock.get_state()
+        # Keyframes, checks and autopilot belong to the session, not to the game:
+        del jobs['keyframe-event']
+        del jobs['check-event']
+        del jobs['autopilot-event']
+        state['clock'] = (ticks, jobs)
+        state['config'] = self.config.db
+        return state
 
-    def events_event(self):
+    def set_state(self, state):
         """
-        Handle game events counter event
+        Restore game state from a snapshot
+        :param state: dictionary of attributes (see get_state)
         :return: None
         """
-        self.eventmanager.run()
+        state = dict(state)
+        self.state.set_state(state.pop('state'))
+        self.clock.set_state(state.pop('clock'))
+        self.config.db = state.pop('config')
+        self.__dict__.update(state)
 
-    def setup_enter_event(self):
+    def __image_index(self):
         """
-        Handle Setup Enter counter event
-        :return: None
+        Get images indexed for snapshots (built on first use)
+        :return: ImageIndex object
         """
-        self.setup_counter += 1
+        if self.image_index is None or self.image_index.images is not self.state.images:
+            self.image_index = ImageIndex(self.state.images)
+        return self.image_index
 
-    def __check_collision_drops(self):
-        """
-        Check if any of the drop collided a player - only in normal and hard mode
-        and perform an action:
-        * if not shield/unlimited mode explode player
-        * if not shield/unlimited mode decrease indicator points
-        """
-        if self.shield_timer == 0 and self.options_pos not in (Options.EASY, Options.UNLIMITED):
-            for drop in self.drops:
-                if drop.collides(self.player):
-                    drop.valid = False
-                    self.__explode(
-                        self.player.x + self.player.w // 2,
-                        self.player.y + self.player.h // 2)
-                    self.drops = [x for x in self.drops if x.is_valid()]
-                    self.__decrease_hp()
-
-    def __check_collision_missiles(self):
-        """
-        Check all collisions with missiles
-        :return: None
-        """
-        for missile in self.missiles:
-            if missile.etype == MissileType.FROM and missile.is_valid():
-                for enemy in self.enemymanager.enemies:
-                    if missile.collides(enemy) and enemy.is_valid():
-                        enemy.valid = False
-                        missile.valid = False
-                        self.__explode(enemy.x + enemy.w // 2,
-                                       enemy.y + enemy.h // 2)
-                        self.points += 1
-                for movable in self.movables:
-                    if movable.is_valid() and movable.etype == MovableType.DZIALO and \
-                            movable.collides(missile):
-                        movable.valid = False
-                        self.points += 1
-                        self.__explode(movable.x + movable.w // 2,
-                                       movable.y + movable.h // 2)
-                        self.__add_movable()
-            elif missile.etype in [MissileType.TO,
-                                   MissileType.TO_NWW,
-                                   MissileType.TO_SWW,
-                                   MissileType.TO_NW] and missile.is_valid():
-                if self.shield_timer == 0 and self.options_pos != Options.UNLIMITED:
-                    if missile.collides(self.player):
-                        missile.valid = False
-                        self.__explode(self.player.x + self.player.w // 2,
-                                       self.player.y + self.player.h // 2)
-                        self.__decrease_hp()
-        for fireball in self.firemissiles:
-            for enemy in self.enemymanager.enemies:
-                if enemy.is_valid() and fireball.collides(enemy) and fireball.is_valid():
-                    enemy.valid = False
-                    fireball.valid = False
-                    self.points += 1
-                    self.__explode(enemy.x + enemy.w // 2,
-                                   enemy.y + enemy.h // 2)
-            for movable in self.movables:
-                if movable.is_valid() and movable.etype == MovableType.DZIALO and \
-                        fireball.collides(movable) and fireball.is_valid():
-                    movable.valid = False
-                    self.points += 1
-                    self.__explode(movable.x + movable.w // 2,
-                                   movable.y + movable.h // 2)
-                    self.__add_movable()
-        if self.enemymanager.boss:
-            for missile in self.missiles:
-                if missile.etype == MissileType.FROM and missile.is_valid():
-                    if self.enemymanager.boss.collides(missile):
-                        self.enemymanager.boss.decrease_hp()
-
-        self.enemymanager.enemies = [x for x in self.enemymanager.enemies if x.is_valid()]
-        self.missiles = [x for x in self.missiles if x.is_valid()]
-        self.movables = [x for x in self.movables if x.is_valid()]
-        self.firemissiles = [x for x in self.firemissiles if x.is_valid()]
-
-    def __decrease_hp(self):
-        """
-        Decrease indicator points when collided by an object
-        :return: None
-        """
-        if self.indicators > 0:
-            self.indicators -= 1
-        if self.indicators == 0:
-            self.lives -= 1
-            if self.lives <= 0:  # In case of two timers did the lives < 0
-                self.__change_mode(Mode.GAMEOVER)
-            else:
-                self.__process_killed()
-                self.__change_mode(Mode.KILLED)
-
-    def __increase_hp(self):
+    def snapshot(self):
         """
-        Increase indicator points (when medkit caught)
-        :return: None
+        Take snapshot of the whole game (images are stored as references)
+        :return: snapshot bytes
         """
-        if self.indicators < 10:
-            self.indicators += 1
+        return self.__image_index().dumps(self.get_state())
 
-    def __check_collision_enemies(self):
+    def restore(self, data):
         """
-        Check if player collides with any enemy, then do the action:
-        * explode enemy,
-        * increase game points,
-        * if not unlimited mode/frozen/shield, decrease indicator points
+        Restore the whole game from a snapshot
+        (taken by a game with the same images structure layout)
+        :param data: snapshot bytes (see snapshot)
         :return: None
         """
-        for enemy in self.enemymanager.enemies:
-            if enemy.collides(self.player):
-                self.points += 1
-                enemy.valid = False
-                self.__explode(enemy.x + enemy.w // 2,
-                               enemy.y + enemy.h // 2)
-                self.enemymanager.enemies = [x for x in self.enemymanager.enemies if x.is_valid()]
-                if self.shield_timer == 0 and self.frozen_timer == 0 and \
-                        self.options_pos != Options.UNLIMITED:
-                    self.__decrease_hp()
+        self.set_state(self.__image_index().loads(data))
 
-    def __check_collision_movables(self):
+    def start_recording(self, recorder):
         """
-        Check if player collided with a movable: only hardcore mode.
-        Action:
-        * increase game points
-        * decrease HP
-        * explode building
+        Record all the input (and keyframes and state checks, if requested) from now on
+        :param recorder: replay.Recorder object
         :return: None
         """
-        if self.options_pos == Options.HARD:
-            for movable in self.movables:
-                if movable.collides(self.player):
-                    self.points += 1
-                    movable.valid = False
-                    self.__explode(movable.x + movable.w // 2,
-                                   movable.y + movable.h // 2)
-                    self.__add_movable()
-                    self.movables = [x for x in self.movables if x.is_valid()]
-                    self.__decrease_hp()
+        self.recorder = recorder
+        if recorder.keyframe_every > 0:
+            self.clock.start('keyframe-event', recorder.keyframe_every * TIMEOUT_TICK)
+        if recorder.check_every > 0:
+            self.clock.start('check-event', recorder.check_every * TIMEOUT_TICK)
 
-    def __explode(self, x, y):
+    def stop_recording(self):
         """
-        Create new explosion and append to all explosions list
-        :param x: X coordinate of explosion
-        :param y: Y coordinate of explosion
+        Record the end of the session (with its final results) and close the recording
         :return: None
         """
-        self.explosions.append(
-            Explosion(
-                x, y, self.shooter.images['explosions']))
+        if self.recorder:
+            self.recorder.close(self.clock.ticks,
+                                (self.state.points, self.state.level, self.state.lives))
+            self.recorder = None
+            self.clock.stop('keyframe-event')
+            self.clock.stop('check-event')
 
-    def __explode_tnt(self):
+    def keyframe_event(self):
         """
-        Create 3 explosions when TNT used
+        Keyframe event: store a snapshot of the whole game in the replay
         :return: None
         """
-        if self.tnt > 0 and len(self.enemymanager.enemies) > 0:
-            for i in range(0, 3):
-                try:
-                    enemy = self.enemymanager.enemies[i]
-                    self.__explode(enemy.x + enemy.w // 2,
-                                   enemy.y + enemy.h // 2)
-                    enemy.valid = False
-                except IndexError:
-                    pass
-            self.enemymanager.enemies = [x for x in self.enemymanager.enemies if x.is_valid()]
-            self.tnt -= 1
+        if self.recorder:
+            self.recorder.keyframe(self.clock.ticks, self.snapshot())
 
-    def __check_collision_medkit(self):
+    def check_event(self):
         """
-        Check collision with medkits -- collect health points
-        """
-        for medkit in self.medkits:
-            if medkit.collides(self.player):
-                medkit.valid = False
-                self.__increase_hp()
-        self.medkits = [x for x in self.medkits if x.is_valid()]
-
-    def __check_collision_shield(self):
-        """
-        Check collision with shields -- collect a shield
-        (remove all remaining shields if any)
-        """
-        for shield in self.shields:
-            if shield.collides(self.player):
-                self.shield_timer = SHIELD_TIMER
-                self.shields = []
-                self.shooter.timers['game-shield-event'].start(TIMEOUT_SHIELD)
-
-    def __check_collision_tnt(self):
-        """
-        Check collision with TNT -- collect a TNT
-        """
-        for tnt in self.tnts:
-            if tnt.collides(self.player):
-                self.tnt += 1
-                tnt.valid = False
-        self.tnts = [x for x in self.tnts if x.is_valid()]
-
-    def __check_collision_lightball(self):
-        """
-        Check collision with lightball -- enter LightBall mode
-        (3 missiles in a single shot)
-        """
-        for light_ball in self.lightballs:
-            if light_ball.collides(self.player):
-                self.lightball_timer = LIGHTBALL_TIMER
-                light_ball.valid = False
-                self.lightballs = []
-                self.shooter.timers['game-light-event'].start(TIMEOUT_LIGHT)
-
-    def __check_collision_icebox(self):
-        """
-        Check if player caught icebox
+        Check event: store simulation state hash in the replay
         :return: None
         """
-        for icebox in self.iceboxes:
-            if icebox.collides(self.player):
-                icebox.valid = False
-                self.frozen_timer = FROZEN_TIMER
-                self.iceboxes = []
-                self.missiles = []  # If frozen mode, no missiles shall be present.
-                self.shooter.timers['game-freeze-event'].start(TIMEOUT_FREEZE)
+        if self.recorder:
+            self.recorder.check(self.clock.ticks, self.state.digest())
 
-    def __check_collision_bomb(self):
+    def step_event(self):
         """
-        Check if movable or enemy collided with a bomb
+        Simulation step event (every clock tick)
         :return: None
         """
-        for bomb in self.bombs:
-            for movable in self.movables:
-                if movable.is_valid() and bomb.collides(movable):
-                    self.__explode(movable.x + movable.w // 2, movable.y + movable.h // 2)
-                    bomb.valid = False
-                    movable.valid = False
-                    self.__add_movable()
-                    self.points += 1
-            for enemy in self.enemymanager.enemies:
-                if enemy.is_valid() and bomb.collides(enemy):
-                    self.__explode(enemy.x + enemy.w // 2, enemy.y + enemy.h // 2)
-                    enemy.valid = False
-                    bomb.valid = False
-                    self.points += 1
-        self.movables = [x for x in self.movables if x.is_valid()]
-        self.bombs = [x for x in self.bombs if x.is_valid()]
+        self.state.step()
 
-    def __create_bomb(self, x, y):
+    def welcome_event(self):
         """
-        Create bomb at given location
-        (and start bomb timer)
-        :param x: X coordinate of the bomb
-        :param y: Y coordinate of the bomb
+        Welcome event handler
         :return: None
         """
-        if not self.bomb_lock:
-            self.bomb_lock = True
-            self.bombs.append(
-                Bomb(x, y, self.shooter.images['indicators']['bomb']))
-            self.shooter.timers['bomb-timer'].start(TIMEOUT_BOMB_LOCK)
+        if self.counter['welcome'] > 0:
+            self.counter['welcome'] -= 1
+        else:
+            self.clock.stop('welcome-event')
+            self.change_board(Board.MENU)
 
-    def shield_event(self):
+    def keyreleased(self, key):
         """
-        Handle shield counter event
+        Generic key handler -- released event
+        :param key: Key to handle
         :return: None
         """
-        if self.shield_timer > 0:
-            self.shield_timer -= 1
-        else:
-            self.shooter.timers['game-shield-event'].stop()
+        if self.recorder:
+            self.recorder.key_released(self.clock.ticks, key)
+        if self.board in self.keyrelease_events:
+            self.keyrelease_events[self.board](key)
 
-    def light_event(self):
+    def keypressed(self, key):
         """
-        Handle lightball event
+        Generic key handler -- pressed event
+        :param key: Key to handle
         :return: None
         """
-        if self.lightball_timer > 0:
-            self.lightball_timer -= 1
-        else:
-            self.shooter.timers['game-light-event'].stop()
+        if self.recorder:
+            self.recorder.key_pressed(self.clock.ticks, key)
+        if self.board in self.keypress_events:
+            self.keypress_events[self.board](key)
 
-    def freeze_event(self):
+    def setup_enter_event(self):
         """
-        Handle freeze event
-        (decrease timer or expire freeze)
+        Handle Setup Enter counter event
         :return: None
         """
-        if self.frozen_timer > 0:
-            self.frozen_timer -= 1
-        else:
-            self.shooter.timers['game-freeze-event'].stop()
-
-    def __create_firemissile(self, x, y):
-        """
-        Create fire missile, which in fact contains 3 fireballs
-        :param x: initial X position of firemissile
-        :param y: initial Y position of firemissile
-        :return: None
-        """
-        if not self.missile_lock:
-            self.missile_lock = True
-            self.shooter.timers['missile-timer'].start(TIMEOUT_MISSILE_LOCK)
-            self.firemissiles.append(
-                FireMissile(x,
-                            y,
-                            FireballDirection.UP,
-                            self.shooter.images['indicators']['light-ball']))
-            self.firemissiles.append(
-                FireMissile(x,
-                            y,
-                            FireballDirection.STRAIGHT,
-                            self.shooter.images['indicators']['light-ball']))
-            self.firemissiles.append(
-                FireMissile(x,
-                            y,
-                            FireballDirection.DOWN,
-                            self.shooter.images['indicators']['light-ball']))
+        self.setup_counter += 1
 
     def newscore_event(self):
         """
@@ -1559,28 +1079,3 @@ class Game:
         :return: None
         """
         self.newscore_counter = 0 if self.newscore_counter == 1 else 1
-
-    def bomb_timer(self):
-        """
-        Handle bomb timer
-        (disallow creating too many bombs at once)
-        :return:
-        """
-        self.bomb_lock = False
-
-    def missile_timer(self):
-        """
-        Handle missile timer
-        (disallow creating too many missiles at once)
-        :return:
-        """
-        self.missile_lock = False
-
-    def smoke_timer(self):
-        """
-        Handle smoke timer
-        (rorate smoke frame)
-        :return:
-        """
-        self.smoke_counter += 1
-        self.smoke_counter %= 4
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""
+Leak detector for long headless runs (debug mode of the batch runner):
+watches lengths of all the game object lists, tick after tick,
+and tells the ones growing without bound
+"""
+
+LEAK_WINDOW = 2000  # Simulation ticks per sampling window (10 seconds)
+LEAK_WINDOWS = 6  # Consecutive windows of rising peaks taken for unbounded growth
+
+
+class LeakDetector:
+    """
+    Keeps peak length of every game object list per sampling window.
+    Lists compacted as they shall be go up and down with the game;
+    a list whose peak rises window after window is leaking.
+    """
+    def __init__(self, window=LEAK_WINDOW, windows=LEAK_WINDOWS):
+        """
+        Create detector
+        :param window: simulation ticks per sampling window
+        :param windows: consecutive windows of rising peaks taken for unbounded growth
+        """
+        self.window = window
+        self.windows = windows
+        self.samples = 0
+        self.peaks = {}  # Bucket name -> list of peak lengths, one per window
+        self.last = {}  # Bucket name -> (length, invalid objects) of last sample
+        self.retained = {}  # Bucket name -> max invalid objects retained at once
+
+    def sample(self, entities):
+        """
+        Sample all the game object lists (once per tick)
+        :param entities: Entities registry
+        :return: None
+        """
+        index = self.samples // self.window
+        self.samples += 1
+        self.last = entities.census()
+        for name, (count, invalid) in self.last.items():
+            peaks = self.peaks.setdefault(name, [])
+            if len(peaks) <= index:
+                peaks.append(count)
+            elif count > peaks[index]:
+                peaks[index] = count
+            self.retained[name] = max(self.retained.get(name, 0), invalid)
+
+    def growing(self):
+        """
+        Find lists growing without bound: the ones with peak length rising
+        in every complete window of the last ones (see windows)
+        :return: list of bucket names
+        """
+        complete = self.samples // self.window
+        result = []
+        for name, peaks in self.peaks.items():
+            recent = peaks[:complete][-self.windows - 1:]
+            if len(recent) > self.windows and \
+                    all(a < b for a, b in zip(recent, recent[1:])):
+                result.append(name)
+        return result
+
+    def report(self):
+        """
+        Get lengths of all the game object lists
+        :return: bucket name -> (last length, peak length,
+            last invalid objects, max invalid objects retained) dictionary
+        """
+        return {name: (count, max(self.peaks[name]), invalid, self.retained[name])
+                for name, (count, invalid) in self.last.items()}
@@ -6,14 +6,13 @@ Game managers
 
 
 import math
-import random
 from spaceshooter.stypes import MovableType, MissileType
-from spaceshooter.primi import Tnt, Drop, Missile, Medkit,\
-    IceBox, Enemy, LightBall, Boss, Shield
+from spaceshooter.primi import Boss
 from spaceshooter.sdefs import MAX_EVENTS_FACTOR, ARENA_WIDTH,\
     ARENA_HEIGHT, STAGE_HEIGHT, MAX_LEVEL
 from spaceshooter.sevents import GameEvent, EnemyEvent
 from spaceshooter.sutils import cycle
+from spaceshooter.sprites import sprite_meta
 
 
 class EventManager:
@@ -21,15 +20,18 @@ class EventManager:
     Manage game events in efficient way
     """
 
-    def __init__(self, parent, shooter):
+    transient = ('parent', 'creates', 'eventq')
+
+    def __init__(self, parent):
         """
         Create EventManager object
-        :param parent: Game parent handler
-        :param shooter: Shooter handler
+        :param parent: Game state parent handler
         """
-        self.eventq = []
+        self.eventq = ()
+        self.eventpos = 0
+        self.iterations = 0
         self.parent = parent
-        self.shooter = shooter
+        self.rng = self.parent.streams.stream('events')
         self.level = 0
         self.creates = {
             GameEvent.DROP: self.__create_drop,
@@ -51,163 +53,184 @@ class EventManager:
         :param level: Game level number
         """
         self.level = level
-        iterations = 12 + self.level + self.parent.options_pos
-        self.eventq = GameEvent.from_factory(level, iterations * MAX_EVENTS_FACTOR)
+        self.iterations = (12 + self.level + self.parent.options_pos) * MAX_EVENTS_FACTOR
+        self.eventq = GameEvent.from_factory(level, self.iterations)
+        self.eventpos = 0
 
     def pop(self) -> GameEvent:
         """
         Get first event from queue
         :return: GameEvent object
         """
-        return self.eventq.pop(0)
+        event = self.eventq[self.eventpos]
+        self.eventpos += 1
+        return event
+
+    def pending(self):
+        """
+        Get number of events left in queue
+        :return: number of events
+        """
+        return len(self.eventq) - self.eventpos
+
+    def get_state(self):
+        """
+        Get manager state for a snapshot
+        (event queue itself is rebuilt from level on restore)
+        :return: dictionary of attributes
+        """
+        return {k: v for k, v in self.__dict__.items() if k not in EventManager.transient}
+
+    def set_state(self, state):
+        """
+        Restore manager state from a snapshot
+        :param state: dictionary of attributes (see get_state)
+        :return: None
+        """
+        self.__dict__.update(state)
+        self.eventq = GameEvent.from_factory(self.level, self.iterations)
 
     def __create_tnt(self):
         """
         Create a single, random TNT box
         """
 
-        self.parent.tnts.append(
-            Tnt(
-                ARENA_WIDTH,
-                random.randint(150, 3 * ARENA_HEIGHT // 4),
-                self.shooter.images['indicators']['tnt']))
+        self.parent.entities.spawn(
+            'tnts',
+            ARENA_WIDTH,
+            self.rng.randint(150, 3 * ARENA_HEIGHT // 4),
+            self.parent.images['indicators']['tnt'])
 
     def __create_drop(self):
         """
         Create a single, random drop
         """
-        self.parent.drops.append(
-            Drop(
-                random.randint(ARENA_WIDTH // 3, ARENA_WIDTH),
-                0,
-                self.shooter.images['indicators']['drop']))
+        self.parent.entities.spawn(
+            'drops',
+            self.rng.randint(ARENA_WIDTH // 3, ARENA_WIDTH),
+            0,
+            self.parent.images['indicators']['drop'])
 
     def __create_drops(self):
         """
         Create two random drops
         """
-        self.parent.drops.append(
-            Drop(
-                random.randint(ARENA_WIDTH // 3, 2 * ARENA_WIDTH // 3),
-                0,
-                self.shooter.images['indicators']['drop']))
-        self.parent.drops.append(
-            Drop(
-                random.randint(2 * ARENA_WIDTH // 3, ARENA_WIDTH),
-                0,
-                self.shooter.images['indicators']['drop']))
+        self.parent.entities.spawn(
+            'drops',
+            self.rng.randint(ARENA_WIDTH // 3, 2 * ARENA_WIDTH // 3),
+            0,
+            self.parent.images['indicators']['drop'])
+        self.parent.entities.spawn(
+            'drops',
+            self.rng.randint(2 * ARENA_WIDTH // 3, ARENA_WIDTH),
+            0,
+            self.parent.images['indicators']['drop'])
 
     def __create_gun_missiles(self):
         """
         Create gun missiles for every visible gun, (if not in frozen mode)
         :return: None
         """
-        if self.parent.frozen_timer == 0:
-            for movable in self.parent.movables:
+        if not self.parent.is_active('freeze'):
+            meta = sprite_meta(self.parent.images['missiles'][MissileType.TO_NW])
+            for movable in self.parent.entities['movables']:
                 if movable.is_valid() and movable.etype == MovableType.DZIALO:
-                    image = self.shooter.images['missiles'][MissileType.TO_NW]
-                    self.parent.missiles.append(
-                        Missile(movable.x - image.width(),
-                                movable.y - image.height(),
-                                MissileType.TO_NW,
-                                image))
+                    self.parent.entities.spawn('missiles',
+                                               movable.x - meta.w,
+                                               movable.y - meta.h,
+                                               meta.image,
+                                               MissileType.TO_NW)
 
     def __create_missiles(self):
         """
         Create missiles for all enemies
         :return: None
         """
-        if len(self.parent.enemymanager.enemies) > 0 and self.parent.frozen_timer == 0:
-            image = self.shooter.images['missiles'][MissileType.TO]
-            w = image.width()
-            h = image.height()
+        if len(self.parent.enemymanager.enemies) > 0 and not self.parent.is_active('freeze'):
+            image, w, h, _, _ = sprite_meta(self.parent.images['missiles'][MissileType.TO])
             for enemy in self.parent.enemymanager.enemies:
-                self.parent.missiles.append(
-                    Missile(enemy.x - w,
-                            enemy.y - h // 2,
-                            MissileType.TO,
-                            image))
+                self.parent.entities.spawn('missiles',
+                                           enemy.x - w,
+                                           enemy.y - h // 2,
+                                           image,
+                                           MissileType.TO)
 
     def __create_missiles_even(self):
         """
         Create missiles for even enemies
         :return: None
         """
-        if len(self.parent.enemymanager.enemies) > 0 and self.parent.frozen_timer == 0:
-            image = self.shooter.images['missiles'][MissileType.TO]
-            w = image.width()
-            h = image.height()
+        if len(self.parent.enemymanager.enemies) > 0 and not self.parent.is_active('freeze'):
+            image, w, h, _, _ = sprite_meta(self.parent.images['missiles'][MissileType.TO])
             for enemy in self.parent.enemymanager.enemies:
                 if not enemy.odd:
-                    self.parent.missiles.append(
-                        Missile(enemy.x - w,
-                                enemy.y - h // 2,
-                                MissileType.TO,
-                                image))
+                    self.parent.entities.spawn('missiles',
+                                               enemy.x - w,
+                                               enemy.y - h // 2,
+                                               image,
+                                               MissileType.TO)
 
     def __create_missiles_odd(self):
         """
         Create missiles for odd enemies
         :return: None
         """
-        if len(self.parent.enemymanager.enemies) > 0 and self.parent.frozen_timer == 0:
-            image = self.shooter.images['missiles'][MissileType.TO]
-            w = image.width()
-            h = image.height()
+        if len(self.parent.enemymanager.enemies) > 0 and not self.parent.is_active('freeze'):
+            image, w, h, _, _ = sprite_meta(self.parent.images['missiles'][MissileType.TO])
             for enemy in self.parent.enemymanager.enemies:
                 if enemy.odd:
-                    self.parent.missiles.append(
-                        Missile(enemy.x - w,
-                                enemy.y - h // 2,
-                                MissileType.TO,
-                                image))
+                    self.parent.entities.spawn('missiles',
+                                               enemy.x - w,
+                                               enemy.y - h // 2,
+                                               image,
+                                               MissileType.TO)
 
     def __create_medkit(self):
         """
         Create new medkit and append to list of all medkits
         :return: None
         """
-        self.parent.medkits.append(
-            Medkit(ARENA_WIDTH,
-                   random.randint(250, 3 * ARENA_HEIGHT // 4),
-                   self.shooter.images['indicators']['medkit']))
+        self.parent.entities.spawn('medkits',
+                                   ARENA_WIDTH,
+                                   self.rng.randint(250, 3 * ARENA_HEIGHT // 4),
+                                   self.parent.images['indicators']['medkit'])
 
     def __create_freeze(self):
         """
         Create new icebox and append to list of all iceboxes
         :return: None
         """
-        self.parent.iceboxes.append(
-            IceBox(ARENA_WIDTH,
-                   random.randint(150, 3 * ARENA_HEIGHT // 4),
-                   self.shooter.images['indicators']['frozen-box']))
+        self.parent.entities.spawn('iceboxes',
+                                   ARENA_WIDTH,
+                                   self.rng.randint(150, 3 * ARENA_HEIGHT // 4),
+                                   self.parent.images['indicators']['frozen-box'])
 
     def __create_lightball(self):
         """
         Create random LightBall object
         :return: None
         """
-        self.parent.lightballs.append(
-            LightBall(ARENA_WIDTH,
-                      random.randint(150, 3 * ARENA_HEIGHT // 4),
-                      self.shooter.images['indicators']['light-ball']))
+        self.parent.entities.spawn('lightballs',
+                                   ARENA_WIDTH,
+                                   self.rng.randint(150, 3 * ARENA_HEIGHT // 4),
+                                   self.parent.images['indicators']['light-ball'])
 
     def __create_shield(self):
         """
         Create random Shield object
         :return: None
         """
-        self.parent.shields.append(
-            Shield(ARENA_WIDTH,
-                   random.randint(150, 3 * ARENA_HEIGHT // 4),
-                   self.shooter.images['indicators']['shield']))
+        self.parent.entities.spawn('shields',
+                                   ARENA_WIDTH,
+                                   self.rng.randint(150, 3 * ARENA_HEIGHT // 4),
+                                   self.parent.images['indicators']['shield'])
 
     def run(self):
         """
         Process event queue
         :return: None
         """
-        if len(self.eventq) > 0:
+        if self.pending() > 0:
             event = self.pop()
             if event is not GameEvent.NONE:
                 creator = self.creates[event]
@@ -219,21 +242,24 @@ class EnemyManager:
     Manage game enemies in efficient way
     """
 
-    def __init__(self, parent, shooter):
+    transient = ('parent', 'images', 'creates', 'moves', 'eventq')
+
+    def __init__(self, parent):
         """
         Create manager instance
-        :param parent: Manager parent handle (game)
-        :param shooter: Shooter handle
+        :param parent: Manager parent handle (game state)
         """
-        self.enemies = []
         self.parent = parent
-        self.shooter = shooter
+        self.parent.entities.clear('enemies')
+        self.rng = self.parent.streams.stream('enemies')
         self.boss = None
-        self.images = self.shooter.images['enemies']
+        self.images = self.parent.images['enemies']
         self.imagen = cycle(self.images)
         self.etype = EnemyEvent.NONE
         self.level = 0
-        self.eventq = []
+        self.eventq = ()
+        self.eventpos = 0
+        self.iterations = 0
         self.creates = {
             EnemyEvent.CIRCLE: self.__create_circle,
             EnemyEvent.SQUARE: self.__create_square,
@@ -258,24 +284,66 @@ class EnemyManager:
         :return: None
         """
         self.level = level
-        iterations = 12 + self.level + self.parent.options_pos
-        self.eventq = EnemyEvent.from_factory(level, iterations)
+        self.iterations = 12 + self.level + self.parent.options_pos
+        self.eventq = EnemyEvent.from_factory(level, self.iterations)
+        self.eventpos = 0
 
     def pop(self) -> EnemyEvent:
         """
         Pop an event to process
         :return: EnemyEvent
         """
-        return self.eventq.pop(0)
+        event = self.eventq[self.eventpos]
+        self.eventpos += 1
+        return event
+
+    def pending(self):
+        """
+        Get number of events left in queue
+        :return: number of events
+        """
+        return len(self.eventq) - self.eventpos
+
+    def get_state(self):
+        """
+        Get manager state for a snapshot
+        (event queue itself is rebuilt from level on restore)
+        :return: dictionary of attributes
+        """
+        return {k: v for k, v in self.__dict__.items() if k not in EnemyManager.transient}
+
+    def set_state(self, state):
+        """
+        Restore manager state from a snapshot
+        :param state: dictionary of attributes (see get_state)
+        :return: None
+        """
+        self.__dict__.update(state)
+        self.eventq = EnemyEvent.from_factory(self.level, self.iterations)
 
     def clear(self):
         """
         Clear all enemies and the boss
         :return: None
         """
-        self.enemies = []
+        self.parent.entities.clear('enemies')
         self.boss = None
 
+    @property
+    def enemies(self):
+        """
+        Get all the enemies (bucket of game objects registry, see entities module)
+        :return: list of enemies
+        """
+        return self.parent.entities['enemies']
+
+    def compact(self):
+        """
+        Remove invalid enemies (in place, keeping their order)
+        :return: None
+        """
+        self.parent.entities.compact('enemies')
+
     def __create_frontback(self):
         """
         Create enemies set with a front-back scheme
@@ -285,14 +353,14 @@ class EnemyManager:
         for i in range(8):
             odd = (i % 2) == 0
             a_x = 400 if odd else 0
-            enemy = Enemy(
+            self.parent.entities.spawn(
+                'enemies',
                 ARENA_WIDTH - 650 + a_x,
                 150 + i * 80 - (0 if odd else 60),
                 odd,
                 image,
                 speedx=-10,
                 speedy=2)
-            self.enemies.append(enemy)
 
     def __create_circle(self):
         """
@@ -305,7 +373,8 @@ class EnemyManager:
         spoty = int(100 + radius)
         for i in range(8):
             odd = (i % 2) == 0
-            enemy = Enemy(
+            self.parent.entities.spawn(
+                'enemies',
                 spotx,
                 spoty,
                 odd,
@@ -313,7 +382,6 @@ class EnemyManager:
                 angle=i * 45,
                 radius=radius,
                 speedx=-5)
-            self.enemies.append(enemy)
         self.move()
 
     def __create_square(self):
@@ -325,14 +393,14 @@ class EnemyManager:
         for i in range(8):
             odd = (i % 2) == 0
             a_x = 250 if odd else 0
-            enemy = Enemy(
+            self.parent.entities.spawn(
+                'enemies',
                 ARENA_WIDTH - 550 + a_x,
                 150 + i * 80,
                 odd,
                 image,
                 speedx=-8,
                 speedy=8)
-            self.enemies.append(enemy)
 
     def __create_updown(self):
         """
@@ -342,14 +410,14 @@ class EnemyManager:
         image = next(self.imagen)
         for i in range(8):
             odd = (i % 2) == 0
-            enemy = Enemy(
+            self.parent.entities.spawn(
+                'enemies',
                 int(ARENA_WIDTH * 0.45) + 130 * i,
                 int(ARENA_HEIGHT * 0.1) if odd else int(ARENA_HEIGHT * 0.6),
                 odd,
                 image,
                 speedx=-3,
                 speedy=13 if odd else -13)
-            self.enemies.append(enemy)
 
     def __create_sine(self):
         """
@@ -360,14 +428,14 @@ class EnemyManager:
         for i in range(8):
             odd = (i % 2) == 0
             dx = 250 if odd else 0
-            enemy = Enemy(
+            self.parent.entities.spawn(
+                'enemies',
                 int(ARENA_WIDTH * 0.9) - dx,
                 (i + 2) * 80,
                 odd,
                 image,
                 speedx=-5,
                 speedy=10)
-            self.enemies.append(enemy)
 
     def __create_wave(self):
         """
@@ -377,14 +445,14 @@ class EnemyManager:
         image = next(self.imagen)
         for i in range(8):
             odd = (i % 2) == 0
-            enemy = Enemy(
+            self.parent.entities.spawn(
+                'enemies',
                 int(0.8 * ARENA_WIDTH) if odd else int(0.9 * ARENA_WIDTH),
                 250 + 70 * i,
                 odd,
                 image,
                 speedx=-8,
                 speedy=15)
-            self.enemies.append(enemy)
 
     def __create_boss(self):
         """
@@ -392,8 +460,8 @@ class EnemyManager:
         :return: None
         """
         self.boss = Boss((2 * ARENA_WIDTH) // 3,
-                         random.randint(5, STAGE_HEIGHT - 100),
-                         self.shooter.images['boss'])
+                         self.rng.randint(5, STAGE_HEIGHT - 100),
+                         self.parent.images['boss'])
 
     def create_boss_missiles(self):
         """
@@ -402,13 +470,13 @@ class EnemyManager:
         """
         fixed_height = 32
         for etype in [MissileType.TO, MissileType.TO_SWW, MissileType.TO_NWW]:
-            image = self.shooter.images['missiles'][etype]
-            self.parent.missiles.append(
-                Missile(
-                    self.boss.x - image.width(),
-                    self.boss.y + fixed_height - image.height() // 2,
-                    etype,
-                    image))
+            meta = sprite_meta(self.parent.images['missiles'][etype])
+            self.parent.entities.spawn(
+                'missiles',
+                self.boss.x - meta.w,
+                self.boss.y + fixed_height - meta.cy,
+                meta.image,
+                etype)
 
     def __move_circle(self):
         """
@@ -426,7 +494,6 @@ class EnemyManager:
             enemy.spot_x += enemy.speedx
             if enemy.x + enemy.w < 0:
                 enemy.valid = False
-        self.enemies = [x for x in self.enemies if x.is_valid()]
 
     def __move_square(self):
         """
@@ -453,7 +520,6 @@ class EnemyManager:
             enemy.x -= 2
             if enemy.x + enemy.w < 0:
                 enemy.valid = False
-        self.enemies = [x for x in self.enemies if x.is_valid()]
 
     def __move_frontback(self):
         """
@@ -472,7 +538,6 @@ class EnemyManager:
             enemy.x -= 2
             if enemy.x + enemy.w < 0:
                 enemy.valid = False
-        self.enemies = [x for x in self.enemies if x.is_valid()]
 
     def __move_updown(self):
         """
@@ -488,7 +553,6 @@ class EnemyManager:
                 enemy.speedy = -enemy.speedy
             if enemy.x + enemy.w < 0:
                 enemy.valid = False
-        self.enemies = [x for x in self.enemies if x.is_valid()]
 
     def __move_sine(self):
         """
@@ -506,7 +570,6 @@ class EnemyManager:
             enemy.x += enemy.speedx
             if enemy.x + enemy.w < 0:
                 enemy.valid = False
-        self.enemies = [x for x in self.enemies if x.is_valid()]
 
     def __move_wave(self):
         """
@@ -528,7 +591,6 @@ class EnemyManager:
                     enemy.y += enemy.speedy
             if enemy.x + enemy.w < 0:
                 enemy.valid = False
-        self.enemies = [x for x in self.enemies if x.is_valid()]
 
     def populate(self, event):
         """
@@ -543,6 +605,7 @@ class EnemyManager:
     def move(self):
         """
         Move available enemies according to current scenario
+        (the ones that left the arena are invalidated, see compact)
         """
         if self.boss:
             self.boss.move()
@@ -556,25 +619,21 @@ class EnemyManager:
         :return: None
         """
         if len(self.enemies) == 0 and self.level < MAX_LEVEL:
-            if len(self.eventq) > 0:
+            if self.pending() > 0:
                 # There is still something to pick
                 event = self.pop()
                 self.populate(event)
             else:
                 return False
         elif len(self.enemies) == 0 and self.level == MAX_LEVEL:
-            if len(self.eventq) > 0:
+            if self.pending() > 0:
                 # There is still something to pick
                 event = self.pop()
                 self.populate(event)
             else:
                 if not self.boss:
-                    self.parent.missiles = []
-                    self.parent.lightballs = []
-                    self.parent.tnts = []
-                    self.parent.shield_timer = 0
-                    self.parent.lighball_timer = 0
-                    self.parent.frozen_timer = 0
+                    self.parent.entities.clear('missiles', 'lightballs', 'tnts')
+                    self.parent.stop_powerups()
                     self.__create_boss()
                 else:
                     if self.boss.is_alive():
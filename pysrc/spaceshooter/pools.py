@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+"""
+Free-list pools of short-lived game objects (enemies, a wave after wave):
+objects dropped from the game are reset and handed out again
+instead of being allocated anew
+"""
+
+from spaceshooter.sdefs import POOL_CAP
+from spaceshooter.sutils import compact
+
+
+class Pool:
+    """
+    Free list of objects of a single type
+    """
+    def __init__(self, cls, cap=POOL_CAP):
+        """
+        Create empty pool
+        :param cls: type of pooled objects (created with the same arguments
+            as its reset method takes)
+        :param cap: max number of free objects kept
+        """
+        self.cls = cls
+        self.cap = cap
+        self.free = []
+        self.created = 0  # Objects allocated, as the pool was empty
+        self.reused = 0  # Objects handed out again
+        self.dropped = 0  # Objects released to a full pool (left to the garbage collector)
+        self.in_use = 0  # Objects handed out and not released yet
+        self.high_water = 0  # Max number of objects in use at once
+
+    def acquire(self, *args, **kwargs):
+        """
+        Get an object, reused if possible
+        :param args: arguments of type constructor (and of its reset method)
+        :param kwargs: keyword arguments of type constructor
+        :return: object
+        """
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj):
+        """
+        Give an object back (it must not be used any more)
+        :param obj: object
+        :return: None
+        """
+        self.in_use -= 1
+        if len(self.free) < self.cap:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        """
+        Get pool statistics
+        :return: dictionary
+        """
+        return {'created': self.created, 'reused': self.reused, 'dropped': self.dropped,
+                'in_use': self.in_use, 'high_water': self.high_water, 'free': len(self.free)}
+
+
+class Pools:
+    """
+    Pools of all the pooled types
+    """
+    def __init__(self, types, cap=POOL_CAP):
+        """
+        Create empty pools
+        :param types: pooled types
+        :param cap: max number of free objects kept per type
+        """
+        self.pools = {cls: Pool(cls, cap) for cls in types}
+
+    def acquire(self, cls, *args, **kwargs):
+        """
+        Get an object of a type, reused if possible
+        :param cls: pooled type
+        :param args: arguments of type constructor
+        :param kwargs: keyword arguments of type constructor
+        :return: object
+        """
+        return self.pools[cls].acquire(*args, **kwargs)
+
+    def release(self, obj):
+        """
+        Give an object back to its pool
+        :param obj: pooled object
+        :return: None
+        """
+        self.pools[type(obj)].release(obj)
+
+    def release_all(self, objects):
+        """
+        Give objects back to their pools
+        :param objects: list of pooled objects
+        :return: None
+        """
+        for obj in objects:
+            self.pools[type(obj)].release(obj)
+
+    def compact(self, objects):
+        """
+        Remove invalid objects from a list in place, giving them back to their pools
+        :param objects: list of pooled objects
+        :return: number of objects removed
+        """
+        return compact(objects, self.release)
+
+    def recount(self, objects):
+        """
+        Count objects in use anew (objects restored from a snapshot
+        were never handed out by the pools)
+        :param objects: all the pooled objects in the game
+        :return: None
+        """
+        for pool in self.pools.values():
+            pool.in_use = 0
+        for obj in objects:
+            self.pools[type(obj)].in_use += 1
+
+    def stats(self):
+        """
+        Get statistics of all the pools
+        :return: type name -> statistics dictionary (see Pool.stats)
+        """
+        return {cls.__name__: pool.stats() for cls, pool in self.pools.items()}
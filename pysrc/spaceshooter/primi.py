@@ -4,17 +4,20 @@
 Primitive definitions
 """
 
-import math
-import random
+import sys
 from spaceshooter.sdefs import MOVABLE_SPEED, STAGE_HEIGHT, ARENA_WIDTH, ARENA_HEIGHT,\
-    SHIELD_SPEEDX, STAR_SPEED, STAGE_WIDTH, SPEEDX_BOMB
-from spaceshooter.stypes import MovableType, MissileType, FireballDirection
+    STAR_SPEED, STAGE_WIDTH
+from spaceshooter.stypes import MovableType
+from spaceshooter.sprites import sprite_meta
 
 
 class Rect:
     """
     Generic rectangle class
+    (game objects are slotted, so crowded screens stay compact)
     """
+    __slots__ = ('x', 'y', 'w', 'h')
+
     def __init__(self, x, y, w, h):
         """
         Create rectangle
@@ -97,6 +100,8 @@ class ImageRect(Rect):
     """
     Rectangle with associated image
     """
+    __slots__ = ('image',)
+
     def __init__(self, x, y, image):
         """
         Create object
@@ -105,9 +110,18 @@ class ImageRect(Rect):
         :param image: associated image
         """
         super().__init__(x, y, -1, -1)
+        self.set_image(image)
+
+    def set_image(self, image):
+        """
+        Associate an image (the size is taken from it)
+        :param image: associated image (None: size is left as it is)
+        :return: None
+        """
         self.image = image
         if image is not None:
-            self.set_size(image.width(), image.height())
+            meta = sprite_meta(image)
+            self.set_size(meta.w, meta.h)
 
     def paint(self, painter):
         """
@@ -123,6 +137,7 @@ class Movable(ImageRect):
     Object that moves together with terrain and stars
     (house, skyscraper, factory, gun, etc)
     """
+    __slots__ = ('etype', 'speed', 'valid')
 
     def __init__(self, x, image, etype: MovableType, speed=MOVABLE_SPEED):
         """
@@ -134,12 +149,10 @@ class Movable(ImageRect):
         """
         super().__init__(x, -1, image)
         self.etype = etype
-        self.image = image
         self.speed = speed
         self.valid = True
         if image is not None:
             # Movables are aligned to bottom pane
-            self.set_size(image.width(), image.height())
             self.y = STAGE_HEIGHT - self.h
 
     def move(self):
@@ -172,7 +185,7 @@ class Movable(ImageRect):
             x, i = 0, 0
             while x < 2 * width:
                 movable = Movable(x, imagelist[movs[i]], movs[i], MOVABLE_SPEED)
-                x += movable.image.width()  # One next to each other, as requested, no space left
+                x += movable.w  # One next to each other, as requested, no space left
                 i += 1
                 if i > len(movs) - 1:
                     i = 0
@@ -184,7 +197,15 @@ class FlyingObject(ImageRect):
     """
     Generic object than can fly around the arena
     """
+    __slots__ = ('valid',)
+
     def __init__(self, x, y, image):
+        """
+        Create flying object
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param image: associated image
+        """
         super().__init__(x, y, image)
         self.valid = True
 
@@ -236,31 +257,15 @@ class Player(FlyingObject):
     """
     Player object
     """
+    __slots__ = ()
     offset = 20  # Shield offset in every direction
 
-    def __init__(self, x, y, image):
-        """
-        Create Player instance
-        :param x: X coordinate of top-left corner
-        :param y: Y coordinate of top-left corner
-        :param image: Player image
-        """
-        super().__init__(x, y, image)
-        if image:
-            self.width = image.width()
-            self.height = image.height()
-        else:
-            self.width = -1
-            self.height = -1
-        self.__update_shieldrect()
-
     def go_left(self):
         """
         Move left
         :return:
         """
         self.x -= 20
-        self.__update_shieldrect()
 
     def go_right(self):
         """
@@ -268,7 +273,6 @@ class Player(FlyingObject):
         :return:
         """
         self.x += 20
-        self.__update_shieldrect()
 
     def go_up(self):
         """
@@ -276,7 +280,6 @@ class Player(FlyingObject):
         :return:
         """
         self.y -= 20
-        self.__update_shieldrect()
 
     def go_down(self):
         """
@@ -284,101 +287,117 @@ class Player(FlyingObject):
         :return:
         """
         self.y += 20
-        self.__update_shieldrect()
 
-    def __update_shieldrect(self):
+    @property
+    def shieldx(self):
         """
-        Update shield rectangle with every move
-        :return: None
+        Shield rectangle top left x coordinate
+        :return: x coordinate
         """
-        self.shieldx = self.x - Player.offset
-        self.shieldy = self.y - Player.offset
-        self.shieldw = self.width + 2 * Player.offset
-        self.shieldh = self.height + 2 * Player.offset
+        return self.x - Player.offset
 
-    def move(self):
+    @property
+    def shieldy(self):
         """
-        Move object according to its policy
-        :return:
+        Shield rectangle top left y coordinate
+        :return: y coordinate
+        """
+        return self.y - Player.offset
+
+    @property
+    def shieldw(self):
+        """
+        Shield rectangle width
+        :return: width
+        """
+        return self.w + 2 * Player.offset
+
+    @property
+    def shieldh(self):
+        """
+        Shield rectangle height
+        :return: height
         """
-        super().move()
-        self.__update_shieldrect()
+        return self.h + 2 * Player.offset
 
 
 class Enemy(FlyingObject):
     """
     Generic enemy class
     """
-    def __init__(self, x, y, odd, image, **kwargs):
+    __slots__ = ('spot_x', 'spot_y', 'moved', 'dx', 'dy', 'radius', 'angle', 'speedx',
+                 'speedy', 'odd')
+
+    def __init__(self, x, y, odd, image, *,  # pylint: disable=too-many-arguments
+                 radius=0, angle=0, speedx=0, speedy=0):
         """
         Create enemy object
         :param x: top left x coordinate
         :param y: top left y coordinate
         :param odd: True if odd, false if even
         :param image: associated image
-        :param kwargs: additional parameters: radius, angle, speedx, speedy
-        Remarks:
-        * radius to be specified when enemy moves around the circle
-        * angle to be specified when enemy moves around the circle
-        * speedx is the single horizontal distance
-        * speedy is the single vertical distance
+        :param radius: radius, when enemy moves around the circle
+        :param angle: angle, when enemy moves around the circle
+        :param speedx: single horizontal distance
+        :param speedy: single vertical distance
         """
         super().__init__(x, y, image)
+        self.__aim(x, y, odd, radius=radius, angle=angle, speedx=speedx, speedy=speedy)
+
+    def __aim(self, x, y, odd, *,  # pylint: disable=too-many-arguments
+              radius, angle, speedx, speedy):
+        """
+        Set up the motion of the enemy
+        :param x: top left x coordinate (the spot it moves around)
+        :param y: top left y coordinate (the spot it moves around)
+        :param odd: True if odd, false if even
+        :param radius: radius, when enemy moves around the circle
+        :param angle: angle, when enemy moves around the circle
+        :param speedx: single horizontal distance
+        :param speedy: single vertical distance
+        :return: None
+        """
         self.spot_x = x
         self.spot_y = y
         self.moved = 0
         self.dx = 1
         self.dy = 1
-        if 'radius' in kwargs:
-            self.radius = kwargs['radius']
-        else:
-            self.radius = 0
-        if 'angle' in kwargs:
-            self.angle = kwargs['angle']
-        else:
-            self.angle = 0
-        if 'speedx' in kwargs:
-            self.speedx = kwargs['speedx']
-        else:
-            self.speedx = 0
-        if 'speedy' in kwargs:
-            self.speedy = kwargs['speedy']
-        else:
-            self.speedy = 0
+        self.radius = radius
+        self.angle = angle
+        self.speedx = speedx
+        self.speedy = speedy
         self.odd = odd
 
-
-class Medkit(FlyingObject):
-    """
-    Medical kit flying object
-    """
-    def __init__(self, x, y, image):
+    def reset(self, x, y, odd, image, *,  # pylint: disable=too-many-arguments
+              radius=0, angle=0, speedx=0, speedy=0):
         """
-        Create MedKit object
-        :param x: X coordinate of top left corner
-        :param y: Y coordinate of top left corner
-        :param image: MedKit display image
-        """
-        super().__init__(x, y, image)
-        self.basey = y
-        self.speedx = -8
-
-    def move(self):
-        """
-        Move MedKit object according to sine policy
-        :return:
+        Reinitialize enemy given back to a pool and handed out again
+        (the same as creating a new one, see pools.Pool)
+        :param x: top left x coordinate
+        :param y: top left y coordinate
+        :param odd: True if odd, false if even
+        :param image: associated image
+        :param radius: radius, when enemy moves around the circle
+        :param angle: angle, when enemy moves around the circle
+        :param speedx: single horizontal distance
+        :param speedy: single vertical distance
+        :return: None
         """
-        dy = int(100 * math.sin(self.x / 100))
-        self.x += self.speedx
-        self.y = self.basey + dy
-        if self.x + self.w <= 0:
-            self.valid = False
+        self.x = x
+        self.y = y
+        self.w = -1
+        self.h = -1
+        self.set_image(image)
+        self.valid = True
+        self.__aim(x, y, odd, radius=radius, angle=angle, speedx=speedx, speedy=speedy)
 
 
 class Boss(FlyingObject):
     """
     Boss object
     """
+    __slots__ = ('dy', 'yspeed', 'indicators')
+
     def __init__(self, x, y, image):
         """
         Game Boss
@@ -422,146 +441,12 @@ class Boss(FlyingObject):
         self.y += self.dy * self.yspeed
 
 
-class Shield(FlyingObject):
-    """
-    Flying shield to pick and become immortal for 10s
-    """
-    def __init__(self, x, y, image):
-        """
-        Create flying shield object
-        :param x: X coordinate of top left corner
-        :param y: Y coordinate of top left corner
-        :param image: Shield image to display
-        """
-        super().__init__(x, y, image)
-        self.basey = y
-        self.speedx = SHIELD_SPEEDX
-
-    def move(self):
-        """
-        Move flying shield according to sine policy
-        :return: None
-        """
-        dy = int(100 * math.sin(self.x / 100))
-        self.x -= 8
-        self.y = self.basey + dy
-        if self.x + self.w <= 0:
-            self.valid = False
-
-
-class Missile(FlyingObject):
-    """
-    Generic missile object
-    """
-    def __init__(self, x, y, etype, image):
-        """
-        Create missile object
-        :param x: X coordinate of top left corner
-        :param y: Y coordinate of top left corner
-        :param etype: Missile type
-        :param image: Missile image to display
-        """
-        super().__init__(x, y, image)
-        self.etype = etype
-        self.speedx = 12
-        self.speedy = 12
-        self.speedhy = 6
-
-    def move(self):
-        """
-        Move missile according to its type
-        :return: None
-        """
-        if self.etype == MissileType.FROM:
-            self.x += self.speedx
-        elif self.etype == MissileType.TO:
-            self.x -= self.speedx
-        elif self.etype == MissileType.TO_NW:
-            self.x -= self.speedx
-            self.y -= self.speedy
-        elif self.etype == MissileType.TO_SW:
-            self.x -= self.speedx
-            self.y += self.speedy
-        elif self.etype == MissileType.FROM_NE:
-            self.x += self.speedx
-            self.y -= self.speedy
-        elif self.etype == MissileType.FROM_SE:
-            self.x += self.speedx
-            self.y += self.speedy
-        elif self.etype == MissileType.TO_NWW:
-            self.x -= self.speedx
-            self.y -= self.speedhy
-        elif self.etype == MissileType.TO_SWW:
-            self.x -= self.speedx
-            self.y += self.speedhy
-        if self.x > ARENA_WIDTH:
-            self.valid = False
-        elif self.x + self.w < 0:
-            self.valid = False
-        elif self.y > STAGE_HEIGHT:
-            self.valid = False
-        elif self.y + self.h < 0:
-            self.valid = False
-
-
-class Drop(FlyingObject):
-    """
-    Drop object
-    """
-    def __init__(self, x, y, image):
-        """
-        Create drop object
-        :param x: X coordinate of top-left corner
-        :param y: Y coordinate of top-left corner
-        :param image: Drop image
-        """
-        super().__init__(x, y, image)
-        self.speedx = -8
-        self.speedy = 8
-
-    def move(self):
-        """
-        Move drop object according to its diagonal policy
-        :return: None
-        """
-        self.x += self.speedx
-        self.y += self.speedy
-        if self.x + self.w <= 0:
-            self.valid = False
-        if self.y >= ARENA_HEIGHT:
-            self.valid = False
-
-
-class Tnt(FlyingObject):
-    """
-    TNT object
-    """
-    def __init__(self, x, y, image):
-        """
-        Create TNT object
-        :param x: X coordinate of top-left corner
-        :param y: Y coordinate of top-left corner
-        :param image: TNT image
-        """
-        super().__init__(x, y, image)
-        self.basey = y
-
-    def move(self):
-        """
-        Move TNT object according to its sine policy
-        :return: None
-        """
-        dy = int(100 * math.sin(self.x / 100))
-        self.x += -8
-        self.y = self.basey + dy
-        if self.x + self.w <= 0:
-            self.valid = False
-
-
 class Meteorite(FlyingObject):
     """
     Meteorite object
     """
+    __slots__ = ('speedx', 'speedy')
+
     def __init__(self, x, y, image):
         """
         Create meteorite object
@@ -580,180 +465,24 @@ class Meteorite(FlyingObject):
         """
         self.x += self.speedx
         self.y += self.speedy
-        if self.x + self.w <= 0:
-            self.valid = False
-        if self.y >= ARENA_HEIGHT:
-            self.valid = False
 
-
-class LightBall(FlyingObject):
-    """
-    Flying ligthball object
-    """
-    def __init__(self, x, y, image):
-        """
-        Create lightball object
-        :param x: X coordinate of top-left corner
-        :param y: Y coordinate of top-left corner
-        :param image: lightball image
+    def cull(self):
         """
-        super().__init__(x, y, image)
-        self.basey = y
-
-    def move(self):
-        """
-        Move lighball object according to its sine policy
+        Invalidate meteorite object if gone off the screen
         :return: None
         """
-        dx = -8
-        dy = int(100 * math.sin(self.x / 100))
-        self.x += dx
-        self.y = self.basey + dy
         if self.x + self.w <= 0:
             self.valid = False
-
-
-class FireMissile(FlyingObject):
-    """
-    Whenever a LightBall is caught, player can shoot with
-    FireMissile
-    """
-    def __init__(self, x, y, direction: FireballDirection, image):
-        """
-        Create FireMissile object
-        :param x: X coordinate of top-left corner
-        :param y: Y coordinate of top-left corner
-        :param direction: fireball direction (FireballDirection)
-        :param image: Fire missile image
-        """
-        super().__init__(x, y, image)
-        self.direction = direction
-        if self.direction == FireballDirection.UP:
-            self.speedx = 30
-            self.speedy = -15
-        elif self.direction == FireballDirection.STRAIGHT:
-            self.speedx = 30
-            self.speedy = 0
-        elif self.direction == FireballDirection.DOWN:
-            self.speedx = 30
-            self.speedy = 15
-
-    def move(self):
-        """
-        Move firemissile according to its straight/diagonal policy
-        :return: None
-        """
-        self.x += self.speedx
-        self.y += self.speedy
-        if self.x > ARENA_WIDTH:
-            self.valid = False
-        elif self.y > ARENA_HEIGHT:
-            self.valid = False
-        elif self.y < 0:
-            self.valid = False
-
-
-class Explosion(FlyingObject):
-    """
-    Explosion object
-    """
-    def __init__(self, x, y, images: list):
-        """
-        Create explosion object
-        :param x: X coordinate of the middle
-        :param y: Y coordinage of the middle
-        :param images: Explosion images
-        """
-        super().__init__(x, y, None)
-        self.images = images
-        self.frame = 0
-        self.frames = len(self.images)
-
-    def paint(self, painter):
-        """
-        Paint explosion (draw current frame)
-        :param painter: Painter to paint by
-        :return: None
-        """
-        if self.valid:
-            image = self.images[self.frame]
-            a_x = self.x - image.width() // 2
-            a_y = self.y - image.height() // 2
-            painter.drawPixmap(a_x, a_y, image)
-
-    def move(self):
-        """
-        Process next frame
-        :return: None
-        """
-        if self.frame < self.frames - 1:
-            self.frame += 1
-        else:
-            self.valid = False
-
-
-class IceBox(FlyingObject):
-    """
-    When caught by the player, enters frozen mode:
-    All the enemies stop and do not shoot and all the missiles disappear.
-    After 20 seconds everything goes back to normal.
-    """
-    def __init__(self, x, y, image):
-        """
-        Create IceBox object
-        :param x: X coordinate of top-left corner
-        :param y: Y coordinate of top-left corner
-        :param image: IceBox image
-        """
-        super().__init__(x, y, image)
-        self.basey = y
-
-    def move(self):
-        """
-        Move IceBox according to its sine policy
-        :return: None
-        """
-        dx = -8
-        dy = int(100 * math.sin(self.x / 100))
-        self.x += dx
-        self.y = self.basey + dy
-        if self.x + self.w <= 0:
-            self.valid = False
-
-
-class Bomb(FlyingObject):
-    """
-    Bomb object
-    """
-    def __init__(self, x, y, image, speedy=3):
-        """
-        Create bomb object
-        :param x: X coordinate of top-left corner
-        :param y: Y coordinate of top-left corner
-        :param image: Bomb image
-        :param speedy: Custom Y-speed
-        """
-        super().__init__(x, y, image)
-        self.speedx = SPEEDX_BOMB
-        self.speedy = speedy
-
-    def move(self):
-        """
-        Move object (vertical policy)
-        :return:None
-        """
-        self.x += self.speedx
-        self.y += self.speedy
         if self.y >= ARENA_HEIGHT:
             self.valid = False
-        if self.x <= 0:
-            self.valid = False
 
 
 class Star(ImageRect):
     """
     Star object
     """
+    __slots__ = ('speed',)
+
     def __init__(self, x, y, image, speed=2):
         """
         Create star object
@@ -763,7 +492,6 @@ class Star(ImageRect):
         :param speed: Custom X-speed
         """
         super().__init__(x, y, image)
-        self.y = y
         self.speed = speed
 
     def move(self):
@@ -776,11 +504,12 @@ class Star(ImageRect):
             self.x = STAGE_WIDTH
 
     @staticmethod
-    def from_factory(matrix: list, image):
+    def from_factory(matrix: list, image, rng):
         """
         Create stars in advance
         :param matrix: Stars matrix (list of lists)
         :param image: Star image
+        :param rng: random.Random object to place stars with
         :return: None
         """
         stars = []
@@ -792,9 +521,34 @@ class Star(ImageRect):
             for j in range(columns):
                 if matrix[i][j] == 1:
                     star = Star(
-                        j * segment_width + random.randint(0, segment_width),
+                        j * segment_width + rng.randint(0, segment_width),
                         i * segment_height + segment_height // 2,
                         image,
                         STAR_SPEED)
                     stars.append(star)
         return stars
+
+
+def object_size(obj):
+    """
+    Get memory taken by a single object itself (attribute values are not counted)
+    :param obj: any object
+    :return: size in bytes
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def memory_report(objects):
+    """
+    Get memory taken by objects per type
+    :param objects: iterable of objects
+    :return: type name -> (count, size in bytes) dictionary
+    """
+    report = {}
+    for obj in objects:
+        count, size = report.get(type(obj).__name__, (0, 0))
+        report[type(obj).__name__] = (count + 1, size + object_size(obj))
+    return report
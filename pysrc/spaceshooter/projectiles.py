@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+"""
+Projectiles (missiles, fire missiles, bombs and drops) kept as component tables:
+a list per attribute, moved, culled and compacted column by column
+"""
+
+from collections import namedtuple
+from operator import add
+from spaceshooter.sdefs import ARENA_WIDTH, ARENA_HEIGHT, STAGE_HEIGHT, SPEEDX_BOMB
+from spaceshooter.stypes import MissileType, FireballDirection
+from spaceshooter.components import BoxView, Boxes
+
+# Missile type -> (speedx, speedy):
+MISSILE_SPEEDS = {
+    MissileType.FROM: (12, 0),
+    MissileType.TO: (-12, 0),
+    MissileType.TO_NW: (-12, -12),
+    MissileType.TO_SW: (-12, 12),
+    MissileType.FROM_NE: (12, -12),
+    MissileType.FROM_SE: (12, 12),
+    MissileType.TO_NWW: (-12, -6),
+    MissileType.TO_SWW: (-12, 6)
+}
+
+# Fireball direction -> (speedx, speedy):
+FIREBALL_SPEEDS = {
+    FireballDirection.UP: (30, -15),
+    FireballDirection.STRAIGHT: (30, 0),
+    FireballDirection.DOWN: (30, 15)
+}
+
+
+class Projectile(BoxView, namedtuple('Projectile', ('x', 'y', 'w', 'h', 'speedx', 'speedy',
+                                                    'etype', 'valid', 'image'))):
+    """
+    Read-only view of a single projectile (see Projectiles),
+    with the same attributes as the other game objects
+    """
+    __slots__ = ()
+
+
+class Projectiles(Boxes):
+    """
+    Projectiles of a single kind as a component table.
+    All of them are moved and culled with a few column operations,
+    dead ones are removed in bulk by compact().
+    """
+    columns = Projectile._fields
+    view = Projectile
+    speeds = {None: (0, 0)}  # Projectile type -> (speedx, speedy)
+
+    def __init__(self):
+        """
+        Create empty store
+        """
+        super().__init__()
+        self.speedx = []
+        self.speedy = []
+        self.etype = []
+
+    def add(self, x, y, image, etype=None):
+        """
+        Add a new projectile
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param image: projectile image
+        :param etype: projectile type (key of speeds)
+        :return: None
+        """
+        speedx, speedy = self.speeds[etype]
+        self.place(x, y, image)
+        self.speedx.append(speedx)
+        self.speedy.append(speedy)
+        self.etype.append(etype)
+
+    def move(self):
+        """
+        Move all the projectiles (the ones that left the arena are left to be culled,
+        see keep)
+        :return: None
+        """
+        if not self.x:
+            return
+        self.x = list(map(add, self.x, self.speedx))
+        self.y = list(map(add, self.y, self.speedy))
+
+
+class Missiles(Projectiles):
+    """
+    Missiles of the player, the enemies, the guns and the boss
+    """
+    speeds = MISSILE_SPEEDS
+
+    @staticmethod
+    def keep(valid, x, y, w, h):
+        """
+        Check if a moved missile is still within the stage
+        :param valid: current validity
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param w: width
+        :param h: height
+        :return: True if so
+        """
+        return valid and x <= ARENA_WIDTH and x + w >= 0 and y <= STAGE_HEIGHT and y + h >= 0
+
+
+class FireMissiles(Projectiles):
+    """
+    Fireballs shot whenever a LightBall is caught (type: FireballDirection)
+    """
+    speeds = FIREBALL_SPEEDS
+
+    @staticmethod
+    def keep(valid, x, y, w, h):
+        """
+        Check if a moved fireball is still within the arena
+        :param valid: current validity
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param w: width
+        :param h: height
+        :return: True if so
+        """
+        return valid and x <= ARENA_WIDTH and 0 <= y <= ARENA_HEIGHT
+
+
+class Bombs(Projectiles):
+    """
+    Bombs, falling and drifting with the ground
+    """
+    speeds = {None: (SPEEDX_BOMB, 3)}
+
+    @staticmethod
+    def keep(valid, x, y, w, h):
+        """
+        Check if a moved bomb is still within the arena
+        :param valid: current validity
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param w: width
+        :param h: height
+        :return: True if so
+        """
+        return valid and y < ARENA_HEIGHT and x > 0
+
+
+class Drops(Projectiles):
+    """
+    Drops, falling diagonally
+    """
+    speeds = {None: (-8, 8)}
+
+    @staticmethod
+    def keep(valid, x, y, w, h):
+        """
+        Check if a moved drop is still within the arena
+        :param valid: current validity
+        :param x: X coordinate of top-left corner
+        :param y: Y coordinate of top-left corner
+        :param w: width
+        :param h: height
+        :return: True if so
+        """
+        return valid and x + w > 0 and y < ARENA_HEIGHT
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+"""
+Software renderer of the play field into small NumPy frames
+(observations and thumbnails of headless games, no Qt involved;
+NumPy is only needed by this module)
+"""
+
+import os
+import numpy as np
+from spaceshooter.sprites import sprite_files, read_png, IMAGES_PATH
+from spaceshooter.snapshot import image_refs
+from spaceshooter.sdefs import ARENA_WIDTH, ARENA_HEIGHT
+from spaceshooter.entities import STORES
+
+BACKGROUND = (0x09, 0x27, 0x5b)  # The same as Arena background
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Images used on the play field (keys of the images structure):
+PLAY_FIELD = ('star', 'players', 'movables', 'enemies', 'explosions', 'missiles',
+              'boss', 'indicators')
+
+# Play field layers, bottom to top (the same order as Arena paints them):
+LAYERS = ('stars', 'drops', 'movables', 'iceboxes', 'bombs', 'medkits', 'lightballs',
+          'tnts', 'shields', 'meteorites', 'player', 'enemies', 'missiles',
+          'firemissiles', 'explosions')
+
+
+def layer_objects(state, layer):
+    """
+    Get objects of a single layer with their images and top-left corners
+    :param state: GameState object
+    :param layer: one of LAYERS
+    :return: generator of (image, x, y) tuples
+    """
+    if layer == 'player':
+        if state.player:
+            yield state.player.image, state.player.x, state.player.y
+    elif layer == 'enemies':
+        for obj in state.enemymanager.enemies:
+            yield obj.image, obj.x, obj.y
+        if state.enemymanager.boss:
+            yield state.enemymanager.boss.image, state.enemymanager.boss.x, \
+                state.enemymanager.boss.y
+    elif layer == 'stars':
+        for obj in state.stars:
+            yield obj.image, obj.x, obj.y
+    elif layer in STORES:
+        yield from state.entities[layer].sprites()
+    else:
+        for obj in state.entities[layer]:
+            yield obj.image, obj.x, obj.y
+
+
+def downsample(filename, scale_x, scale_y):
+    """
+    Decode a sprite and downsample it (box filter), keeping visible pixels only
+    :param filename: PNG file
+    :param scale_x: horizontal scale
+    :param scale_y: vertical scale
+    :return: (rows, columns, premultiplied colors, alpha) arrays of visible pixels
+    """
+    width, height, pixels = read_png(filename)
+    rgba = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)
+    rgba = rgba.astype(np.float32) / 255
+    rgba[:, :, :3] *= rgba[:, :, 3:]
+    tw = max(1, round(width * scale_x))
+    th = max(1, round(height * scale_y))
+    rows = (np.arange(th) * height) // th
+    cols = (np.arange(tw) * width) // tw
+    summed = np.add.reduceat(np.add.reduceat(rgba, rows, axis=0), cols, axis=1)
+    summed /= (np.diff(np.append(rows, height))[:, None] *
+               np.diff(np.append(cols, width))[None, :])[:, :, None]
+    visible = summed[:, :, 3] > 0
+    rows, cols = np.nonzero(visible)
+    return rows, cols, summed[visible][:, :3] * 255, summed[visible][:, 3]
+
+
+class SpriteAtlas:
+    """
+    Visible pixels of all the play field sprites at a single scale,
+    stacked in flat arrays (sprite i owns pixels start[i]:start[i] + count[i])
+    """
+    cache = {}  # (width, height) -> SpriteAtlas, shared by all the renderers
+
+    def __init__(self, scale_x, scale_y):
+        """
+        Decode and downsample all the play field sprites
+        :param scale_x: horizontal scale
+        :param scale_y: vertical scale
+        """
+        _, files = image_refs({key: sprite_files[key] for key in PLAY_FIELD})
+        self.names = sorted({x for x in files.values() if isinstance(x, str)})
+        sprites = [downsample(os.path.join(IMAGES_PATH, x), scale_x, scale_y)
+                   for x in self.names]
+        self.count = np.array([len(x[0]) for x in sprites], dtype=np.intp)
+        self.start = np.cumsum(self.count) - self.count
+        self.rows = np.concatenate([x[0] for x in sprites])
+        self.cols = np.concatenate([x[1] for x in sprites])
+        self.rgb = np.concatenate([x[2] for x in sprites]).astype(np.float32)
+        self.luma = self.rgb @ LUMA[:, None]
+        self.transparency = 1 - np.concatenate([x[3] for x in sprites]).astype(np.float32)
+
+    @staticmethod
+    def get(width, height):
+        """
+        Get (or build) atlas for a frame size
+        :param width: frame width
+        :param height: frame height
+        :return: SpriteAtlas object
+        """
+        if (width, height) not in SpriteAtlas.cache:
+            SpriteAtlas.cache[(width, height)] = SpriteAtlas(width / ARENA_WIDTH,
+                                                             height / ARENA_HEIGHT)
+        return SpriteAtlas.cache[(width, height)]
+
+    def pixels(self, sprites):
+        """
+        Get atlas pixels of a number of sprites, stacked one after another
+        :param sprites: array of sprite numbers
+        :return: (atlas pixel, sprite index, end of pixels of every sprite) arrays
+        """
+        counts = self.count[sprites]
+        ends = np.cumsum(counts)
+        owner = np.repeat(np.arange(len(sprites)), counts)
+        pixel = np.arange(ends[-1]) - (ends - counts)[owner] + self.start[sprites][owner]
+        return pixel, owner, ends
+
+
+class FrameRenderer:
+    """
+    Composites the play field into a uint8 array at low resolution.
+    Pixels of all the objects are placed with a few array operations
+    per frame, then blended layer by layer.
+    """
+    def __init__(self, images, width=160, height=90, grayscale=False):
+        """
+        Create renderer
+        :param images: images structure the game uses (Sprite or QPixmap objects)
+        :param width: frame width
+        :param height: frame height
+        :param grayscale: True for (height x width) frames, False for RGB ones
+        """
+        self.width = width
+        self.height = height
+        self.grayscale = grayscale
+        self.atlas = SpriteAtlas.get(width, height)
+        ids, _ = image_refs(images)
+        _, files = image_refs(sprite_files)
+        numbers = {name: i for i, name in enumerate(self.atlas.names)}
+        # Image object id -> atlas sprite number:
+        self.sprites = {key: numbers[files[path]] for key, path in ids.items()
+                        if isinstance(files[path], str) and files[path] in numbers}
+        # Grayscale frames are blended in a single channel:
+        if grayscale:
+            self.colors = self.atlas.luma
+            self.background = np.array(BACKGROUND, dtype=np.float32) @ LUMA
+        else:
+            self.colors = self.atlas.rgb
+            self.background = BACKGROUND
+        # Canvas as a flat list of pixels, the extra one collects clipped pixels:
+        self.canvas = np.empty((height * width + 1, self.colors.shape[1]), dtype=np.float32)
+
+    def render(self, state, out=None):
+        """
+        Render the play field of a game
+        :param state: GameState object
+        :param out: uint8 array to render into (None: a new one)
+        :return: uint8 array, (height x width) or (height x width x 3)
+        """
+        sprites, xs, ys, bounds = self.__collect(state)
+        self.canvas[:] = self.background
+        if sprites:
+            pixel, ends, flat = self.__place(np.array(sprites, dtype=np.intp), xs, ys)
+            self.__blend(bounds, ends, flat, pixel)
+        return self.frame(out)
+
+    def __collect(self, state):
+        """
+        Collect objects of all the layers, bottom to top
+        :param state: GameState object
+        :return: (sprite numbers, x positions, y positions, end of every layer) lists
+        """
+        sprites = []
+        xs = []
+        ys = []
+        bounds = []
+        for layer in LAYERS:
+            for image, x, y in layer_objects(state, layer):
+                sprites.append(self.sprites[id(image)])
+                xs.append(x)
+                ys.append(y)
+            bounds.append(len(sprites))
+        return sprites, xs, ys, bounds
+
+    def __place(self, sprites, xs, ys):
+        """
+        Place pixels of all the objects on the canvas
+        :param sprites: array of sprite numbers
+        :param xs: x positions of the objects
+        :param ys: y positions of the objects
+        :return: (atlas pixel, end of pixels of every object, canvas pixel) arrays,
+            clipped pixels go to the extra canvas pixel
+        """
+        pixel, owner, ends = self.atlas.pixels(sprites)
+        x0 = np.floor(np.array(xs, dtype=np.float32) * (self.width / ARENA_WIDTH))
+        y0 = np.floor(np.array(ys, dtype=np.float32) * (self.height / ARENA_HEIGHT))
+        rows = y0.astype(np.intp)[owner] + self.atlas.rows[pixel]
+        cols = x0.astype(np.intp)[owner] + self.atlas.cols[pixel]
+        inside = (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width)
+        return pixel, ends, np.where(inside, rows * self.width + cols, self.height * self.width)
+
+    def __blend(self, bounds, ends, flat, pixel):
+        """
+        Blend placed pixels into the canvas, layer by layer
+        (objects of a single layer hardly ever overlap, so they are blended together)
+        :param bounds: end of every layer (number of objects)
+        :param ends: end of pixels of every object
+        :param flat: canvas pixel of every object pixel
+        :param pixel: atlas pixel of every object pixel
+        :return: None
+        """
+        transparency = self.atlas.transparency[pixel]
+        colors = self.colors[pixel]
+        first = 0
+        for bound in bounds:
+            if bound > first:
+                lo = ends[first - 1] if first > 0 else 0
+                hi = ends[bound - 1]
+                index = flat[lo:hi]
+                self.canvas[index] = self.canvas.take(index, axis=0) * \
+                    transparency[lo:hi, None] + colors[lo:hi]
+            first = bound
+
+    def frame(self, out=None):
+        """
+        Get the last rendered canvas as a frame
+        :param out: uint8 array to copy into (None: a new one)
+        :return: uint8 array, (height x width) or (height x width x 3)
+        """
+        if self.grayscale:
+            frame = self.canvas[:-1, 0].reshape(self.height, self.width)
+        else:
+            frame = self.canvas[:-1].reshape(self.height, self.width, 3)
+        if out is None:
+            return frame.astype(np.uint8)
+        np.copyto(out, frame, casting='unsafe')
+        return out
@@ -0,0 +1,552 @@
+#!/usr/bin/env python
+
+"""
+Input replays: compact binary recorder and headless player
+"""
+
+import sys
+import json
+import bisect
+import lzma
+import zlib
+import queue
+import struct
+import threading
+from spaceshooter.stypes import Key, Board, MouseButton, MouseEvent
+from spaceshooter.sconfig import ShooterConfig
+from spaceshooter.slocales import locales
+from spaceshooter.sprites import load_sprites
+from spaceshooter.game import Game
+
+REPLAY_MAGIC = b"SSRP"
+REPLAY_VERSION = 10
+
+# Compression methods (stored in file preamble):
+COMPRESSIONS = {
+    'none': 0,
+    'zlib': 1,
+    'lzma': 2
+}
+
+# Record kinds (low 3 bits of the first record varint):
+KEY_PRESSED = 0
+KEY_RELEASED = 1
+MOUSE_PRESSED = 2
+CHECK = 3  # Simulation state hash
+END = 4  # Final points, level and lives
+KIND_BITS = 3
+# Keyframes are not records, they start a new chunk instead:
+KEYFRAME = -1
+
+MOUSE_POSITION = struct.Struct("<dd")
+STATE_HASH = struct.Struct("<I")
+FOOTER = struct.Struct("<Q")  # File offset of chunk index
+
+
+def encode_varint(value, out):
+    """
+    Append unsigned LEB128 varint to a buffer
+    :param value: non-negative integer
+    :param out: bytearray to append to
+    :return: None
+    """
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_signed(value, out):
+    """
+    Append signed (zigzag encoded) varint to a buffer
+    :param value: integer
+    :param out: bytearray to append to
+    :return: None
+    """
+    encode_varint(value * 2 if value >= 0 else -value * 2 - 1, out)
+
+
+def decode_signed(data, pos):
+    """
+    Read signed (zigzag encoded) varint from a buffer
+    :param data: bytes to read from
+    :param pos: position to start at
+    :return: (value, next position) tuple
+    """
+    value, pos = decode_varint(data, pos)
+    return (value >> 1) if value & 1 == 0 else -(value >> 1) - 1, pos
+
+
+def decode_varint(data, pos):
+    """
+    Read unsigned LEB128 varint from a buffer
+    :param data: bytes to read from
+    :param pos: position to start at
+    :return: (value, next position) tuple
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class RecordedMetrics:
+    """
+    Font metrics recorded for a set of labels,
+    of the same interface as QFontMetrics (as far as Game needs it)
+    """
+    def __init__(self, height, advances):
+        """
+        Create recorded metrics
+        :param height: font height
+        :param advances: label -> horizontal advance dictionary
+        """
+        self.h = height
+        self.advances = advances
+
+    def height(self):
+        """
+        Get font height
+        :return: font height
+        """
+        return self.h
+
+    def horizontalAdvance(self, label):  # pylint: disable=invalid-name
+        """
+        Get label width
+        :param label: recorded label
+        :return: label width
+        """
+        return self.advances[label]
+
+
+class HeadlessShooter:  # pylint: disable=too-few-public-methods
+    """
+    Shooter stand-in for a Game with no Qt application
+    (only the part of Shooter interface used by Game)
+    """
+    def __init__(self):
+        """
+        Create headless shooter with sprite metadata as images
+        """
+        self.images = load_sprites()
+
+    def set_frame_timeout(self, timeout):
+        """
+        Unused handler (no frame timer)
+        :param timeout: unused
+        :return: None
+        """
+
+
+class HeadlessArena:
+    """
+    Arena stand-in for a Game with no window: nothing is painted
+    """
+    def __init__(self, metrics):
+        """
+        Create headless arena
+        :param metrics: dictionary of RecordedMetrics
+        """
+        self.metrics = metrics
+        self.parent = self
+        self.closed = False
+
+    def paint(self):
+        """
+        Unused handler (nothing to paint)
+        :return: None
+        """
+
+    def close(self):
+        """
+        Mark window as closed
+        :return: None
+        """
+        self.closed = True
+
+
+def record_metrics(metrics):
+    """
+    Record menu and options font metrics for all the languages
+    :param metrics: arena metrics dictionary
+    :return: JSON-friendly dictionary
+    """
+    recorded = {}
+    languages = [lang for lang in locales['menu'] if lang != 'title']
+    for name in ['menu', 'options']:
+        f_m = metrics[name]
+        labels = [label for lang in languages for label in locales[name][lang]]
+        recorded[name] = {
+            'height': f_m.height(),
+            'advances': {label: f_m.horizontalAdvance(label) for label in labels}
+        }
+    return recorded
+
+
+def game_header(game):
+    """
+    Build replay header for a game about to be recorded
+    :param game: Game object (with arena already set)
+    :return: JSON-friendly dictionary
+    """
+    return {
+        'seed': game.state.session.seed,
+        'config': game.config.dumps(),
+        'metrics': record_metrics(game.arena.metrics)
+    }
+
+
+class Recorder:
+    """
+    Input recorder: every input event is tagged with its master clock tick
+    and stored as varint/delta-encoded records.
+    Records are grouped in independently compressed chunks, every chunk
+    starting with a keyframe (snapshot of the whole game), and an index
+    of chunks is written at the end, so replays can be seeked.
+    Simulation state hashes and final results are recorded as well,
+    so replays can be verified (see verify module).
+    Encoding, compression and writing is done by a background thread.
+    """
+    def __init__(self, filename, header, compression='zlib', keyframe_every=0, check_every=0):
+        """
+        Create recorder and start its writer thread
+        :param filename: file to record to
+        :param header: replay header (see game_header)
+        :param compression: one of COMPRESSIONS keys
+        :param keyframe_every: number of ticks between keyframes (0: no keyframes)
+        :param check_every: number of ticks between state hash checks (0: no checks)
+        """
+        self.queue = queue.Queue()
+        self.compression = COMPRESSIONS[compression]
+        self.keyframe_every = keyframe_every
+        self.check_every = check_every
+        self.index = []
+        self.chunk = bytearray()
+        self.chunk_tick = 0
+        self.last_tick = 0
+        self.fh = open(filename, "wb")  # pylint: disable=consider-using-with
+        self.fh.write(REPLAY_MAGIC + bytes([REPLAY_VERSION, self.compression]))
+        self.__write_chunk(json.dumps(header).encode("UTF-8"))
+        self.__start_chunk(0, b"")
+        self.thread = threading.Thread(target=self.__writer, daemon=True)
+        self.thread.start()
+
+    def __write_chunk(self, data):
+        """
+        Compress (if needed) and write a single chunk
+        :param data: chunk bytes
+        :return: file offset of the chunk
+        """
+        offset = self.fh.tell()
+        if self.compression == COMPRESSIONS['zlib']:
+            data = zlib.compress(data, 9)
+        elif self.compression == COMPRESSIONS['lzma']:
+            data = lzma.compress(data)
+        size = bytearray()
+        encode_varint(len(data), size)
+        self.fh.write(bytes(size) + data)
+        return offset
+
+    def __start_chunk(self, tick, snapshot):
+        """
+        Write pending chunk (if any) and start a new one
+        :param tick: master clock tick of the keyframe
+        :param snapshot: keyframe snapshot bytes (empty: none)
+        :return: None
+        """
+        if self.chunk:
+            self.index.append((self.chunk_tick, self.__write_chunk(bytes(self.chunk))))
+        self.chunk = bytearray()
+        self.chunk_tick = tick
+        self.last_tick = tick
+        encode_varint(tick, self.chunk)
+        encode_varint(len(snapshot), self.chunk)
+        self.chunk += snapshot
+
+    def __writer(self):
+        """
+        Writer thread: encode queued records until None comes,
+        then write the last chunk, the index and the footer
+        :return: None
+        """
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            kind, tick, args = item
+            if kind == KEYFRAME:
+                self.__start_chunk(tick, args)
+                continue
+            encode_varint(((tick - self.last_tick) << KIND_BITS) | kind, self.chunk)
+            self.last_tick = tick
+            if kind in (KEY_PRESSED, KEY_RELEASED):
+                encode_varint(0 if args is None else int(args) + 1, self.chunk)
+            elif kind == MOUSE_PRESSED:
+                self.chunk += MOUSE_POSITION.pack(args.x, args.y)
+                encode_varint(int(args.button), self.chunk)
+            elif kind == CHECK:
+                self.chunk += STATE_HASH.pack(args)
+            elif kind == END:
+                for value in args:
+                    encode_signed(value, self.chunk)
+        self.index.append((self.chunk_tick, self.__write_chunk(bytes(self.chunk))))
+        offset = self.fh.tell()
+        data = bytearray()
+        encode_varint(len(self.index), data)
+        for tick, chunk_offset in self.index:
+            encode_varint(tick, data)
+            encode_varint(chunk_offset, data)
+        self.fh.write(bytes(data) + FOOTER.pack(offset))
+        self.fh.close()
+
+    def key_pressed(self, tick, key):
+        """
+        Record key press
+        :param tick: master clock tick
+        :param key: Key (or None)
+        :return: None
+        """
+        self.queue.put((KEY_PRESSED, tick, key))
+
+    def key_released(self, tick, key):
+        """
+        Record key release
+        :param tick: master clock tick
+        :param key: Key (or None)
+        :return: None
+        """
+        self.queue.put((KEY_RELEASED, tick, key))
+
+    def mouse_pressed(self, tick, event):
+        """
+        Record mouse button press
+        :param tick: master clock tick
+        :param event: MouseEvent
+        :return: None
+        """
+        self.queue.put((MOUSE_PRESSED, tick, event))
+
+    def keyframe(self, tick, snapshot):
+        """
+        Record a keyframe (starts a new chunk)
+        :param tick: master clock tick
+        :param snapshot: snapshot bytes (see Game.snapshot)
+        :return: None
+        """
+        self.queue.put((KEYFRAME, tick, snapshot))
+
+    def check(self, tick, digest):
+        """
+        Record simulation state hash
+        :param tick: master clock tick
+        :param digest: state hash (see simulation.GameState.digest)
+        :return: None
+        """
+        self.queue.put((CHECK, tick, digest))
+
+    def close(self, tick, results=(0, 0, 0)):
+        """
+        Record the end of the session, then wait for the writer to finish
+        :param tick: final master clock tick
+        :param results: final (points, level, lives) tuple
+        :return: None
+        """
+        self.queue.put((END, tick, results))
+        self.queue.put(None)
+        self.thread.join()
+
+
+class ReplayReader:
+    """
+    Replay file reader: header, chunk index and chunk decoding
+    """
+    def __init__(self, filename):
+        """
+        Read replay file
+        :param filename: file to read
+        """
+        with open(filename, "rb") as fh:
+            self.data = fh.read()
+        if self.data[:4] != REPLAY_MAGIC or self.data[4] != REPLAY_VERSION:
+            raise ValueError(f"Not a replay file: {filename}")
+        self.compression = self.data[5]
+        content, pos = self.__read_chunk(6)
+        self.header = json.loads(content.decode("UTF-8"))
+        self.first = pos
+        offset, = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+        count, pos = decode_varint(self.data, offset)
+        self.index = []
+        for _ in range(count):
+            tick, pos = decode_varint(self.data, pos)
+            chunk_offset, pos = decode_varint(self.data, pos)
+            self.index.append((tick, chunk_offset))
+
+    def __read_chunk(self, offset):
+        """
+        Read and decompress a single chunk
+        :param offset: file offset of the chunk
+        :return: (chunk bytes, offset of the next chunk) tuple
+        """
+        size, pos = decode_varint(self.data, offset)
+        data = self.data[pos:pos + size]
+        if self.compression == COMPRESSIONS['zlib']:
+            data = zlib.decompress(data)
+        elif self.compression == COMPRESSIONS['lzma']:
+            data = lzma.decompress(data)
+        return data, pos + size
+
+    def chunk(self, offset):
+        """
+        Decode a single chunk
+        :param offset: file offset of the chunk (see index)
+        :return: (snapshot bytes, list of (kind, tick, argument)) tuple
+        """
+        data, _ = self.__read_chunk(offset)
+        tick, pos = decode_varint(data, 0)
+        size, pos = decode_varint(data, pos)
+        snapshot = data[pos:pos + size]
+        pos += size
+        records = []
+        while pos < len(data):
+            value, pos = decode_varint(data, pos)
+            kind = value & ((1 << KIND_BITS) - 1)
+            tick += value >> KIND_BITS
+            arg = None
+            if kind in (KEY_PRESSED, KEY_RELEASED):
+                key, pos = decode_varint(data, pos)
+                arg = Key(key - 1) if key else None
+            elif kind == MOUSE_PRESSED:
+                x, y = MOUSE_POSITION.unpack_from(data, pos)
+                pos += MOUSE_POSITION.size
+                button, pos = decode_varint(data, pos)
+                arg = MouseEvent(x, y, MouseButton(button))
+            elif kind == CHECK:
+                arg, = STATE_HASH.unpack_from(data, pos)
+                pos += STATE_HASH.size
+            elif kind == END:
+                arg = []
+                for _ in range(3):
+                    value, pos = decode_signed(data, pos)
+                    arg.append(value)
+                arg = tuple(arg)
+            records.append((kind, tick, arg))
+        return snapshot, records
+
+    def keyframe_for(self, tick):
+        """
+        Find the last chunk starting at or before a tick
+        :param tick: master clock tick
+        :return: file offset of the chunk
+        """
+        pos = bisect.bisect_right([x[0] for x in self.index], tick) - 1
+        return self.index[max(pos, 0)][1]
+
+    def records(self):
+        """
+        Decode all the records of all the chunks
+        :return: list of (kind, tick, argument)
+        """
+        records = []
+        for _, offset in self.index:
+            records += self.chunk(offset)[1]
+        return records
+
+
+def read_replay(filename):
+    """
+    Read and decode a replay file
+    :param filename: file to read
+    :return: (header, list of (kind, tick, argument)) tuple
+    """
+    reader = ReplayReader(filename)
+    return reader.header, reader.records()
+
+
+def headless_game(header):
+    """
+    Create a headless game matching replay header
+    :param header: replay header (see game_header)
+    :return: Game object, on Welcome board
+    """
+    config = ShooterConfig()
+    config.loads(header['config'])
+    game = Game(HeadlessShooter(), {'seed': header['seed'], 'config': config})
+    game.arena = HeadlessArena(
+        {name: RecordedMetrics(value['height'], value['advances'])
+         for name, value in header['metrics'].items()})
+    game.change_board(Board.WELCOME)
+    return game
+
+
+def feed(game, records, until=None, extra=None):
+    """
+    Feed recorded input to a game, running its clock in between
+    :param game: Game object
+    :param records: list of (kind, tick, argument)
+    :param until: master clock tick to stop at (None: after the last record)
+    :param extra: record kind -> handler dictionary for other records (e.g. CHECK)
+    :return: None
+    """
+    handlers = {
+        KEY_PRESSED: game.keypressed,
+        KEY_RELEASED: game.keyreleased,
+        MOUSE_PRESSED: game.mouse_pressed
+    }
+    if extra:
+        handlers.update(extra)
+    for kind, tick, arg in records:
+        if until is not None and tick >= until:
+            break
+        game.clock.run(tick - game.clock.ticks)
+        if kind in handlers:
+            handlers[kind](arg)
+    if until is not None:
+        game.clock.run(until - game.clock.ticks)
+
+
+def play(filename):
+    """
+    Play a replay headlessly, as fast as possible
+    (from the very beginning, keyframes are not used)
+    :param filename: replay file
+    :return: Game object, after the last recorded event
+    """
+    header, records = read_replay(filename)
+    game = headless_game(header)
+    feed(game, records)
+    return game
+
+
+def seek(filename, tick):
+    """
+    Get game state at a given tick of a replay:
+    restore the nearest keyframe, then simulate forward
+    :param filename: replay file
+    :param tick: master clock tick (input recorded at this tick is not fed yet)
+    :return: Game object
+    """
+    reader = ReplayReader(filename)
+    game = headless_game(reader.header)
+    snapshot, records = reader.chunk(reader.keyframe_for(tick))
+    if snapshot:
+        game.restore(snapshot)
+    feed(game, records, tick)
+    return game
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print(f"Usage: {sys.argv[0]} replay-file [tick-to-seek]")
+        sys.exit(1)
+    if len(sys.argv) == 3:
+        played = seek(sys.argv[1], int(sys.argv[2]))
+    else:
+        played = play(sys.argv[1])
+    print(f"ticks: {played.clock.ticks}, points: {played.state.points}, "
+          f"level: {played.state.level}, mode: {played.state.mode.name}")
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+
+"""
+Master fixed-timestep clock
+"""
+
+import time
+from spaceshooter.sdefs import TIMEOUT_TICK, MAX_CATCHUP_TICKS, TIMER_WHEEL_SIZE
+
+
+def ticks(timeout):
+    """
+    Convert a timeout to a number of simulation ticks
+    :param timeout: timeout in miliseconds
+    :return: number of ticks (at least one)
+    """
+    return max(1, timeout // TIMEOUT_TICK)
+
+
+class Job:
+    """
+    Periodic job run by the clock every few ticks
+    """
+    def __init__(self, handler):
+        """
+        Create (inactive) job
+        :param handler: callable to run when due
+        """
+        self.handler = handler
+        self.period = 1
+        self.countdown = 1
+        self.active = False
+
+    def start(self, period):
+        """
+        Start (or restart) job
+        :param period: job period in ticks
+        :return: None
+        """
+        self.period = period
+        self.countdown = period
+        self.active = True
+
+    def tick(self):
+        """
+        Count a single tick down and run the handler when due
+        :return: None
+        """
+        if self.active:
+            self.countdown -= 1
+            if self.countdown <= 0:
+                self.countdown = self.period
+                self.handler()
+
+
+class Clock:
+    """
+    Single master clock: advances in fixed ticks (TIMEOUT_TICK miliseconds)
+    and runs every periodic job from tick counts.
+    Wall time is gathered in an accumulator; when frames run late,
+    at most max_catchup ticks are run at once and the rest is skipped.
+    """
+    def __init__(self, max_catchup=MAX_CATCHUP_TICKS):
+        """
+        Create clock
+        :param max_catchup: max number of ticks run in a single update
+        """
+        self.jobs = {}
+        self.ticks = 0
+        self.accumulator = 0.0
+        self.max_catchup = max_catchup
+        self.skipped = 0
+        self.last = None
+
+    def add(self, name, handler):
+        """
+        Register a periodic job (not started yet)
+        :param name: job name
+        :param handler: callable to run when due
+        :return: None
+        """
+        self.jobs[name] = Job(handler)
+
+    def start(self, name, timeout):
+        """
+        Start (or restart) a job
+        :param name: job name
+        :param timeout: job period in miliseconds
+        :return: None
+        """
+        self.jobs[name].start(ticks(timeout))
+
+    def stop(self, name):
+        """
+        Stop a job
+        :param name: job name
+        :return: None
+        """
+        self.jobs[name].active = False
+
+    def is_active(self, name):
+        """
+        Check if a job is running
+        :param name: job name
+        :return: True if running, False otherwise
+        """
+        return self.jobs[name].active
+
+    def step(self):
+        """
+        Advance by a single tick and run all the jobs that are due
+        :return: None
+        """
+        self.ticks += 1
+        for job in list(self.jobs.values()):
+            job.tick()
+
+    def run(self, count):
+        """
+        Run a number of ticks, regardless of wall time
+        :param count: number of ticks to run
+        :return: None
+        """
+        for _ in range(count):
+            self.step()
+
+    def advance(self, elapsed):
+        """
+        Add elapsed wall time and run all the ticks it covers
+        :param elapsed: elapsed time in miliseconds
+        :return: number of ticks run
+        """
+        self.accumulator += elapsed
+        count = int(self.accumulator // TIMEOUT_TICK)
+        self.accumulator -= count * TIMEOUT_TICK
+        if count > self.max_catchup:
+            # Too late to catch up -- skip the rest instead of spiralling
+            self.skipped += count - self.max_catchup
+            count = self.max_catchup
+        self.run(count)
+        return count
+
+    def get_state(self):
+        """
+        Get clock state for a snapshot
+        :return: (ticks, dictionary of job (period, countdown, active) tuples) tuple
+        """
+        return self.ticks, {name: (job.period, job.countdown, job.active)
+                            for name, job in self.jobs.items()}
+
+    def set_state(self, state):
+        """
+        Restore clock state from a snapshot
+        :param state: clock state (see get_state)
+        :return: None
+        """
+        self.ticks, jobs = state
+        for name, (period, countdown, active) in jobs.items():
+            job = self.jobs[name]
+            job.period = period
+            job.countdown = countdown
+            job.active = active
+
+    def update(self):
+        """
+        Advance by the wall time passed since previous update
+        :return: number of ticks run
+        """
+        now = time.perf_counter()
+        if self.last is None:
+            self.last = now
+        elapsed = (now - self.last) * 1000
+        self.last = now
+        return self.advance(elapsed)
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel keyed on simulation ticks.
+    Timers are named, schedule and cancel are O(1)
+    and nothing is done between expirations.
+    Wheel time only passes when advanced, so not advancing it pauses all the timers.
+    """
+    def __init__(self, size=TIMER_WHEEL_SIZE):
+        """
+        Create empty wheel
+        :param size: number of wheel slots
+        """
+        self.size = size
+        self.slots = [{} for _ in range(size)]
+        self.expiries = {}
+        self.tick = 0
+
+    def schedule(self, name, delay):
+        """
+        Schedule (or reschedule) a timer
+        :param name: timer name
+        :param delay: number of ticks to expire after
+        :return: expiration tick
+        """
+        self.cancel(name)
+        expiry = self.tick + max(1, delay)
+        self.expiries[name] = expiry
+        self.slots[expiry % self.size][name] = expiry
+        return expiry
+
+    def cancel(self, name):
+        """
+        Cancel a timer, if scheduled
+        :param name: timer name
+        :return: None
+        """
+        expiry = self.expiries.pop(name, None)
+        if expiry is not None:
+            del self.slots[expiry % self.size][name]
+
+    def is_scheduled(self, name):
+        """
+        Check if a timer is scheduled
+        :param name: timer name
+        :return: True if scheduled, False otherwise
+        """
+        return name in self.expiries
+
+    def expires_at(self, name):
+        """
+        Get timer expiration tick
+        :param name: timer name
+        :return: expiration tick, None if not scheduled
+        """
+        return self.expiries.get(name, None)
+
+    def remaining(self, name):
+        """
+        Get number of ticks left to timer expiration
+        :param name: timer name
+        :return: ticks left (0 if not scheduled)
+        """
+        if name in self.expiries:
+            return self.expiries[name] - self.tick
+        return 0
+
+    def advance(self):
+        """
+        Advance wheel by a single tick
+        :return: list of names of the timers that expired
+        """
+        self.tick += 1
+        slot = self.slots[self.tick % self.size]
+        if not slot:
+            return []
+        expired = [name for name, expiry in slot.items() if expiry == self.tick]
+        for name in expired:
+            del slot[name]
+            del self.expiries[name]
+        return expired
+
+    def clear(self):
+        """
+        Cancel all the timers
+        :return: None
+        """
+        for name in list(self.expiries):
+            self.cancel(name)
+
+    def dump(self):
+        """
+        Serialize wheel state
+        :return: (tick, list of (name, expiration tick)) tuple
+        """
+        return self.tick, sorted(self.expiries.items())
+
+    def load(self, data):
+        """
+        Restore wheel state serialized by dump()
+        :param data: (tick, list of (name, expiration tick)) tuple
+        :return: None
+        """
+        self.clear()
+        tick, expiries = data
+        self.tick = tick
+        for name, expiry in expiries:
+            self.expiries[name] = expiry
+            self.slots[expiry % self.size][name] = expiry
@@ -93,6 +93,14 @@ class ShooterConfig:
                 content = fh.read()
         except IOError:
             pass  # Read error -- let's go with defaults
+        self.loads(content)
+
+    def loads(self, content):
+        """
+        Read configuration from a JSON string
+        :param content: JSON string (see dumps)
+        :return: None
+        """
         j = json.loads(content)
         for i in ['hiscores', 'lastmode', 'lang']:
             try:
@@ -108,7 +116,14 @@ class ShooterConfig:
         self.db['hiscores'] = self.db['hiscores'][:10]
         if 'keys' in j:
             for key in j['keys']:
-                self.db['keys'][key] = Key(int(j['keys'][key]))
+                self.db['keys'][UserInput(int(key))] = Key(int(j['keys'][key]))
+
+    def dumps(self):
+        """
+        Write configuration to a JSON string
+        :return: JSON string
+        """
+        return json.dumps(self.db)
 
     def save(self):
         """
@@ -11,6 +11,7 @@ STAGE_WIDTH = ARENA_WIDTH
 STAGE_HEIGHT = ARENA_HEIGHT - BOTTOM_BAR
 
 # Timeouts -- miliseconds
+TIMEOUT_TICK = 5  # Simulation tick, common divisor of all the timeouts below
 TIMEOUT_PAINT = 15
 TIMEOUT_GAME_UPDATE = 40
 TIMEOUT_WELCOME = 1000
@@ -35,7 +36,7 @@ FROZEN_TIMER = 10  # Frozen timer in seconds
 
 # Object speeds
 SPEEDX_BOMB = -2
-SHIELD_SPEEDX = -1
+BONUS_SPEEDX = -8  # Medkits, shields, TNTs, lightballs and iceboxes
 MOVABLE_SPEED = 2
 STAR_SPEED = 1
 
@@ -45,6 +46,13 @@ MAX_LEVEL = 4
 MAX_ENEMIES_ITERATIONS = 1
 MAX_EVENTS_FACTOR = 3000
 MAX_NICK_LEN = 10  # Max length of nickname to enter in new hiscore board
+MAX_CATCHUP_TICKS = 20  # Max simulation ticks run at once when frames are late
+TURBO_BATCH_TICKS = 200  # Simulation ticks run per frame event in turbo mode
+BATCH_MAX_TICKS = 360000  # Max simulation ticks per headless game (30 minutes)
+KEYFRAME_TICKS = 2000  # Simulation ticks between replay keyframes (10 seconds)
+CHECK_TICKS = 100  # Simulation ticks between replay state hash checks (0.5 second)
+TIMER_WHEEL_SIZE = 256  # Number of slots in gameplay timer wheel
+POOL_CAP = 64  # Max number of free objects kept per pooled type
 
 # Misc
 DEFAULT_FONT = "Commodore 64 Rounded"
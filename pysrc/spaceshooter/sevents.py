@@ -6,6 +6,7 @@ Events used in SpaceShooter
 
 import enum
 import copy
+import functools
 from spaceshooter.sutils import cycle
 
 
@@ -323,12 +324,13 @@ class GameEvent(enum.IntEnum):
         return events
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def from_factory(level: int, num=0):
         """
-        Create events list
+        Create events list (cached, the same for all games)
         :param level: Level number
         :param num: Number of iterations
-        :return: List of events
+        :return: Tuple of events
         """
         factories = [
             GameEvent.__from_factory_level_1,
@@ -338,7 +340,7 @@ class GameEvent(enum.IntEnum):
             GameEvent.__from_factory_level_5]
         level = 0 if level < 0 else level
         level = 4 if level > 4 else level
-        return factories[level](num)
+        return tuple(factories[level](num))
 
 
 @enum.unique
@@ -480,12 +482,13 @@ class EnemyEvent(enum.IntEnum):
         return enemies
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def from_factory(level: int, num=0):
         """
-        Create enemies list
+        Create enemies list (cached, the same for all games)
         :param level: Level number
         :param num: Number of iterations
-        :return: List of enemies
+        :return: Tuple of enemies
         """
         factories = [
             EnemyEvent.__from_factory_level_1,
@@ -495,4 +498,4 @@ class EnemyEvent(enum.IntEnum):
             EnemyEvent.__from_factory_level_5]
         level = 0 if level < 0 else level
         level = 4 if level > 4 else level
-        return factories[level](num)
+        return tuple(factories[level](num))
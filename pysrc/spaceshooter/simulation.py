@@ -0,0 +1,791 @@
+#!/usr/bin/env python
+
+"""
+Game simulation core (no Qt involved)
+"""
+
+import zlib
+from spaceshooter.stypes import UserInput, Options, MissileType, MovableType,\
+    FireballDirection, Mode, DamageSource
+from spaceshooter.primi import Player, Movable, Star
+from spaceshooter.sdefs import star_ids, ARENA_HEIGHT, ARENA_WIDTH, BOTTOM_BAR,\
+    TIMEOUT_PAINT, TIMEOUT_SMOKE, TIMEOUT_GET_READY, TIMEOUT_GAME_EVENTS,\
+    TIMEOUT_ENEMIES_EVENTS, TIMEOUT_GAME_UPDATE, TIMEOUT_GAME_COUNTER, TIMEOUT_MISSILE_LOCK,\
+    TIMEOUT_SHIELD, TIMEOUT_LIGHT, TIMEOUT_FREEZE, TIMEOUT_BOMB_LOCK, MAX_LEVEL,\
+    SHIELD_TIMER, LIGHTBALL_TIMER, FROZEN_TIMER, POOL_CAP
+from spaceshooter.managers import EventManager, EnemyManager
+from spaceshooter.sclock import ticks, TimerWheel
+from spaceshooter.srandom import RandomStreams
+from spaceshooter.entities import Entities
+
+
+class GameState:
+    """
+    Game simulation: all the game objects, managers and collisions.
+    Image dimensions are only read through sprite metadata (see sprites.sprite_meta),
+    so plain Sprite objects are enough to run it.
+    """
+    transient = ('images', 'on_mode_change', 'on_damage', 'mode_initializers', 'steps',
+                 'expirations', 'wheel', 'eventmanager', 'enemymanager', 'entities')
+    # Buckets moved on every game update (enemies are moved by their manager,
+    # movables on their own, see movable_update_event):
+    moved = ('missiles', 'firemissiles', 'iceboxes', 'bombs', 'medkits', 'lightballs', 'tnts',
+             'shields', 'meteorites', 'drops', 'explosions')
+    # Buckets of moved objects able to leave the screen (culled after every move):
+    culled = ('missiles', 'firemissiles', 'iceboxes', 'bombs', 'medkits', 'lightballs', 'tnts',
+              'shields', 'meteorites', 'drops')
+    # Buckets emptied when a level starts:
+    level_cleared = ('medkits', 'tnts', 'shields', 'lightballs', 'iceboxes', 'missiles',
+                     'firemissiles', 'drops', 'bombs')
+    # Buckets emptied when the player is killed:
+    killed_cleared = ('missiles', 'firemissiles', 'drops', 'tnts', 'medkits', 'shields',
+                      'lightballs', 'bombs')
+
+    def __init__(self, images, options=Options.NORMAL, player_index=0, seed=None,
+                 pool_cap=POOL_CAP):
+        """
+        Create simulation state
+        :param images: images structure (see sprites.sprite_files)
+        :param options: game options (difficulty)
+        :param player_index: player ship number
+        :param seed: session seed (None: a fresh one)
+        :param pool_cap: max number of free objects kept per pooled type
+        """
+        self.images = images
+        self.options_pos = options
+        self.player_index = player_index
+        # Random streams: session-wide ones and the ones of current game,
+        # forked from the session for every new game:
+        self.session = RandomStreams(seed)
+        self.games = 0
+        self.streams = self.session.fork('game-0')
+        self.mode = Mode.NONE
+        self.on_mode_change = None
+        self.on_damage = None  # Listener called with DamageSource of every hit taken
+        self.tick = 0
+        self.mode_tick = 0
+        self.events_period = ticks(TIMEOUT_GAME_EVENTS)
+        self.enemies_period = ticks(TIMEOUT_ENEMIES_EVENTS)
+        # Game objects:
+        self.entities = Entities(pool_cap)
+        self.tnt = 0
+        self.movable_factory = None
+        self.player = None
+        self.stars = Star.from_factory(
+            star_ids,
+            self.images['star'],
+            self.session.stream('stars'))
+        # Game-related:
+        self.points = 0
+        self.level = -1
+        self.lives = 3
+        self.indicators = 10
+        self.game_counter = 0
+        self.get_ready = 3
+        self.smoke_counter = 0
+        # Countdowns and cooldowns ('shield', 'freeze', 'light',
+        # 'missile-lock', 'bomb-lock', 'get-ready', 'smoke'):
+        self.wheel = TimerWheel()
+        self.expirations = {
+            'get-ready': self.get_ready_event,
+            'smoke': self.smoke_timer
+        }
+        self.eventmanager = EventManager(self)
+        self.enemymanager = EnemyManager(self)
+        self.mode_initializers = {
+            Mode.NONE: self.__init_none,
+            Mode.INIT: self.__init_init,
+            Mode.PREPARE: self.__init_prepare,
+            Mode.PLAY: self.__init_play,
+            Mode.PAUSED: self.__init_paused,
+            Mode.KILLED: self.__init_killed,
+            Mode.GAMEOVER: self.__init_gameover,
+            Mode.CONGRATS: self.__init_congrats
+        }
+        self.steps = {
+            Mode.PREPARE: self.__step_prepare,
+            Mode.PLAY: self.__step_play
+        }
+
+    def change_mode(self, mode):
+        """
+        Change game mode, then execute its initial action
+        and notify the listener, if any
+        :param mode: Mode to change to
+        :return: None
+        """
+        if mode != self.mode:
+            self.mode = mode
+            self.mode_tick = 0
+            initializer = self.mode_initializers[mode]
+            initializer()
+            if self.on_mode_change:
+                self.on_mode_change(mode)
+
+    def __init_none(self):
+        """
+        Unused handler (no game in progress)
+        :return: None
+        """
+
+    def __init_init(self):
+        """
+        Very first game initializer
+        :return: None
+        """
+        self.points = 0
+        self.level = -1
+        self.lives = 3
+        self.indicators = 10
+        self.tnt = 3
+        self.get_ready = 3
+        self.player = None
+        self.entities.clear('explosions')
+        self.games += 1
+        self.streams = self.session.fork(f'game-{self.games}')
+        self.eventmanager = EventManager(self)
+        self.enemymanager = EnemyManager(self)
+        self.wheel.clear()
+        self.wheel.schedule('smoke', ticks(TIMEOUT_SMOKE))
+        self.change_mode(Mode.PREPARE)
+
+    def __init_prepare(self):
+        """
+        Game prepare initializer
+        :return: None
+        """
+        if self.level < MAX_LEVEL:
+            self.level += 1
+        self.enemymanager.clear()
+        self.enemymanager.set_level(self.level)
+        self.eventmanager.set_level(self.level)
+        self.entities.clear(*GameState.level_cleared)
+        self.stop_powerups()
+        self.movable_factory = MovableType.get_from_factory(self.level)
+        movs = []
+        for _ in range(0, 16):
+            movs.append(next(self.movable_factory))
+        self.entities.clear('movables')
+        self.entities['movables'].extend(Movable.from_factory(movs,
+                                                              ARENA_WIDTH,
+                                                              self.images['movables']))
+        if not self.player:
+            self.player = Player(200, 400,
+                                 self.images['players'][self.player_index])
+        self.wheel.schedule('get-ready', ticks(TIMEOUT_GET_READY))
+
+    def __init_play(self):
+        """
+        Perform all the actions necessary to start the game
+        :return: None
+        """
+        self.game_counter = 0
+        option = self.options_pos % 3
+        self.events_period = ticks(TIMEOUT_GAME_EVENTS - 100 * (option + self.level))
+        self.enemies_period = ticks(TIMEOUT_ENEMIES_EVENTS - 100 * (option + self.level))
+
+    def __init_paused(self):
+        """
+        Unused handler
+        :return: None
+        """
+
+    def __init_killed(self):
+        """
+        Perform all the actions needed when killed
+        :return: None
+        """
+        # No enemies while killed and waiting for RET key:
+        self.enemymanager.clear()
+        # Clear any event objects on the board:
+        self.entities.clear(*GameState.killed_cleared)
+        # Clear any other timers:
+        self.stop_powerups()
+
+    def __init_gameover(self):
+        """
+        Unused handler
+        :return: None
+        """
+
+    def __init_congrats(self):
+        """
+        Unused handler
+        :return: None
+        """
+
+    def process_killed(self):
+        """
+        Process killed player
+        :return: None
+        """
+        if self.lives > 0:
+            self.indicators = 10
+        self.enemymanager.clear()
+        self.entities.clear('missiles', 'drops', 'medkits', 'shields', 'tnts', 'lightballs',
+                            'iceboxes', 'explosions')
+
+    def get_state(self):
+        """
+        Get simulation state for a snapshot
+        (images are left as references, see snapshot module)
+        :return: dictionary of attributes
+        """
+        state = {k: v for k, v in self.__dict__.items() if k not in GameState.transient}
+        state['entities'] = self.entities.get_state()
+        state['wheel'] = self.wheel.dump()
+        state['eventmanager'] = self.eventmanager.get_state()
+        state['enemymanager'] = self.enemymanager.get_state()
+        return state
+
+    def set_state(self, state):
+        """
+        Restore simulation state from a snapshot
+        :param state: dictionary of attributes (see get_state)
+        :return: None
+        """
+        state = dict(state)
+        self.entities.set_state(state.pop('entities'))
+        self.wheel.load(state.pop('wheel'))
+        self.eventmanager.set_state(state.pop('eventmanager'))
+        self.enemymanager.set_state(state.pop('enemymanager'))
+        self.__dict__.update(state)
+
+    def digest(self):
+        """
+        Get hash of simulation state: counters, timers, random streams
+        and positions of all the game objects (stars are left out)
+        :return: 32-bit integer
+        """
+        data = [self.tick, self.mode, self.points, self.level, self.lives, self.indicators,
+                self.tnt, self.wheel.dump(),
+                sorted((name, rng.getstate()) for name, rng in self.streams.streams.items())]
+        if self.player:
+            data.append((self.player.x, self.player.y))
+        for bucket in self.entities.buckets.values():
+            data.append([(x.x, x.y) for x in bucket])
+        return zlib.crc32(repr(data).encode("UTF-8"))
+
+    def memory_report(self):
+        """
+        Get memory taken by all the game objects per type
+        (see primi.memory_report)
+        :return: type name -> (count, size in bytes) dictionary
+        """
+        others = list(self.stars)
+        if self.player:
+            others.append(self.player)
+        if self.enemymanager.boss:
+            others.append(self.enemymanager.boss)
+        return self.entities.memory_report(others)
+
+    def stop_powerups(self):
+        """
+        Cancel shield, freeze and lightball timers
+        :return: None
+        """
+        self.wheel.cancel('shield')
+        self.wheel.cancel('freeze')
+        self.wheel.cancel('light')
+
+    def is_active(self, name):
+        """
+        Check if a wheel timer (e.g. 'shield') is running
+        :param name: timer name
+        :return: True if running, False otherwise
+        """
+        return self.wheel.is_scheduled(name)
+
+    def seconds_left(self, name):
+        """
+        Get number of (started) seconds left to wheel timer expiration
+        :param name: timer name
+        :return: seconds left (0 if not running)
+        """
+        return -(-self.wheel.remaining(name) // ticks(1000))
+
+    def step(self):
+        """
+        Advance simulation by a single tick (TIMEOUT_TICK miliseconds)
+        and run all the periodic jobs that are due
+        :return: None
+        """
+        self.tick += 1
+        self.mode_tick += 1
+        if self.tick % ticks(TIMEOUT_PAINT) == 0:
+            self.stars_update_event()
+        if self.mode in self.steps:
+            self.steps[self.mode]()
+
+    def __advance_timers(self):
+        """
+        Advance timer wheel (only in Prepare and Play modes,
+        so the timers are paused otherwise) and handle expirations
+        :return: None
+        """
+        for name in self.wheel.advance():
+            if name in self.expirations:
+                self.expirations[name]()
+
+    def __step_prepare(self):
+        """
+        Periodic jobs run in Prepare mode
+        :return: None
+        """
+        self.__advance_timers()
+
+    def __step_play(self):
+        """
+        Periodic jobs run in Play mode
+        (stop as soon as any of them changed the mode)
+        :return: None
+        """
+        self.__advance_timers()
+        tick = self.mode_tick
+        if tick % ticks(TIMEOUT_PAINT) == 0:
+            self.movable_update_event()
+        if tick % ticks(TIMEOUT_GAME_COUNTER) == 0:
+            self.game_counter_event()
+        if tick % ticks(TIMEOUT_GAME_UPDATE) == 0:
+            self.game_update_event()
+            if self.mode != Mode.PLAY:
+                return
+        if tick % self.events_period == 0:
+            self.events_event()
+        if tick % self.enemies_period == 0:
+            self.enemies_event()
+
+    def stars_update_event(self):
+        """
+        Move all stars according to their policy
+        :return: None
+        """
+        for star in self.stars:
+            star.move()
+
+    def game_counter_event(self):
+        """
+        Game counter event handler
+        :return: None
+        """
+        self.game_counter += 1
+
+    def get_ready_event(self):
+        """
+        Get-ready event handler
+        :return: None
+        """
+        if self.get_ready > 0:
+            self.get_ready -= 1
+            self.wheel.schedule('get-ready', ticks(TIMEOUT_GET_READY))
+        else:
+            self.change_mode(Mode.PLAY)
+
+    def __add_movable(self):
+        """
+        Append new movable from generator
+        :return: None
+        """
+        last = self.entities['movables'][-1]
+        x = last.x + last.w  # no spacing, as requested
+        new_type = next(self.movable_factory)
+        self.entities.spawn('movables', x, self.images['movables'][new_type], new_type)
+
+    def movable_update_event(self):
+        """
+        Move all movables according to their policy
+        :return: None
+        """
+        movables = self.entities['movables']
+        for movable in movables:
+            movable.move()
+        if not movables[0].is_valid():
+            del movables[0]
+            self.__add_movable()
+
+    def move_player(self, action):
+        """
+        Move player according to user action
+        (only within the stage)
+        :param action: UserInput action
+        :return: None
+        """
+        if action == UserInput.TOP:
+            if self.player.y > 20:
+                self.player.go_up()
+        elif action == UserInput.BOTTOM:
+            if self.player.y < ARENA_HEIGHT - BOTTOM_BAR - self.player.h - 20:
+                self.player.go_down()
+        elif action == UserInput.RIGHT:
+            if self.player.x < ARENA_WIDTH - self.player.w - 20:
+                self.player.go_right()
+        elif action == UserInput.LEFT:
+            if self.player.x > 20:
+                self.player.go_left()
+
+    def use_weapon(self, action):
+        """
+        Fire a missile, drop a bomb or use TNT according to user action
+        :param action: UserInput action
+        :return: None
+        """
+        if action == UserInput.FIRE:
+            if self.wheel.is_scheduled('light'):
+                self.__create_firemissile(
+                    self.player.x + self.player.w,
+                    self.player.y + self.player.h // 2)
+            else:
+                self.__create_missile(
+                    self.player.x + self.player.w,
+                    self.player.y + self.player.h // 2,
+                    MissileType.FROM)
+        elif action == UserInput.BOMB:
+            self.__create_bomb(
+                self.player.x + self.player.w // 4,
+                self.player.y + self.player.h)
+        elif action == UserInput.TNT:
+            self.__explode_tnt()
+
+    def __create_missile(self, x, y, etype):
+        """
+        Create new missile
+        :param x: Missile X coordinate
+        :param y: Missile Y coordinate
+        :param etype: Missile type
+        :return: None
+        """
+        if not self.wheel.is_scheduled('missile-lock'):
+            self.wheel.schedule('missile-lock', ticks(TIMEOUT_MISSILE_LOCK))
+            self.entities.spawn('missiles', x, y, self.images['missiles'][etype], etype)
+
+    def game_update_event(self):
+        """
+        Move all objects according to their policies
+        :return: None
+        """
+        self.entities.move(*GameState.moved)
+        # Enemies
+        if not self.wheel.is_scheduled('freeze'):
+            self.enemymanager.move()
+        self.entities.cull(*GameState.culled)
+        self.__check_collision_shield()
+        self.__check_collision_medkit()
+        self.__check_collision_tnt()
+        self.__check_collision_missiles()
+        self.__check_collision_drops()
+        self.__check_collision_enemies()
+        self.__check_collision_lightball()
+        self.__check_collision_icebox()
+        self.__check_collision_bomb()
+        self.__check_collision_movables()
+        # Collision checks only mark objects invalid, so every bucket
+        # is walked once per update to remove them:
+        self.entities.compact()
+
+    def enemies_event(self):
+        """
+        Process enemy manager run
+        :return:
+        """
+        if not self.enemymanager.run():
+            if self.level == MAX_LEVEL:
+                if self.lives == 0:
+                    self.change_mode(Mode.GAMEOVER)
+                else:
+                    boss = self.enemymanager.boss
+                    self.entities.spawn('explosions',
+                                        boss.x + boss.w // 2,
+                                        boss.y + boss.h // 2,
+                                        self.images['explosions'])
+                    self.change_mode(Mode.CONGRATS)
+            else:
+                self.change_mode(Mode.PREPARE)
+
+    def events_event(self):
+        """
+        Handle game events counter event
+        :return: None
+        """
+        self.eventmanager.run()
+
+    def __check_collision_drops(self):
+        """
+        Check if any of the drop collided a player - only in normal and hard mode
+        and perform an action:
+        * if not shield/unlimited mode explode player
+        * if not shield/unlimited mode decrease indicator points
+        """
+        if not self.wheel.is_scheduled('shield') and \
+                self.options_pos not in (Options.EASY, Options.UNLIMITED):
+            drops = self.entities['drops']
+            for i in drops.hits(self.player):
+                drops.valid[i] = False
+                self.__explode(
+                    self.player.x + self.player.w // 2,
+                    self.player.y + self.player.h // 2)
+                self.__decrease_hp(DamageSource.DROP)
+
+    def __check_collision_missiles(self):
+        """
+        Check all collisions with missiles
+        :return: None
+        """
+        missiles = self.entities['missiles']
+        for i in range(len(missiles)):
+            etype = missiles.etype[i]
+            if etype == MissileType.FROM and missiles.valid[i]:
+                # Collisions tested inline, with missile edges read once:
+                x0, y0 = missiles.x[i], missiles.y[i]
+                x1, y1 = x0 + missiles.w[i], y0 + missiles.h[i]
+                for enemy in self.enemymanager.enemies:
+                    if x0 < enemy.x + enemy.w and enemy.x < x1 and \
+                            y0 < enemy.y + enemy.h and enemy.y < y1 and enemy.is_valid():
+                        enemy.valid = False
+                        missiles.valid[i] = False
+                        self.__explode(enemy.x + enemy.w // 2,
+                                       enemy.y + enemy.h // 2)
+                        self.points += 1
+                for movable in self.entities['movables'].overlapping(x0, x1):
+                    if movable.is_valid() and movable.etype == MovableType.DZIALO and \
+                            y0 < movable.y + movable.h and movable.y < y1:
+                        movable.valid = False
+                        self.points += 1
+                        self.__explode(movable.x + movable.w // 2,
+                                       movable.y + movable.h // 2)
+                        self.__add_movable()
+            elif etype in [MissileType.TO,
+                           MissileType.TO_NWW,
+                           MissileType.TO_SWW,
+                           MissileType.TO_NW] and missiles.valid[i]:
+                if not self.wheel.is_scheduled('shield') and self.options_pos != Options.UNLIMITED:
+                    if missiles.collides(i, self.player):
+                        missiles.valid[i] = False
+                        self.__explode(self.player.x + self.player.w // 2,
+                                       self.player.y + self.player.h // 2)
+                        self.__decrease_hp(DamageSource.MISSILE)
+        fireballs = self.entities['firemissiles']
+        for i in range(len(fireballs)):
+            x0, y0 = fireballs.x[i], fireballs.y[i]
+            x1, y1 = x0 + fireballs.w[i], y0 + fireballs.h[i]
+            for enemy in self.enemymanager.enemies:
+                if enemy.is_valid() and fireballs.valid[i] and fireballs.collides(i, enemy):
+                    enemy.valid = False
+                    fireballs.valid[i] = False
+                    self.points += 1
+                    self.__explode(enemy.x + enemy.w // 2,
+                                   enemy.y + enemy.h // 2)
+            for movable in self.entities['movables'].overlapping(x0, x1):
+                if movable.is_valid() and movable.etype == MovableType.DZIALO and \
+                        y0 < movable.y + movable.h and movable.y < y1 and fireballs.valid[i]:
+                    movable.valid = False
+                    self.points += 1
+                    self.__explode(movable.x + movable.w // 2,
+                                   movable.y + movable.h // 2)
+                    self.__add_movable()
+        if self.enemymanager.boss:
+            missiles = self.entities['missiles']
+            for i in range(len(missiles)):
+                if missiles.etype[i] == MissileType.FROM and missiles.valid[i]:
+                    if missiles.collides(i, self.enemymanager.boss):
+                        self.enemymanager.boss.decrease_hp()
+
+    def __decrease_hp(self, source):
+        """
+        Decrease indicator points when collided by an object
+        :param source: DamageSource of the hit
+        :return: None
+        """
+        if self.on_damage:
+            self.on_damage(source)
+        if self.indicators > 0:
+            self.indicators -= 1
+        if self.indicators == 0:
+            self.lives -= 1
+            if self.lives <= 0:  # In case of two timers did the lives < 0
+                self.change_mode(Mode.GAMEOVER)
+            else:
+                self.process_killed()
+                self.change_mode(Mode.KILLED)
+
+    def __increase_hp(self):
+        """
+        Increase indicator points (when medkit caught)
+        :return: None
+        """
+        if self.indicators < 10:
+            self.indicators += 1
+
+    def __check_collision_enemies(self):
+        """
+        Check if player collides with any enemy, then do the action:
+        * explode enemy,
+        * increase game points,
+        * if not unlimited mode/frozen/shield, decrease indicator points
+        :return: None
+        """
+        for enemy in self.enemymanager.enemies:
+            if enemy.is_valid() and enemy.collides(self.player):
+                self.points += 1
+                enemy.valid = False
+                self.__explode(enemy.x + enemy.w // 2,
+                               enemy.y + enemy.h // 2)
+                if not self.wheel.is_scheduled('shield') and \
+                        not self.wheel.is_scheduled('freeze') and \
+                        self.options_pos != Options.UNLIMITED:
+                    self.__decrease_hp(DamageSource.ENEMY)
+
+    def __check_collision_movables(self):
+        """
+        Check if player collided with a movable: only hardcore mode.
+        Action:
+        * increase game points
+        * decrease HP
+        * explode building
+        :return: None
+        """
+        if self.options_pos == Options.HARD and self.player:
+            player = self.player
+            for movable in self.entities['movables'].overlapping(player.x, player.x + player.w):
+                if movable.is_valid() and movable.collides(player):
+                    self.points += 1
+                    movable.valid = False
+                    self.__explode(movable.x + movable.w // 2,
+                                   movable.y + movable.h // 2)
+                    self.__add_movable()
+                    self.__decrease_hp(DamageSource.MOVABLE)
+
+    def __explode(self, x, y):
+        """
+        Create new explosion and append to all explosions list
+        :param x: X coordinate of explosion
+        :param y: Y coordinate of explosion
+        :return: None
+        """
+        self.entities.spawn('explosions', x, y, self.images['explosions'])
+
+    def __explode_tnt(self):
+        """
+        Create 3 explosions when TNT used
+        :return: None
+        """
+        if self.tnt > 0 and len(self.enemymanager.enemies) > 0:
+            for i in range(0, 3):
+                try:
+                    enemy = self.enemymanager.enemies[i]
+                    self.__explode(enemy.x + enemy.w // 2,
+                                   enemy.y + enemy.h // 2)
+                    enemy.valid = False
+                except IndexError:
+                    pass
+            self.enemymanager.compact()
+            self.tnt -= 1
+
+    def __check_collision_medkit(self):
+        """
+        Check collision with medkits -- collect health points
+        """
+        medkits = self.entities['medkits']
+        for i in medkits.hits(self.player):
+            medkits.valid[i] = False
+            self.__increase_hp()
+
+    def __check_collision_shield(self):
+        """
+        Check collision with shields -- collect a shield
+        (remove all remaining shields if any)
+        """
+        for _ in self.entities['shields'].hits(self.player):
+            self.wheel.schedule('shield', ticks(SHIELD_TIMER * TIMEOUT_SHIELD))
+            self.entities.clear('shields')
+
+    def __check_collision_tnt(self):
+        """
+        Check collision with TNT -- collect a TNT
+        """
+        tnts = self.entities['tnts']
+        for i in tnts.hits(self.player):
+            self.tnt += 1
+            tnts.valid[i] = False
+
+    def __check_collision_lightball(self):
+        """
+        Check collision with lightball -- enter LightBall mode
+        (3 missiles in a single shot)
+        """
+        light_balls = self.entities['lightballs']
+        for i in light_balls.hits(self.player):
+            self.wheel.schedule('light', ticks(LIGHTBALL_TIMER * TIMEOUT_LIGHT))
+            light_balls.valid[i] = False
+            self.entities.clear('lightballs')
+
+    def __check_collision_icebox(self):
+        """
+        Check if player caught icebox
+        :return: None
+        """
+        iceboxes = self.entities['iceboxes']
+        for i in iceboxes.hits(self.player):
+            iceboxes.valid[i] = False
+            self.wheel.schedule('freeze', ticks(FROZEN_TIMER * TIMEOUT_FREEZE))
+            # If frozen mode, no missiles shall be present:
+            self.entities.clear('iceboxes', 'missiles')
+
+    def __check_collision_bomb(self):
+        """
+        Check if movable or enemy collided with a bomb
+        :return: None
+        """
+        bombs = self.entities['bombs']
+        for i in range(len(bombs)):
+            x0, y0 = bombs.x[i], bombs.y[i]
+            x1, y1 = x0 + bombs.w[i], y0 + bombs.h[i]
+            for movable in self.entities['movables'].overlapping(x0, x1):
+                if movable.is_valid() and y0 < movable.y + movable.h and movable.y < y1:
+                    self.__explode(movable.x + movable.w // 2, movable.y + movable.h // 2)
+                    bombs.valid[i] = False
+                    movable.valid = False
+                    self.__add_movable()
+                    self.points += 1
+            for enemy in self.enemymanager.enemies:
+                if enemy.is_valid() and x0 < enemy.x + enemy.w and enemy.x < x1 and \
+                        y0 < enemy.y + enemy.h and enemy.y < y1:
+                    self.__explode(enemy.x + enemy.w // 2, enemy.y + enemy.h // 2)
+                    enemy.valid = False
+                    bombs.valid[i] = False
+                    self.points += 1
+
+    def __create_bomb(self, x, y):
+        """
+        Create bomb at given location
+        (and lock bombs for a while)
+        :param x: X coordinate of the bomb
+        :param y: Y coordinate of the bomb
+        :return: None
+        """
+        if not self.wheel.is_scheduled('bomb-lock'):
+            self.wheel.schedule('bomb-lock', ticks(TIMEOUT_BOMB_LOCK))
+            self.entities.spawn('bombs', x, y, self.images['indicators']['bomb'])
+
+    def __create_firemissile(self, x, y):
+        """
+        Create fire missile, which in fact contains 3 fireballs
+        :param x: initial X position of firemissile
+        :param y: initial Y position of firemissile
+        :return: None
+        """
+        if not self.wheel.is_scheduled('missile-lock'):
+            self.wheel.schedule('missile-lock', ticks(TIMEOUT_MISSILE_LOCK))
+            image = self.images['indicators']['light-ball']
+            for direction in (FireballDirection.UP, FireballDirection.STRAIGHT,
+                              FireballDirection.DOWN):
+                self.entities.spawn('firemissiles', x, y, image, direction)
+
+    def smoke_timer(self):
+        """
+        Handle smoke timer
+        (rorate smoke frame)
+        :return:
+        """
+        self.smoke_counter += 1
+        self.smoke_counter %= 4
+        self.wheel.schedule('smoke', ticks(TIMEOUT_SMOKE))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""
+Whole game snapshots: images are stored as references
+into the images structure (never pickled themselves)
+"""
+
+import io
+import pickle
+import copyreg
+
+# Modules of the game types found in snapshots
+# (only classes defined in them are loaded, never functions):
+SNAPSHOT_MODULES = ('spaceshooter.primi', 'spaceshooter.components', 'spaceshooter.projectiles',
+                    'spaceshooter.terrain', 'spaceshooter.stypes', 'spaceshooter.sevents',
+                    'spaceshooter.srandom', 'spaceshooter.sutils')
+# Module -> other globals allowed in snapshots (containers and random generators):
+SNAPSHOT_GLOBALS = {
+    'builtins': ('set', 'frozenset', 'bytearray', 'complex', 'range'),
+    'collections': ('deque', 'OrderedDict', 'defaultdict'),
+    'random': ('Random',)
+}
+
+
+def image_refs(images, path=()):
+    """
+    Index all the images (and lists/dictionaries of them) by their path
+    :param images: images structure (see sprites.sprite_files)
+    :param path: path of the images structure itself
+    :return: (object id -> path, path -> object) dictionaries
+    """
+    ids = {}
+    objects = {}
+
+    def walk(obj, key):
+        """
+        Index a single object, then its items
+        :param obj: image, list or dictionary
+        :param key: path to the object
+        :return: None
+        """
+        ids.setdefault(id(obj), key)
+        objects[key] = obj
+        if isinstance(obj, dict):
+            for name, value in obj.items():
+                walk(value, key + (name,))
+        elif isinstance(obj, list):
+            for i, value in enumerate(obj):
+                walk(value, key + (i,))
+
+    walk(images, path)
+    return ids, objects
+
+
+def image_ref(path):
+    """
+    Image reference stored in snapshots instead of an image
+    (resolved by SnapshotUnpickler, so it is never called on load)
+    :param path: image path
+    :return: None
+    """
+    raise pickle.UnpicklingError(f"Unresolved image reference: {path}")
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """
+    Unpickler resolving image references.
+    Snapshots come from replay files as well, so only the globals
+    a snapshot consists of are allowed (see SNAPSHOT_MODULES and SNAPSHOT_GLOBALS):
+    anything else could run arbitrary code on load.
+    """
+    def __init__(self, fh, objects):
+        """
+        Create unpickler
+        :param fh: file to read from
+        :param objects: path -> object dictionary (see image_refs)
+        """
+        super().__init__(fh)
+        self.objects = objects
+
+    def find_class(self, module, name):
+        """
+        Resolve a global, with image references bound to the images structure
+        :param module: module name
+        :param name: global name
+        :return: global object
+        """
+        if module == __name__ and name == image_ref.__name__:
+            return self.objects.__getitem__
+        if name in SNAPSHOT_GLOBALS.get(module, ()):
+            return super().find_class(module, name)
+        if module in SNAPSHOT_MODULES and '.' not in name:
+            obj = super().find_class(module, name)
+            if isinstance(obj, type) and obj.__module__ == module:
+                return obj
+        raise pickle.UnpicklingError(f"Global not allowed in snapshots: {module}.{name}")
+
+
+class ImageIndex:
+    """
+    Images structure indexed for snapshots: images of every type
+    found in the structure are pickled as image references.
+    Reducers are looked up by the pickler itself (dispatch table),
+    so other objects do not pay for any Python-level hook.
+    """
+    def __init__(self, images):
+        """
+        Index images structure
+        :param images: images structure (see sprites.sprite_files)
+        """
+        self.images = images
+        self.ids, self.objects = image_refs(images)
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        for obj in self.objects.values():
+            if not isinstance(obj, (dict, list)):
+                self.dispatch_table[type(obj)] = self.reduce_image
+
+    def reduce_image(self, obj):
+        """
+        Reduce an image to its reference
+        :param obj: image
+        :return: reduce tuple (see pickle.object.__reduce__)
+        """
+        if id(obj) not in self.ids:
+            raise pickle.PicklingError("Image out of the images structure")
+        return image_ref, (self.ids[id(obj)],)
+
+    def dumps(self, state):
+        """
+        Pickle state with image references
+        :param state: state to pickle
+        :return: snapshot bytes
+        """
+        fh = io.BytesIO()
+        pickler = pickle.Pickler(fh, pickle.HIGHEST_PROTOCOL)
+        pickler.dispatch_table = self.dispatch_table
+        pickler.dump(state)
+        return fh.getvalue()
+
+    def loads(self, data):
+        """
+        Unpickle state, resolving image references
+        :param data: snapshot bytes (see dumps)
+        :return: state
+        """
+        return SnapshotUnpickler(io.BytesIO(data), self.objects).load()
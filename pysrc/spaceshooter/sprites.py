@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+
+"""
+Sprite definitions (no Qt involved)
+"""
+
+import os
+import zlib
+import struct
+import functools
+from collections import namedtuple
+from spaceshooter.stypes import MovableType, MissileType
+
+IMAGES_PATH = os.path.join(os.path.dirname(__file__), "images")
+
+# Image files, in the very same layout as SpaceShooter.images
+sprite_files = {
+    'star': 'star.png',
+    'players': [
+        'aplayer0.png',
+        'aplayer1.png',
+        'aplayer2.png',
+        'asterowiec.png'
+    ],
+    'big_players': [
+        'player0.png',
+        'player2.png',
+        'player3.png',
+        'sterowiec.png'
+    ],
+    'movables': {
+        MovableType.DZIALO: 'dzialo.png',
+        MovableType.DOM1: 'dom1.png',
+        MovableType.DOM2: 'dom2.png',
+        MovableType.DOM3: 'dom3.png',
+        MovableType.FABRYKA1: 'fabryka1.png',
+        MovableType.FABRYKA2: 'fabryka2.png',
+        MovableType.FABRYKA3: 'fabryka3.png',
+        MovableType.WIEZOWIEC1: 'wiezowiec1.png',
+        MovableType.WIEZOWIEC2: 'wiezowiec2.png',
+        MovableType.WIEZOWIEC3: 'wiezowiec3.png'
+    },
+    'smokes': [
+        'smoke-1.png',
+        'smoke-2.png',
+        'smoke-3.png',
+        'smoke-4.png'
+    ],
+    'enemies': [
+        'enemy4.png',
+        'enemy5.png',
+        'enemy6.png',
+        'enemy7.png',
+        'enemy8.png',
+        'enemy9.png'
+    ],
+    'explosions': [
+        'explosion-1.png',
+        'explosion-2.png',
+        'explosion-3.png',
+        'explosion-2.png',
+        'explosion-1.png'
+    ],
+    'missiles': {
+        MissileType.FROM: 'missile-2.png',
+        MissileType.TO: 'missile-1.png',
+        MissileType.TO_NW: 'missile-3.png',
+        MissileType.TO_SW: 'missile-4.png',
+        MissileType.TO_NWW: 'missile-5.png',
+        MissileType.TO_SWW: 'missile-6.png'
+    },
+    'icons': {
+        'app': 'aicon.png',
+        'pl': 'flag_pl.png',
+        'en': 'flag_en.png',
+        'next': 'next.png',
+        'prev': 'prev.png'
+    },
+    'boss': 'pzm.png',
+    'indicators': {
+        'red': 'indicator_red.png',
+        'green': 'indicator_green.png',
+        'yellow': 'indicator_yellow.png',
+        'black': 'indicator_black.png',
+        'player': 'player_indicator.png',
+        'shield': 'shield-green.png',
+        'tnt': 'tnt.png',
+        'light-ball': 'light_ball.png',
+        'frozen-box': 'frozen_box.png',
+        'medkit': 'apteczka.png',
+        'drop': 'drop.png',
+        'bomb': 'bomba.png',
+        'cup': 'cup.png'
+    }
+}
+
+
+class Sprite:
+    """
+    Plain image metadata, used by the simulation
+    wherever only image dimensions are needed
+    """
+    def __init__(self, name, w, h):
+        """
+        Create sprite metadata
+        :param name: image file name
+        :param w: image width
+        :param h: image height
+        """
+        self.name = name
+        self.w = w
+        self.h = h
+
+    def width(self):
+        """
+        Get sprite width (same interface as QPixmap)
+        :return: sprite width
+        """
+        return self.w
+
+    def height(self):
+        """
+        Get sprite height (same interface as QPixmap)
+        :return: sprite height
+        """
+        return self.h
+
+
+class SpriteMeta(namedtuple('SpriteMeta', ('image', 'w', 'h', 'cx', 'cy'))):
+    """
+    Immutable metadata of a single image: dimensions and offsets of its centre,
+    shared by all the objects showing it (see sprite_meta).
+    The image itself is kept referenced, so its id is never reused.
+    """
+    __slots__ = ()
+
+
+# id of image -> SpriteMeta of every image seen (see sprite_meta):
+METADATA = {}
+
+
+def sprite_meta(image):
+    """
+    Get metadata of an image, so its dimensions are read only once
+    (images loaded with register_sprites are already there)
+    :param image: image (QPixmap or Sprite)
+    :return: SpriteMeta object
+    """
+    meta = METADATA.get(id(image))
+    if meta is None:
+        w = image.width()
+        h = image.height()
+        meta = METADATA[id(image)] = SpriteMeta(image, w, h, w // 2, h // 2)
+    return meta
+
+
+def register_sprites(images):
+    """
+    Build metadata of all the images of an images structure, right when loaded
+    :param images: images structure (see map_sprites)
+    :return: images
+    """
+    map_sprites(images, sprite_meta)
+    return images
+
+
+def png_size(filename):
+    """
+    Read PNG image dimensions from its IHDR chunk
+    :param filename: PNG file to read
+    :return: (width, height) tuple
+    """
+    with open(filename, "rb") as fh:
+        header = fh.read(24)
+    if len(header) < 24 or header[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"Not a PNG file: {filename}")
+    return struct.unpack(">II", header[16:24])
+
+
+def png_unfilter(line, prior, ftype, bpp):
+    """
+    Reconstruct a single PNG scanline (in place)
+    :param line: filtered scanline bytes (bytearray)
+    :param prior: previous reconstructed scanline (zeroes for the first one)
+    :param ftype: filter type (0: none, 1: sub, 2: up, 3: average, 4: paeth)
+    :param bpp: bytes per pixel
+    :return: None
+    """
+    if ftype == 1:
+        for i in range(bpp, len(line)):
+            line[i] = (line[i] + line[i - bpp]) & 0xff
+    elif ftype == 2:
+        for i, up in enumerate(prior):
+            line[i] = (line[i] + up) & 0xff
+    elif ftype == 3:
+        for i in range(bpp):
+            line[i] = (line[i] + (prior[i] >> 1)) & 0xff
+        for i in range(bpp, len(line)):
+            line[i] = (line[i] + ((line[i - bpp] + prior[i]) >> 1)) & 0xff
+    elif ftype == 4:
+        for i in range(bpp):
+            line[i] = (line[i] + prior[i]) & 0xff
+        for i in range(bpp, len(line)):
+            a = line[i - bpp]
+            b = prior[i]
+            c = prior[i - bpp]
+            p_a = abs(b - c)
+            p_b = abs(a - c)
+            p_c = abs(a + b - 2 * c)
+            if p_a <= p_b and p_a <= p_c:
+                line[i] = (line[i] + a) & 0xff
+            elif p_b <= p_c:
+                line[i] = (line[i] + b) & 0xff
+            else:
+                line[i] = (line[i] + c) & 0xff
+
+
+def png_data(filename):
+    """
+    Read header and compressed image data of 8-bit RGBA, non-interlaced PNG image
+    :param filename: PNG file to read
+    :return: (width, height, compressed data) tuple
+    """
+    with open(filename, "rb") as fh:
+        data = fh.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"Not a PNG file: {filename}")
+    pos = 8
+    idat = bytearray()
+    width = height = 0
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+            if (depth, color, interlace) != (8, 6, 0):
+                raise ValueError(f"Unsupported PNG format: {filename}")
+        elif kind == b"IDAT":
+            idat += chunk
+        elif kind == b"IEND":
+            break
+    return width, height, bytes(idat)
+
+
+def read_png(filename):
+    """
+    Decode 8-bit RGBA, non-interlaced PNG image (the only kind the game uses)
+    :param filename: PNG file to read
+    :return: (width, height, RGBA pixel bytes) tuple
+    """
+    width, height, idat = png_data(filename)
+    raw = zlib.decompress(idat)
+    stride = width * 4
+    pixels = bytearray()
+    prior = bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        line = bytearray(raw[start + 1:start + 1 + stride])
+        png_unfilter(line, prior, raw[start], 4)
+        pixels += line
+        prior = line
+    return width, height, bytes(pixels)
+
+
+def map_sprites(files, loader):
+    """
+    Build an images structure of the same layout as files
+    :param files: file name, list or dictionary of them
+    :param loader: callable creating an image from file name
+    :return: images structure
+    """
+    if isinstance(files, dict):
+        return {key: map_sprites(value, loader) for key, value in files.items()}
+    if isinstance(files, list):
+        return [map_sprites(value, loader) for value in files]
+    return loader(files)
+
+
+@functools.lru_cache(maxsize=None)
+def load_sprites(path=IMAGES_PATH):
+    """
+    Load sprite metadata for all the game images
+    (once per directory, the structure is shared and must not be modified)
+    :param path: images directory
+    :return: images structure with Sprite objects
+    """
+    cache = {}
+
+    def loader(name):
+        """
+        Create (or reuse) sprite for a single file
+        :param name: image file name
+        :return: Sprite object
+        """
+        if name not in cache:
+            w, h = png_size(os.path.join(path, name))
+            cache[name] = Sprite(name, w, h)
+        return cache[name]
+
+    return register_sprites(map_sprites(sprite_files, loader))
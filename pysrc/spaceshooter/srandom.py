@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+
+"""
+Seedable random streams, one per subsystem
+"""
+
+import random
+import hashlib
+
+MASK64 = (1 << 64) - 1
+
+
+def derive_seed(seed, name):
+    """
+    Derive a seed from parent seed and a name
+    (stable across runs and platforms, unlike hash())
+    :param seed: parent seed
+    :param name: stream name
+    :return: derived seed (64-bit integer)
+    """
+    digest = hashlib.sha256(f"{seed}/{name}".encode("UTF-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def new_seed():
+    """
+    Get a fresh, unpredictable session seed
+    :return: 32-bit integer
+    """
+    return random.SystemRandom().randrange(1 << 32)
+
+
+class StreamRandom(random.Random):
+    """
+    random.Random with SplitMix64 core generator: its whole state
+    is a single 64-bit integer, so it is cheap to snapshot
+    (Mersenne Twister state takes 2.5 KB)
+    """
+    def __init__(self, seed=0):
+        """
+        Create generator
+        :param seed: integer seed
+        """
+        self.state = 0
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        """
+        Seed generator
+        :param a: integer seed (None: 0)
+        :param version: unused
+        :return: None
+        """
+        self.state = (a or 0) & MASK64
+        self.gauss_next = None
+
+    def next64(self):
+        """
+        Advance generator state
+        :return: 64 random bits
+        """
+        self.state = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        return z ^ (z >> 31)
+
+    def random(self):
+        """
+        Get random float in [0, 1) range
+        :return: float number
+        """
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k):
+        """
+        Get integer with k random bits
+        :param k: number of bits
+        :return: integer number
+        """
+        value = 0
+        for shift in range(0, k, 64):
+            value |= self.next64() << shift
+        return value & ((1 << k) - 1)
+
+    def getstate(self):
+        """
+        Get generator state
+        :return: state integer
+        """
+        return self.state
+
+    def setstate(self, state):
+        """
+        Restore generator state
+        :param state: state integer (see getstate)
+        :return: None
+        """
+        self.state = state
+        self.gauss_next = None
+
+
+class RandomStreams:
+    """
+    Independent random streams, all derived from a single seed,
+    so every subsystem draws numbers in its own sequence
+    """
+    def __init__(self, seed=None):
+        """
+        Create streams
+        :param seed: base seed (None: a fresh one)
+        """
+        self.seed = new_seed() if seed is None else seed
+        self.streams = {}
+
+    def stream(self, name):
+        """
+        Get (or create) a named stream
+        :param name: stream name
+        :return: StreamRandom object
+        """
+        if name not in self.streams:
+            self.streams[name] = StreamRandom(derive_seed(self.seed, name))
+        return self.streams[name]
+
+    def fork(self, name):
+        """
+        Create child streams with a seed derived from this one
+        :param name: child name
+        :return: RandomStreams object
+        """
+        return RandomStreams(derive_seed(self.seed, name))
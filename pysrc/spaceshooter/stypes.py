@@ -269,6 +269,17 @@ class MissileType(enum.IntEnum):
     TO_SWW = 7
 
 
+@enum.unique
+class DamageSource(enum.IntEnum):
+    """
+    What took player's indicator points
+    """
+    DROP = 0
+    MISSILE = 1
+    ENEMY = 2
+    MOVABLE = 3
+
+
 @enum.unique
 class MovableType(enum.IntEnum):
     """
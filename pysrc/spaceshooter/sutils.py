@@ -4,14 +4,92 @@
 General utilities module
 """
 
+import sys
+
+
+class Cycle:
+    """
+    Iterator that cycles a list
+    (unlike a generator, it can be pickled and restored)
+    """
+    def __init__(self, my_list):
+        """
+        Create cycling iterator
+        :param my_list: List to cycle
+        """
+        self.items = my_list
+        self.pos = 0
+
+    def __iter__(self):
+        """
+        Get iterator
+        :return: self
+        """
+        return self
+
+    def __next__(self):
+        """
+        Get next item (starting over at the end of the list)
+        :return: list item
+        """
+        item = self.items[self.pos]
+        self.pos = (self.pos + 1) % len(self.items)
+        return item
+
 
 def cycle(my_list):
     """
-    Generator that cycles a list
+    Iterator that cycles a list
     :param my_list: List to cycle
-    :return: Generator handle
+    :return: Cycle handle
+    """
+    return Cycle(my_list)
+
+
+def print_usage(title, arguments, options, msg=None, about=()):
+    """
+    Print help message of a command line tool
+    :param title: tool name
+    :param arguments: arguments following the options, e.g. "[file]" (empty: none)
+    :param options: list of option descriptions
+    :param msg: error message to print first (None: no error)
+    :param about: lines describing what the tool does (printed before the options)
+    :return: None
+    """
+    if msg:
+        print(msg)
+        print()
+    print(title)
+    print()
+    print("Usage:")
+    print(f"\t{sys.argv[0]} [options]" + (f" {arguments}" if arguments else ""))
+    print()
+    for line in about:
+        print(line)
+    if about:
+        print()
+    print("where options can be one or more of the following:")
+    print()
+    for line in options:
+        print(line)
+
+
+def compact(objects, discard=None):
+    """
+    Remove invalid objects from a list in place, in a single pass
+    (the order of the remaining ones is kept)
+    :param objects: list of objects with a valid attribute
+    :param discard: function called with every removed object (if any)
+    :return: number of objects removed
     """
-    start_at = 0
-    while True:
-        yield my_list[start_at]
-        start_at = (start_at + 1) % len(my_list)
+    kept = 0
+    for obj in objects:
+        if obj.valid:
+            objects[kept] = obj
+            kept += 1
+        elif discard:
+            discard(obj)
+    removed = len(objects) - kept
+    if removed:
+        del objects[kept:]
+    return removed
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Ground strip of movables: a list sorted by x coordinate,
+with the buildings under any object found by bisection
+"""
+
+from spaceshooter.primi import Movable
+
+
+def right_edge(movable):
+    """
+    Get X coordinate of right edge of a movable (sort key of the strip)
+    :param movable: Movable object
+    :return: X coordinate
+    """
+    return movable.x + movable.w
+
+
+class Terrain(list):
+    """
+    Movables standing next to each other, from left to right.
+    All of them move at the same speed, new ones are only appended
+    right after the last one and removed ones leave gaps only,
+    so the strip stays sorted by x (and by right edge) without re-sorting.
+    """
+    def add(self, x, image, etype):
+        """
+        Append a new movable at the end of the strip
+        :param x: bottom left x position (right of the last movable)
+        :param image: associated image
+        :param etype: type of a movable
+        :return: Movable object
+        """
+        movable = Movable(x, image, etype)
+        self.append(movable)
+        return movable
+
+    def bisect(self, x):
+        """
+        Find the leftmost movable with right edge beyond x
+        (binary search by right edge, see right_edge)
+        :param x: X coordinate
+        :return: index of the movable (length of the strip if there is none)
+        """
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if right_edge(self[middle]) <= x:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def overlapping(self, x0, x1):
+        """
+        Iterate over movables overlapping horizontal range (x0, x1), left to right.
+        The strip is indexed on every step, so movables appended meanwhile
+        are visited as well.
+        :param x0: left edge of the range
+        :param x1: right edge of the range
+        :return: iterator of Movable objects
+        """
+        i = self.bisect(x0)
+        while i < len(self):
+            movable = self[i]
+            if movable.x >= x1:
+                break
+            yield movable
+            i += 1
+
+    def compact(self):
+        """
+        Remove invalid movables (the order of the remaining ones is kept)
+        :return: number of movables removed
+        """
+        kept = [movable for movable in self if movable.valid]
+        removed = len(self) - len(kept)
+        if removed:
+            self[:] = kept
+        return removed
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+
+"""
+Vectorized headless environments for automated players:
+a batch of independent games stepped in lockstep,
+with observations, rewards and done flags as NumPy arrays
+(NumPy is only needed by this module)
+"""
+
+from collections import namedtuple
+import numpy as np
+from spaceshooter.stypes import UserInput, Options, Mode, MissileType
+from spaceshooter.sprites import load_sprites
+from spaceshooter.simulation import GameState
+from spaceshooter.sclock import ticks
+from spaceshooter.sdefs import ARENA_WIDTH, ARENA_HEIGHT, TIMEOUT_PLAYER_MOVE,\
+    BATCH_MAX_TICKS, MAX_LEVEL
+
+# Discrete actions: index -> user actions applied at the start of a step
+ACTIONS = [
+    (),
+    (UserInput.TOP,),
+    (UserInput.BOTTOM,),
+    (UserInput.LEFT,),
+    (UserInput.RIGHT,),
+    (UserInput.FIRE,),
+    (UserInput.TOP, UserInput.FIRE),
+    (UserInput.BOTTOM, UserInput.FIRE),
+    (UserInput.LEFT, UserInput.FIRE),
+    (UserInput.RIGHT, UserInput.FIRE),
+    (UserInput.BOMB,),
+    (UserInput.TNT,)
+]
+
+MOVES = (UserInput.TOP, UserInput.BOTTOM, UserInput.LEFT, UserInput.RIGHT)
+
+NEAREST = 8  # Number of nearest threats and bonuses observed
+# Observation layout: player features, then (dx, dy, present)
+# of NEAREST threats, then of NEAREST bonuses:
+PLAYER_FEATURES = 9
+OBSERVATION_SIZE = PLAYER_FEATURES + 2 * 3 * NEAREST
+
+
+class EnvParams(namedtuple('EnvParams', ('option', 'seed', 'frame_skip', 'hit_penalty',
+                                         'max_ticks'),
+                           defaults=(Options.NORMAL, 0, ticks(TIMEOUT_PLAYER_MOVE), 1.0,
+                                     BATCH_MAX_TICKS))):
+    """
+    Parameters of vectorized environments (see VectorEnv):
+    * option -- game Options
+    * seed -- base seed (game index is added to it)
+    * frame_skip -- number of ticks per step
+    * hit_penalty -- reward lost per indicator point lost
+    * max_ticks -- max number of ticks a single game may take
+    """
+    __slots__ = ()
+
+
+def threats(state):
+    """
+    Get all the objects that can hurt the player
+    :param state: GameState object
+    :return: generator of game objects
+    """
+    yield from state.enemymanager.enemies
+    if state.enemymanager.boss:
+        yield state.enemymanager.boss
+    for missile in state.entities['missiles']:
+        if missile.etype != MissileType.FROM:
+            yield missile
+    yield from state.entities['drops']
+
+
+def bonuses(state):
+    """
+    Get all the objects the player can catch
+    :param state: GameState object
+    :return: generator of game objects
+    """
+    yield from state.entities.objects('medkits', 'shields', 'tnts', 'lightballs', 'iceboxes')
+
+
+class VectorEnv:
+    """
+    Batch of independent headless games stepped in lockstep.
+    Every step applies one action per game, then runs a number of ticks.
+    Finished games (game over, congrats or out of ticks) are reset
+    automatically, with a new game of the same session.
+    """
+    def __init__(self, num_envs, params=EnvParams()):
+        """
+        Create environments (call reset before stepping)
+        :param num_envs: number of games
+        :param params: EnvParams object
+        """
+        images = load_sprites()
+        self.num_envs = num_envs
+        self.params = params
+        self.states = [GameState(images, params.option, seed=params.seed + i)
+                       for i in range(num_envs)]
+        self.start_tick = np.zeros(num_envs, dtype=np.int64)
+        self.points = np.zeros(num_envs, dtype=np.int64)
+        self.health = np.zeros(num_envs, dtype=np.int64)
+        self.observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        self.centers = np.zeros((num_envs, 2), dtype=np.float32)  # Player centers
+
+    def __reset_env(self, i):
+        """
+        Start a new game and run it until it is playable
+        :param i: game index
+        :return: None
+        """
+        state = self.states[i]
+        state.change_mode(Mode.INIT)
+        while state.mode != Mode.PLAY:
+            state.step()
+        self.start_tick[i] = state.tick
+
+    def __counters(self):
+        """
+        Get points and health (lives and indicators together) of all the games
+        :return: (points, health) arrays
+        """
+        points = np.fromiter((x.points for x in self.states), np.int64, self.num_envs)
+        health = np.fromiter((10 * x.lives + x.indicators for x in self.states),
+                             np.int64, self.num_envs)
+        return points, health
+
+    def __nearest(self, group, column):
+        """
+        Fill observation slots with nearest objects of all the games
+        :param group: function: GameState -> game objects
+        :param column: first observation column of the slots
+        :return: None
+        """
+        owners = []
+        boxes = []
+        for i, state in enumerate(self.states):
+            for obj in group(state):
+                owners.append(i)
+                boxes.append((obj.x, obj.y, obj.w, obj.h))
+        slots = self.observations[:, column:column + 3 * NEAREST].reshape(-1, NEAREST, 3)
+        slots[:] = 0.0
+        if not owners:
+            return
+        owners = np.array(owners, dtype=np.intp)
+        boxes = np.array(boxes, dtype=np.float32)
+        dx = (boxes[:, 0] + boxes[:, 2] / 2) / ARENA_WIDTH - self.centers[owners, 0]
+        dy = (boxes[:, 1] + boxes[:, 3] / 2) / ARENA_HEIGHT - self.centers[owners, 1]
+        # Rank objects by distance within their own game:
+        order = np.lexsort((dx * dx + dy * dy, owners))
+        owners = owners[order]
+        first = np.searchsorted(owners, np.arange(self.num_envs))
+        rank = np.arange(len(owners)) - first[owners]
+        keep = rank < NEAREST
+        slots[owners[keep], rank[keep]] = np.stack(
+            (dx[order][keep], dy[order][keep], np.ones(keep.sum(), dtype=np.float32)), axis=1)
+
+    def __observe(self):
+        """
+        Build observations of all the games
+        :return: observations array (num_envs x OBSERVATION_SIZE)
+        """
+        obs = self.observations
+        for i, state in enumerate(self.states):
+            player = state.player
+            obs[i, :PLAYER_FEATURES] = (
+                player.x / ARENA_WIDTH,
+                player.y / ARENA_HEIGHT,
+                state.indicators / 10,
+                state.lives / 3,
+                state.tnt / 3,
+                state.is_active('shield'),
+                state.is_active('freeze'),
+                state.is_active('light'),
+                state.level / MAX_LEVEL)
+        self.centers = obs[:, :2] + np.array(
+            [[x.player.w / 2 / ARENA_WIDTH, x.player.h / 2 / ARENA_HEIGHT]
+             for x in self.states], dtype=np.float32)
+        self.__nearest(threats, PLAYER_FEATURES)
+        self.__nearest(bonuses, PLAYER_FEATURES + 3 * NEAREST)
+        return obs.copy()
+
+    def reset(self):
+        """
+        Start new games in all the environments
+        :return: observations array (num_envs x OBSERVATION_SIZE)
+        """
+        for i in range(self.num_envs):
+            self.__reset_env(i)
+        self.points, self.health = self.__counters()
+        return self.__observe()
+
+    def step(self, actions):
+        """
+        Apply one action per game, then run frame_skip ticks of all the games
+        :param actions: array of ACTIONS indexes (one per game)
+        :return: (observations, rewards, dones) arrays
+        """
+        dones = np.zeros(self.num_envs, dtype=bool)
+        for i, (state, action) in enumerate(zip(self.states, actions)):
+            if state.mode == Mode.PLAY:
+                for user_input in ACTIONS[action]:
+                    if user_input in MOVES:
+                        state.move_player(user_input)
+                    else:
+                        state.use_weapon(user_input)
+            for _ in range(self.params.frame_skip):
+                state.step()
+                if state.mode == Mode.KILLED:
+                    # The same as pressing Enter when killed:
+                    state.process_killed()
+                    state.change_mode(Mode.PLAY)
+                elif state.mode in (Mode.GAMEOVER, Mode.CONGRATS):
+                    break
+            dones[i] = state.mode in (Mode.GAMEOVER, Mode.CONGRATS) or \
+                state.tick - self.start_tick[i] >= self.params.max_ticks
+        points, health = self.__counters()
+        rewards = (points - self.points) - \
+            self.params.hit_penalty * np.maximum(self.health - health, 0)
+        for i in np.flatnonzero(dones):
+            self.__reset_env(i)
+        self.points, self.health = self.__counters()
+        return self.__observe(), rewards.astype(np.float32), dones
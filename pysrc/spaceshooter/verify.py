@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+"""
+Replay verifier: re-simulates a corpus of recorded sessions
+across a process pool and checks them against recorded
+state hashes and final results
+"""
+
+import os
+import sys
+import time
+import getopt
+import multiprocessing
+from spaceshooter.replay import ReplayReader, headless_game, feed, CHECK, END
+from spaceshooter.sutils import print_usage
+
+REPLAY_SUFFIX = ".ssr"
+
+
+def verify_replay(filename):
+    """
+    Re-simulate a single replay and compare it with what was recorded
+    :param filename: replay file
+    :return: dictionary with verification results
+    """
+    start = time.perf_counter()
+    result = {
+        'file': os.fspath(filename),
+        'checks': 0,
+        'last_match': 0,
+        'divergence': None,
+        'expected': None,
+        'actual': None,
+        'ticks': 0,
+        'error': None
+    }
+    try:
+        reader = ReplayReader(filename)
+        records = reader.records()
+    except (OSError, ValueError, IndexError) as e:
+        result['error'] = str(e)
+        result['seconds'] = time.perf_counter() - start
+        return result
+    game = headless_game(reader.header)
+
+    def check(digest):
+        """
+        Compare recorded state hash with the simulated one
+        :param digest: recorded state hash
+        :return: None
+        """
+        result['checks'] += 1
+        if result['divergence'] is not None:
+            return
+        if game.state.digest() == digest:
+            result['last_match'] = game.clock.ticks
+        else:
+            result['divergence'] = game.clock.ticks
+
+    def end(results):
+        """
+        Store recorded final results
+        :param results: (points, level, lives) tuple
+        :return: None
+        """
+        result['expected'] = results
+
+    feed(game, records, extra={CHECK: check, END: end})
+    result['actual'] = (game.state.points, game.state.level, game.state.lives)
+    result['ticks'] = game.clock.ticks
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def is_valid(result):
+    """
+    Check if a replay verified fine
+    :param result: verification results (see verify_replay)
+    :return: True if valid, False otherwise
+    """
+    return result['error'] is None and result['divergence'] is None and \
+        result['expected'] == result['actual']
+
+
+def find_replays(directory):
+    """
+    Find all the replay files in a directory tree
+    :param directory: directory to search
+    :return: sorted list of file paths
+    """
+    found = []
+    for root, _, files in os.walk(directory):
+        found += [os.path.join(root, x) for x in files if x.endswith(REPLAY_SUFFIX)]
+    return sorted(found)
+
+
+def verify_all(directory, processes=None):
+    """
+    Verify all the replays of a directory across a process pool
+    :param directory: directory with replay files
+    :param processes: number of worker processes (None: all the cores)
+    :return: list of verification results, in file order
+    """
+    files = find_replays(directory)
+    if not files:
+        return []
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(verify_replay, files, chunksize=1)
+    return results
+
+
+def report(results, seconds):
+    """
+    Print verification results: failures in details, then totals
+    :param results: list of verification results (see verify_replay)
+    :param seconds: total wall time
+    :return: number of failed replays
+    """
+    failed = [x for x in results if not is_valid(x)]
+    for result in failed:
+        if result['error'] is not None:
+            print(f"{result['file']}: unreadable: {result['error']}")
+        elif result['divergence'] is not None:
+            print(f"{result['file']}: diverged at tick {result['divergence']} "
+                  f"(last matching check at tick {result['last_match']})")
+        else:
+            print(f"{result['file']}: final (points, level, lives) "
+                  f"{result['actual']}, recorded {result['expected']}")
+    speed = len(results) * 60 / seconds if seconds > 0 else 0
+    ticks = sum(x['ticks'] for x in results)
+    print(f"{len(results)} replays, {len(failed)} failed, "
+          f"{ticks} ticks in {seconds:.1f}s ({speed:.0f} replays/min)")
+    return len(failed)
+
+
+def __usage__(msg=None):
+    print_usage("Spaceshooter replay verifier", "directory", [
+        "-j processes -- number of worker processes (default: all the cores)",
+        "-h -- print this help message and terminate"], msg)
+
+
+if __name__ == "__main__":
+    verify_params = {'processes': None}
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "j:h", [])
+        for o, a in opts:
+            if o == "-j":
+                verify_params['processes'] = int(a)
+            elif o == "-h":
+                __usage__()
+                sys.exit(0)
+        if len(args) != 1:
+            raise ValueError("Exactly one replay directory expected")
+    except (getopt.GetoptError, ValueError) as ge:
+        __usage__(str(ge))
+        sys.exit(1)
+    started = time.perf_counter()
+    verified = verify_all(args[0], **verify_params)
+    sys.exit(1 if report(verified, time.perf_counter() - started) else 0)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""
+Test autopilot module
+"""
+
+
+from spaceshooter.replay import Recorder, HeadlessArena, RecordedMetrics, headless_game,\
+    game_header
+from spaceshooter.verify import verify_replay
+from spaceshooter.batch import play_game
+from spaceshooter.sconfig import ShooterConfig
+from spaceshooter.slocales import locales
+from spaceshooter.stypes import Options, Board
+
+
+def test_autopilot_1():
+    """
+    Check if autopilot survives longer and scores more than random input
+    :return: None
+    """
+    autopilot = play_game((1, Options.HARD, 'autopilot', 20000))
+    random_input = play_game((1, Options.HARD, 'random', 20000))
+    assert autopilot['level'] >= 1
+    assert autopilot['points'] > random_input['points']
+    assert autopilot['lives_lost'] <= random_input['lives_lost']
+
+
+def test_autopilot_2(tmp_path):
+    """
+    Check if autopilot gets into the game on its own and its session replays fine
+    :return: None
+    """
+    game = headless_game({
+        'seed': 8,
+        'config': ShooterConfig().dumps(),
+        'metrics': {}})
+    game.arena = HeadlessArena({
+        name: RecordedMetrics(40, {label: 30 * len(label)
+                                   for lang in ['pl', 'en']
+                                   for label in locales[name][lang]})
+        for name in ['menu', 'options']})
+    game.start_recording(Recorder(tmp_path / "autopilot.ssr", game_header(game),
+                                  check_every=100))
+    game.change_board(Board.WELCOME)
+    game.set_autopilot(True)
+    game.clock.run(6000)
+    assert game.board == Board.GAME
+    assert game.state.points > 0
+    game.stop_recording()
+    result = verify_replay(tmp_path / "autopilot.ssr")
+    assert result['divergence'] is None
+    assert result['expected'] == result['actual']
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+"""
+Test batch module
+"""
+
+
+from spaceshooter.batch import play_game, run_batch, summarize, get_policy, random_policy,\
+    BatchParams
+from spaceshooter.stypes import Options
+
+
+def test_batch_1():
+    """
+    Check if a headless game is played and repeatable with the same seed
+    :return: None
+    """
+    first = play_game((7, Options.NORMAL, 'random', 6000))
+    second = play_game((7, Options.NORMAL, 'random', 6000))
+    assert first['ticks'] <= 6000
+    assert first['level'] >= 0
+    assert first['points'] == second['points']
+    assert get_policy('spaceshooter.batch:random_policy') is random_policy
+
+
+def test_batch_2():
+    """
+    Check if batch results are aggregated per option and worker
+    :return: None
+    """
+    results = run_batch(BatchParams(2, [Options.EASY, Options.HARD], processes=2, max_ticks=2000))
+    per_option, per_worker = summarize(results)
+    assert per_option[Options.EASY]['games'] == 2
+    assert per_option[Options.HARD]['games'] == 2
+    assert sum(x['ticks'] for x in per_worker.values()) == sum(x['ticks'] for x in results)
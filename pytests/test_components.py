@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+Test components module
+"""
+
+
+import math
+from spaceshooter.components import Medkits, IceBoxes, Explosions, sine_motion, animate
+from spaceshooter.primi import Rect
+from spaceshooter.sprites import load_sprites, sprite_meta
+from spaceshooter.sdefs import BONUS_SPEEDX
+
+
+def test_sine_motion_1():
+    """
+    Check if bonuses move along the sine wave column by column,
+    the ones gone past the left edge are culled and compacted
+    :return: None
+    """
+    image = load_sprites()['indicators']['medkit']
+    medkits = Medkits()
+    medkits.add(300, 200, image)
+    medkits.add(20, 200, image)
+    for _ in range(10):
+        sine_motion(medkits)
+    assert (medkits.x[0], medkits.y[0]) == (300 + 10 * BONUS_SPEEDX,
+                                            200 + int(100 * math.sin(2.28)))
+    assert medkits.valid == [True, True]
+    medkits.cull()
+    assert medkits.valid == [True, False]
+    assert [x.collides(Rect(medkits.x[0], medkits.y[0], 1, 1)) for x in medkits] == \
+        [True, False]
+    medkits.compact()
+    assert [(x.x, x.basey, x.is_valid()) for x in medkits] == [(220, 200, True)]
+    iceboxes = IceBoxes()
+    iceboxes.add(300, 200, image)
+    sine_motion(iceboxes)
+    assert iceboxes.hits(Rect(0, 0, 300, 300)) == [0]
+
+
+def test_animate_1():
+    """
+    Check if explosions are advanced frame by frame and invalidated past the last one
+    :return: None
+    """
+    images = load_sprites()['explosions'][:2]
+    explosions = Explosions()
+    explosions.add(100, 100, images)
+    explosions.add(200, 200, images[:1])
+    animate(explosions)
+    assert explosions.frame == [1, 0]
+    assert explosions.valid == [True, False]
+    meta = sprite_meta(images[1])
+    assert list(explosions.sprites()) == [(meta.image, 100 - meta.cx, 100 - meta.cy)]
+    animate(explosions)
+    explosions.compact()
+    assert len(explosions) == 0
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+"""
+Test difficulty module
+"""
+
+
+from spaceshooter.difficulty import ColumnWriter, read_columns, run_analysis, summarize,\
+    COLUMNS, DAMAGE_COLUMNS, DIED, TIMEOUT
+from spaceshooter.batch import BatchParams
+from spaceshooter.stypes import Options
+
+
+def test_difficulty_1(tmp_path):
+    """
+    Check columnar file round trip across chunks
+    :return: None
+    """
+    filename = tmp_path / "columns.ssc"
+    writer = ColumnWriter(filename, ('a', 'b'), chunk_rows=3)
+    rows = [{'a': i, 'b': -i * 1000} for i in range(10)]
+    for row in rows:
+        writer.add(row)
+    writer.close()
+    columns = read_columns(filename)
+    assert columns['a'] == list(range(10))
+    assert columns['b'] == [-i * 1000 for i in range(10)]
+
+
+def test_difficulty_2(tmp_path):
+    """
+    Check if games are broken down per level with their damage sources
+    :return: None
+    """
+    filename = tmp_path / "difficulty.ssc"
+    count = run_analysis(filename, BatchParams(2, [Options.HARD], 'idle', processes=2,
+                                               max_ticks=8000))
+    columns = read_columns(filename)
+    assert set(columns) == set(COLUMNS)
+    assert len(columns['seed']) == count
+    assert sorted(columns['seed']) == [0, 1]
+    assert set(columns['outcome']) <= {DIED, TIMEOUT}
+    hits = sum(sum(columns[name]) for name in DAMAGE_COLUMNS.values())
+    assert hits >= 10 * sum(columns['lives_lost'])
+    summary = summarize(columns)
+    assert summary[(Options.HARD, 0)]['records'] == 2
+    assert summary[(Options.HARD, 0)]['waves_per_minute'] > 0
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+"""
+Test entities module
+"""
+
+
+from spaceshooter.entities import Entities, BUCKETS
+from spaceshooter.sprites import load_sprites
+from spaceshooter.stypes import MissileType
+
+
+def test_entities_1():
+    """
+    Check if objects are spawned, counted, moved, compacted and cleared per bucket
+    :return: None
+    """
+    images = load_sprites()
+    entities = Entities()
+    assert entities.counts() == dict.fromkeys(BUCKETS, 0)
+    assert entities.spawn('medkits', 500, 100, images['indicators']['medkit']) is None
+    entities.spawn('medkits', 600, 100, images['indicators']['medkit'])
+    entities.spawn('missiles', 100, 200, images['missiles'][MissileType.FROM], MissileType.FROM)
+    enemy = entities.spawn('enemies', 700, 100, True, images['enemies'][0], speedx=-5)
+    entities.spawn('enemies', 800, 100, False, images['enemies'][0])
+    assert entities.count('medkits') == 2
+    assert entities.count('missiles') == 1
+    assert enemy.speedx == -5
+    entities.move('medkits', 'missiles')
+    assert entities['medkits'].x[0] < 500
+    assert entities['missiles'].x == [112]
+    entities['medkits'].valid[0] = False
+    enemy.valid = False
+    entities.compact()
+    assert entities.count('medkits') == 1
+    assert entities.count('enemies') == 1
+    assert [type(x).__name__ for x in entities.objects('medkits', 'missiles', 'enemies')] == \
+        ['Bonus', 'Projectile', 'Enemy']
+    assert entities.pools.stats()['Enemy']['free'] == 1
+    enemies = entities['enemies']
+    entities.clear('enemies')
+    assert len(enemies) == 1
+    assert entities.count('enemies') == 0
+    assert entities.pools.stats()['Enemy']['free'] == 2
+    assert entities.spawn('enemies', 700, 100, True, images['enemies'][0]) is enemies[0]
+    assert entities.pools.stats()['Enemy']['reused'] == 1
+
+
+def test_entities_2():
+    """
+    Check if registry state is restored with objects in use recounted
+    :return: None
+    """
+    images = load_sprites()
+    entities = Entities()
+    entities.spawn('tnts', 500, 100, images['indicators']['tnt'])
+    entities.spawn('enemies', 700, 100, True, images['enemies'][0])
+    state = entities.get_state()
+    restored = Entities()
+    restored.set_state(state)
+    assert restored.counts() == entities.counts()
+    assert restored.pools.stats()['Enemy']['in_use'] == 1
+    assert restored.memory_report()['Tnts'][0] == 1
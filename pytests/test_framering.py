@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+"""
+Test framering module
+"""
+
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from spaceshooter.framering import stream_frames, FrameParams, STATE_FIELDS
+from spaceshooter.batch import play_ticks
+from spaceshooter.render import FrameRenderer
+from spaceshooter.stypes import Options
+
+
+def test_framering_1():
+    """
+    Check if frames of games played in worker processes come through shared memory
+    :return: None
+    """
+    jobs = [(3, Options.NORMAL, 'random', 900), (4, Options.HARD, 'random', 900)]
+    frames = {}
+    for frame, state in stream_frames(jobs, FrameParams(80, 45, every=300, slots=4,
+                                                        processes=2)):
+        frames[(int(state[0]), int(state[1]))] = (frame.copy(), state.copy())
+    assert sorted(frames) == [(job, tick) for job in (0, 1) for tick in (300, 600, 900)]
+    # The same frames rendered in this process:
+    for state in play_ticks(jobs[1]):
+        if state.tick == 600:
+            expected = FrameRenderer(state.images, 80, 45).render(state)
+            frame, values = frames[(1, 600)]
+            assert (frame == expected).all()
+            assert values[STATE_FIELDS.index('points')] == state.points
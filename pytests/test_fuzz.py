@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+"""
+Test fuzz module
+"""
+
+
+import os
+from spaceshooter import fuzz
+from spaceshooter.replay import play
+from spaceshooter.stypes import Board
+
+
+def test_fuzz_1():
+    """
+    Check if guided input reaches the game and keeps all the invariants
+    :return: None
+    """
+    result = fuzz.fuzz((1, 1500, True, None))
+    assert result['failure'] is None
+    assert result['inputs'] == 1500
+    assert Board.GAME in result['boards']
+
+
+def test_fuzz_2(tmp_path, monkeypatch):
+    """
+    Check if a failure is minimized and saved as a replay
+    :return: None
+    """
+    monkeypatch.setattr(fuzz, 'MAX_OBJECTS', 0)
+    result = fuzz.fuzz((1, 1500, True, str(tmp_path)))
+    assert result['failure'][0] == 'bounded'
+    assert result['minimized'] < result['inputs']
+    assert os.path.exists(result['replay'])
+    game = play(result['replay'])
+    assert game.board == Board.GAME
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+
+"""
+Test game module
+"""
+
+
+from spaceshooter.replay import HeadlessArena, RecordedMetrics, headless_game
+from spaceshooter.sconfig import ShooterConfig
+from spaceshooter.sdefs import TURBO_BATCH_TICKS
+from spaceshooter.slocales import locales
+
+
+def test_game_1(monkeypatch):
+    """
+    Check if turbo mode repaints every given number of ticks,
+    whether fewer or more than a batch
+    :return: None
+    """
+    game = headless_game({'seed': 1, 'config': ShooterConfig().dumps(), 'metrics': {}})
+    game.arena = HeadlessArena({
+        name: RecordedMetrics(40, {label: 30 * len(label)
+                                   for lang in ['pl', 'en']
+                                   for label in locales[name][lang]})
+        for name in ['menu', 'options']})
+    painted = []
+    monkeypatch.setattr(game, 'game_paint_event', lambda: painted.append(game.clock.ticks))
+    for render_every in (7, TURBO_BATCH_TICKS + 50):
+        start = game.clock.ticks
+        del painted[:]
+        game.set_turbo(True, render_every)
+        for _ in range(6):
+            game.frame_event()
+        assert painted[:3] == [start + render_every * i for i in (1, 2, 3)]
+    game.set_turbo(True, 0)
+    start = game.clock.ticks
+    del painted[:]
+    game.frame_event()
+    assert game.clock.ticks == start + TURBO_BATCH_TICKS
+    assert not painted
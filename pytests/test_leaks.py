@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+
+"""
+Test leaks module
+"""
+
+
+from spaceshooter.batch import play_game, check_leaks, leaking
+from spaceshooter.entities import Entities, BUCKETS
+from spaceshooter.leaks import LeakDetector
+from spaceshooter.stypes import Options
+
+
+def test_leak_detector_1():
+    """
+    Check if game object lists stay bounded over a long headless run,
+    with no invalid objects retained after the game updates
+    :return: None
+    """
+    detector = LeakDetector(window=500, windows=4)
+    result = play_game((1, Options.HARD, 'autopilot', 12000), detector)
+    report = detector.report()
+    assert set(report) == set(BUCKETS)
+    assert report['movables'][1] > 0
+    assert all(retained == 0 for _, _, _, retained in report.values())
+    assert detector.growing() == []
+    assert not leaking([result, check_leaks((1, Options.EASY, 'autopilot', 3000))])
+
+
+def test_leak_detector_2(monkeypatch):
+    """
+    Check if lists never compacted are told as growing without bound
+    :return: None
+    """
+    monkeypatch.setattr(Entities, 'compact', lambda self, *names: None)
+    detector = LeakDetector(window=500, windows=4)
+    result = play_game((1, Options.HARD, 'autopilot', 6000), detector)
+    assert 'missiles' in result['growing']
+    assert detector.report()['missiles'][3] > 0
+    assert leaking([result])
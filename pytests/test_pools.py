@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+Test pools module
+"""
+
+
+from spaceshooter.pools import Pool, Pools
+from spaceshooter.primi import Enemy
+from spaceshooter.batch import play_ticks
+from spaceshooter.stypes import Options
+
+
+def test_pool_1():
+    """
+    Check if released objects are reset and handed out again,
+    up to the cap
+    :return: None
+    """
+    pool = Pool(Enemy, cap=1)
+    first = pool.acquire(10, 20, True, None, speedx=-5)
+    second = pool.acquire(30, 40, False, None)
+    first.valid = False
+    pool.release(first)
+    pool.release(second)
+    third = pool.acquire(50, 60, False, None, radius=7)
+    assert third is first
+    assert (third.x, third.y, third.spot_x, third.odd, third.radius, third.speedx,
+            third.valid) == (50, 60, 50, False, 7, 0, True)
+    assert pool.stats() == {'created': 2, 'reused': 1, 'dropped': 1, 'in_use': 1,
+                            'high_water': 2, 'free': 0}
+
+
+def test_pools_1():
+    """
+    Check if invalid objects are given back and a whole game hardly allocates
+    :return: None
+    """
+    pools = Pools((Enemy,))
+    objects = [pools.acquire(Enemy, 0, 0, True, None), pools.acquire(Enemy, 0, 0, False, None)]
+    objects[0].valid = False
+    kept = objects[1:]
+    assert pools.compact(objects) == 1
+    assert objects == kept
+    assert pools.stats()['Enemy']['free'] == 1
+    for state in play_ticks((1, Options.HARD, 'autopilot', 40000)):
+        pass
+    stats = state.entities.pools.stats()['Enemy']
+    assert stats['reused'] > 10 * stats['created']
@@ -5,7 +5,9 @@ Test primi module
 """
 
 
-from spaceshooter.primi import Rect
+import inspect
+from spaceshooter import primi
+from spaceshooter.primi import Rect, Player, memory_report
 
 
 def test_rect_1():
@@ -28,3 +30,32 @@ def test_rect_2():
     rect = Rect(1, 2, 5, 6)
     assert rect.contains(3, 3)
     assert not rect.contains(1, 1)
+
+
+def test_slots_1():
+    """
+    Check if all the game objects are slotted
+    :return: None
+    """
+    for _, cls in inspect.getmembers(primi, inspect.isclass):
+        if cls.__module__ == primi.__name__:
+            assert '__slots__' in cls.__dict__
+            assert '__dict__' not in dir(cls)
+
+
+def test_player_1():
+    """
+    Check if shield rectangle follows the player
+    and memory is reported per type
+    :return: None
+    """
+    player = Player(100, 200, None)
+    player.go_right()
+    player.go_down()
+    assert (player.shieldx, player.shieldy) == (100, 200)
+    assert (player.shieldw, player.shieldh) == (2 * Player.offset - 1, 2 * Player.offset - 1)
+    report = memory_report([player, Rect(1, 2, 3, 4), Rect(5, 6, 7, 8)])
+    assert report['Rect'][0] == 2
+    assert report['Player'][0] == 1
+    assert report['Rect'][1] < 2 * report['Player'][1]
+
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+"""
+Test projectiles module
+"""
+
+
+from spaceshooter.projectiles import Missiles, Drops
+from spaceshooter.primi import Rect
+from spaceshooter.sprites import load_sprites
+from spaceshooter.stypes import MissileType
+from spaceshooter.sdefs import ARENA_WIDTH
+
+
+def test_projectiles_1():
+    """
+    Check if projectiles are moved, culled and compacted column by column
+    :return: None
+    """
+    images = load_sprites()
+    missiles = Missiles()
+    missiles.add(100, 200, images['missiles'][MissileType.FROM], MissileType.FROM)
+    missiles.add(ARENA_WIDTH - 5, 200, images['missiles'][MissileType.FROM], MissileType.FROM)
+    missiles.add(100, 200, images['missiles'][MissileType.TO_NW], MissileType.TO_NW)
+    missiles.move()
+    assert missiles.x == [112, ARENA_WIDTH + 7, 88]
+    assert missiles.y == [200, 200, 188]
+    assert missiles.valid == [True, True, True]
+    missiles.cull()
+    assert missiles.valid == [True, False, True]
+    missiles.compact()
+    assert [(x.x, x.y, x.etype) for x in missiles] == [(112, 200, MissileType.FROM),
+                                                       (88, 188, MissileType.TO_NW)]
+
+
+def test_projectiles_2():
+    """
+    Check if projectiles colliding with a rectangle are found
+    :return: None
+    """
+    image = load_sprites()['indicators']['drop']
+    drops = Drops()
+    for x in (0, 500, 1000):
+        drops.add(x, 0, image)
+    rect = Rect(490, 0, 20, 20)
+    assert drops.hits(rect) == [1]
+    assert [x.collides(rect) for x in drops] == [False, True, False]
+    assert drops.hits(None) == []
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+"""
+Test render module
+"""
+
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from spaceshooter.render import FrameRenderer, BACKGROUND
+from spaceshooter.simulation import GameState
+from spaceshooter.sprites import load_sprites
+from spaceshooter.stypes import Mode
+
+
+def test_render_1():
+    """
+    Check if the play field is rendered at low resolution
+    :return: None
+    """
+    state = GameState(load_sprites(), seed=1)
+    state.change_mode(Mode.INIT)
+    frame = FrameRenderer(state.images, 160, 90).render(state)
+    assert frame.shape == (90, 160, 3)
+    assert frame.dtype == np.uint8
+    assert tuple(frame[0, 0]) == BACKGROUND
+    # Player sprite is somewhere around its position:
+    x = int(state.player.x * 160 / 1920)
+    y = int(state.player.y * 90 / 1080)
+    assert (frame[y:y + 6, x:x + 10] != BACKGROUND).any()
+    gray = FrameRenderer(state.images, 80, 45, grayscale=True).render(state)
+    assert gray.shape == (45, 80)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""
+Test replay module
+"""
+
+
+import random
+from spaceshooter.replay import Recorder, HeadlessArena, RecordedMetrics, read_replay,\
+    headless_game, game_header, play, seek, feed, encode_varint, decode_varint
+from spaceshooter.sconfig import ShooterConfig
+from spaceshooter.slocales import locales
+from spaceshooter.stypes import Key, Board, MouseButton, MouseEvent
+
+
+def __header():
+    """
+    Build replay header with default configuration
+    :return: replay header
+    """
+    game = headless_game({
+        'seed': 5,
+        'config': ShooterConfig().dumps(),
+        'metrics': {}})
+    game.arena = HeadlessArena({
+        name: RecordedMetrics(40, {label: 30 * len(label)
+                                   for lang in ['pl', 'en']
+                                   for label in locales[name][lang]})
+        for name in ['menu', 'options']})
+    return game_header(game)
+
+
+def test_varint_1():
+    """
+    Check varint encoding round trip
+    :return: None
+    """
+    data = bytearray()
+    values = [0, 1, 127, 128, 300, 1 << 40]
+    for value in values:
+        encode_varint(value, data)
+    pos = 0
+    for value in values:
+        decoded, pos = decode_varint(data, pos)
+        assert decoded == value
+    assert len(data) == 1 + 1 + 1 + 2 + 2 + 6
+
+
+def test_replay_1(tmp_path):
+    """
+    Check if a recorded session replays to the very same game state
+    :return: None
+    """
+    filename = tmp_path / "session.ssr"
+    header = __header()
+    game = headless_game(header)
+    game.start_recording(Recorder(filename, header, 'lzma'))
+    rng = random.Random(1)
+    game.mouse_pressed(MouseEvent(10.5, 20.25, MouseButton.LEFT))
+    game.clock.run(300)
+    for key in [Key.KEY_ENTER, Key.KEY_ENTER]:
+        game.keyreleased(key)
+        game.clock.run(10)
+    assert game.board == Board.GAME
+    for _ in range(2000):
+        game.clock.run(rng.randint(1, 60))
+        game.keypressed(rng.choice([Key.KEY_TOP, Key.KEY_BOTTOM, Key.KEY_LEFT, Key.KEY_RIGHT]))
+        game.keyreleased(Key.KEY_SPACE)
+    game.stop_recording()
+    _, records = read_replay(filename)
+    assert records[0][2].x == 10.5
+    assert filename.stat().st_size < 8192
+    played = play(filename)
+    assert played.clock.ticks == game.clock.ticks
+    assert played.state.points == game.state.points
+    assert played.state.mode == game.state.mode
+    assert played.state.player.x == game.state.player.x
+
+
+def test_replay_2(tmp_path):
+    """
+    Check if seeking to a keyframe gives the same game as replaying from the beginning
+    :return: None
+    """
+    filename = tmp_path / "session.ssr"
+    header = __header()
+    game = headless_game(header)
+    game.start_recording(Recorder(filename, header, keyframe_every=500))
+    rng = random.Random(2)
+    game.mouse_pressed(MouseEvent(10.5, 20.25, MouseButton.LEFT))
+    game.clock.run(300)
+    for key in [Key.KEY_ENTER, Key.KEY_ENTER]:
+        game.keyreleased(key)
+        game.clock.run(10)
+    assert game.board == Board.GAME
+    for _ in range(200):
+        game.clock.run(rng.randint(1, 60))
+        game.keypressed(rng.choice([Key.KEY_TOP, Key.KEY_BOTTOM, Key.KEY_LEFT, Key.KEY_RIGHT]))
+        game.keyreleased(Key.KEY_SPACE)
+    game.stop_recording()
+    tick = game.clock.ticks * 3 // 4
+    seeked = seek(filename, tick)
+    fed = headless_game(header)
+    feed(fed, read_replay(filename)[1], tick)
+    assert seeked.clock.get_state() == fed.clock.get_state()
+    assert seeked.state.wheel.dump() == fed.state.wheel.dump()
+    assert seeked.state.points == fed.state.points
+    assert (seeked.state.player.x, seeked.state.player.y) == (fed.state.player.x, fed.state.player.y)
+    assert [(m.x, m.y) for m in seeked.state.entities['movables']] == \
+        [(m.x, m.y) for m in fed.state.entities['movables']]
+    assert seeked.state.streams.stream('enemies').getstate() == \
+        fed.state.streams.stream('enemies').getstate()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""
+Test sclock module
+"""
+
+
+from spaceshooter.sclock import Clock, TimerWheel, ticks
+from spaceshooter.sdefs import TIMEOUT_TICK
+
+
+def test_clock_1():
+    """
+    Check if jobs are run according to their periods
+    :return: None
+    """
+    calls = []
+    clock = Clock()
+    clock.add('fast', lambda: calls.append('fast'))
+    clock.add('slow', lambda: calls.append('slow'))
+    clock.start('fast', TIMEOUT_TICK)
+    clock.start('slow', 4 * TIMEOUT_TICK)
+    clock.run(8)
+    assert calls.count('fast') == 8
+    assert calls.count('slow') == 2
+    clock.stop('slow')
+    clock.run(4)
+    assert calls.count('slow') == 2
+
+
+def test_clock_2():
+    """
+    Check if late frames are caught up to the limit and the rest is skipped
+    :return: None
+    """
+    clock = Clock(max_catchup=10)
+    assert clock.advance(2.5 * TIMEOUT_TICK) == 2
+    assert clock.advance(0.5 * TIMEOUT_TICK) == 1
+    assert clock.advance(100 * TIMEOUT_TICK) == 10
+    assert clock.skipped == 90
+    assert clock.ticks == 13
+    assert ticks(0) == 1
+
+
+def test_timer_wheel_1():
+    """
+    Check if timers expire at their ticks, also past a full wheel turn,
+    and cancelled ones do not
+    :return: None
+    """
+    wheel = TimerWheel(size=8)
+    assert wheel.schedule('short', 3) == 3
+    wheel.schedule('long', 19)
+    wheel.schedule('cancelled', 3)
+    wheel.cancel('cancelled')
+    expired = {}
+    for _ in range(20):
+        for name in wheel.advance():
+            expired[name] = wheel.tick
+    assert expired == {'short': 3, 'long': 19}
+    assert not wheel.is_scheduled('long')
+
+
+def test_timer_wheel_2():
+    """
+    Check if wheel state survives dump and load
+    :return: None
+    """
+    wheel = TimerWheel(size=8)
+    wheel.schedule('shield', 10)
+    wheel.advance()
+    other = TimerWheel(size=8)
+    other.load(wheel.dump())
+    assert other.remaining('shield') == 9
+    assert other.expires_at('shield') == 10
+    for _ in range(9):
+        expired = other.advance()
+    assert expired == ['shield']
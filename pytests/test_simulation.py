@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""
+Test simulation module
+"""
+
+
+from spaceshooter.sprites import load_sprites
+from spaceshooter.simulation import GameState
+from spaceshooter.sclock import ticks
+from spaceshooter.sdefs import TIMEOUT_GET_READY, SHIELD_TIMER, ARENA_HEIGHT
+from spaceshooter.stypes import Mode, UserInput, Options
+
+
+def test_game_state_1():
+    """
+    Check if a new game gets prepared without Qt
+    :return: None
+    """
+    state = GameState(load_sprites())
+    state.change_mode(Mode.INIT)
+    assert state.mode == Mode.PREPARE
+    assert state.level == 0
+    assert state.player is not None
+    assert state.entities.count('movables') > 0
+
+
+def test_game_state_2():
+    """
+    Check if the game starts after get-ready countdown
+    and player can shoot
+    :return: None
+    """
+    state = GameState(load_sprites())
+    state.change_mode(Mode.INIT)
+    for _ in range(4 * ticks(TIMEOUT_GET_READY)):
+        state.step()
+    assert state.mode == Mode.PLAY
+    state.use_weapon(UserInput.FIRE)
+    assert state.entities.count('missiles') == 1
+
+
+def test_game_state_3():
+    """
+    Check if shield timer is paused with the game and expires when played
+    :return: None
+    """
+    state = GameState(load_sprites(), Options.UNLIMITED)
+    state.change_mode(Mode.INIT)
+    for _ in range(4 * ticks(TIMEOUT_GET_READY)):
+        state.step()
+    state.wheel.schedule('shield', ticks(SHIELD_TIMER * 1000))
+    assert state.seconds_left('shield') == SHIELD_TIMER
+    state.change_mode(Mode.PAUSED)
+    for _ in range(ticks(SHIELD_TIMER * 1000)):
+        state.step()
+    assert state.is_active('shield')
+    state.change_mode(Mode.PLAY)
+    for _ in range(ticks(SHIELD_TIMER * 1000)):
+        state.step()
+    assert not state.is_active('shield')
+
+
+def test_game_state_4():
+    """
+    Check if the same session seed plays exactly the same game
+    :return: None
+    """
+    results = []
+    for _ in range(2):
+        state = GameState(load_sprites(), Options.UNLIMITED, seed=3)
+        state.change_mode(Mode.INIT)
+        for i in range(20000):
+            state.step()
+            if state.mode == Mode.PLAY and i % 10 == 0:
+                state.use_weapon(UserInput.FIRE)
+        results.append((state.points, state.level,
+                        [(x.x, x.y) for x in state.entities['drops']],
+                        [(x.x, x.y) for x in state.stars]))
+    assert results[0] == results[1]
+
+
+def test_game_state_5():
+    """
+    Check if objects gone off the screen are culled before collision checks
+    :return: None
+    """
+    images = load_sprites()
+    state = GameState(images, Options.UNLIMITED, seed=1)
+    state.change_mode(Mode.INIT)
+    for _ in range(4 * ticks(TIMEOUT_GET_READY)):
+        state.step()
+    movable = state.entities['movables'][0]
+    movable.x = -10
+    state.entities.spawn('bombs', 1, movable.y, images['indicators']['bomb'])
+    state.entities.spawn('meteorites', 100, ARENA_HEIGHT - 1, images['indicators']['bomb'])
+    points = state.points
+    state.game_update_event()
+    assert movable.is_valid()
+    assert state.points == points
+    assert state.entities.count('bombs') == 0
+    assert state.entities.count('meteorites') == 0
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Test snapshot module
+"""
+
+
+import pickle
+import random
+import pytest
+from spaceshooter.replay import HeadlessArena, RecordedMetrics, headless_game
+from spaceshooter.batch import random_policy, apply_action
+from spaceshooter.sconfig import ShooterConfig
+from spaceshooter.slocales import locales
+from spaceshooter.stypes import Key, Board, Mode
+from spaceshooter.snapshot import ImageIndex
+from spaceshooter.sprites import load_sprites
+from spaceshooter.primi import Rect
+
+
+def __play(game, rng, count):
+    """
+    Play a number of ticks with random input
+    :param game: Game object
+    :param rng: random.Random object
+    :param count: number of ticks
+    :return: None
+    """
+    for _ in range(count):
+        game.clock.run(1)
+        state = game.state
+        if state.mode == Mode.PLAY and state.tick % 20 == 0:
+            for action in random_policy(state, rng):
+                apply_action(state, action)
+        if state.mode == Mode.KILLED:
+            state.process_killed()
+            state.change_mode(Mode.PLAY)
+
+
+def test_snapshot_1():
+    """
+    Check if a restored game continues exactly like the original one
+    :return: None
+    """
+    game = headless_game({
+        'seed': 11,
+        'config': ShooterConfig().dumps(),
+        'metrics': {}})
+    game.arena = HeadlessArena({
+        name: RecordedMetrics(40, {label: 30 * len(label)
+                                   for lang in ['pl', 'en']
+                                   for label in locales[name][lang]})
+        for name in ['menu', 'options']})
+    for key in [Key.KEY_ENTER, Key.KEY_ENTER, Key.KEY_ENTER]:
+        game.keyreleased(key)
+        game.clock.run(10)
+    assert game.board == Board.GAME
+    __play(game, random.Random(1), 3000)
+    data = game.snapshot()
+    __play(game, random.Random(2), 1000)
+    expected = game.state.digest()
+    game.restore(data)
+    __play(game, random.Random(2), 1000)
+    assert game.state.digest() == expected
+    assert game.state.player.image is game.state.images['players'][game.state.player_index]
+
+
+def test_snapshot_2():
+    """
+    Check if snapshots with globals other than game types are rejected
+    :return: None
+    """
+    index = ImageIndex(load_sprites())
+    for module, name in [('os', 'system'), ('spaceshooter.replay', 'Recorder'),
+                         ('spaceshooter.sutils', 'print_usage'),
+                         ('spaceshooter.primi', 'Rect.__class__')]:
+        data = f"c{module}\n{name}\n(S'true'\ntR.".encode()
+        with pytest.raises(pickle.UnpicklingError):
+            index.loads(data)
+    rect = index.loads(index.dumps(Rect(1, 2, 3, 4)))
+    assert (rect.x, rect.y, rect.w, rect.h) == (1, 2, 3, 4)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+Test sprites module
+"""
+
+
+import os
+from spaceshooter.sprites import load_sprites, map_sprites, read_png, png_size, sprite_meta,\
+    METADATA, IMAGES_PATH
+
+
+def test_load_sprites_1():
+    """
+    Check if sprite dimensions are read from PNG files
+    :return: None
+    """
+    images = load_sprites()
+    assert images['star'].width() == 20
+    assert images['star'].height() == 20
+    assert images['boss'].width() == 400
+
+
+def test_sprite_meta_1():
+    """
+    Check if metadata is built at load time and shared by all the users of an image
+    :return: None
+    """
+    images = load_sprites()
+    assert load_sprites() is images
+    boss = images['boss']
+    assert id(boss) in METADATA
+    meta = sprite_meta(boss)
+    assert sprite_meta(boss) is meta
+    assert meta.image is boss
+    assert (meta.w, meta.h) == (boss.width(), boss.height())
+    assert (meta.cx, meta.cy) == (boss.width() // 2, boss.height() // 2)
+
+
+def test_map_sprites_1():
+    """
+    Check if images structure layout is preserved
+    :return: None
+    """
+    result = map_sprites({'a': ['x', 'y'], 'b': 'z'}, str.upper)
+    assert result == {'a': ['X', 'Y'], 'b': 'Z'}
+
+
+def test_read_png_1():
+    """
+    Check if PNG pixels are decoded
+    :return: None
+    """
+    width, height, pixels = read_png(os.path.join(IMAGES_PATH, 'star.png'))
+    assert (width, height) == png_size(os.path.join(IMAGES_PATH, 'star.png'))
+    assert len(pixels) == width * height * 4
+    assert pixels[3] == 0  # Transparent corner
+    assert max(pixels[3::4]) > 0
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+
+"""
+Test srandom module
+"""
+
+
+from spaceshooter.srandom import RandomStreams, derive_seed
+
+
+def test_random_streams_1():
+    """
+    Check if streams are reproducible and independent of each other
+    :return: None
+    """
+    first = RandomStreams(42)
+    second = RandomStreams(42)
+    a = [first.stream('events').random() for _ in range(5)]
+    second.stream('enemies').random()  # Drawing from other stream changes nothing
+    b = [second.stream('events').random() for _ in range(5)]
+    assert a == b
+    assert first.stream('events') is first.stream('events')
+    assert first.stream('enemies').random() != first.stream('stars').random()
+
+
+def test_random_streams_2():
+    """
+    Check if forked streams are derived from the parent seed
+    :return: None
+    """
+    streams = RandomStreams(7)
+    assert streams.fork('game-1').seed == derive_seed(7, 'game-1')
+    assert streams.fork('game-1').seed != streams.fork('game-2').seed
+    assert RandomStreams().seed is not None
@@ -5,7 +5,8 @@ Test sutils module
 """
 
 
-from spaceshooter.sutils import cycle
+from spaceshooter.sutils import cycle, compact
+from spaceshooter.primi import Meteorite
 
 
 def test_cycle_1():
@@ -20,3 +21,18 @@ def test_cycle_1():
     assert result == 1
     result = next(gen)
     assert result == 2
+
+
+def test_compact_1():
+    """
+    Check if invalid objects are removed in place, keeping the order
+    :return: None
+    """
+    meteorites = [Meteorite(x, 0, None) for x in range(6)]
+    for meteorite in meteorites[1::2]:
+        meteorite.valid = False
+    removed = []
+    assert compact(meteorites, removed.append) == 3
+    assert [x.x for x in meteorites] == [0, 2, 4]
+    assert [x.x for x in removed] == [1, 3, 5]
+    assert compact(meteorites) == 0
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+"""
+Test terrain module
+"""
+
+
+from spaceshooter.primi import Movable
+from spaceshooter.sprites import load_sprites
+from spaceshooter.stypes import MovableType
+from spaceshooter.terrain import Terrain
+
+
+def test_terrain_1():
+    """
+    Check if movables overlapping a range are found, with gaps left by removed ones
+    :return: None
+    """
+    images = load_sprites()['movables']
+    movs = [MovableType.DZIALO, MovableType.FABRYKA1, MovableType.DOM1]
+    terrain = Terrain(Movable.from_factory(movs, 400, images))
+    edges = [(movable.x, movable.x + movable.w) for movable in terrain]
+    assert list(terrain.overlapping(-10, 0)) == []
+    assert list(terrain.overlapping(0, 1)) == [terrain[0]]
+    assert list(terrain.overlapping(edges[1][0] - 1, edges[1][1] + 1)) == list(terrain)[:3]
+    assert list(terrain.overlapping(edges[1][0], edges[1][1])) == [terrain[1]]
+    terrain[1].valid = False
+    assert terrain.compact() == 1
+    assert terrain.compact() == 0
+    assert list(terrain.overlapping(edges[1][0], edges[1][1])) == []
+    last = terrain[-1]
+    found = []
+    for movable in terrain.overlapping(last.x, last.x + 2 * last.w):
+        found.append(movable)
+        if movable is last:
+            terrain.add(last.x + last.w, images[MovableType.DOM1], MovableType.DOM1)
+    assert found == [last, terrain[-1]]
+
+
+def test_terrain_2():
+    """
+    Check if bisection by right edge agrees with a linear scan, with gaps in the strip
+    :return: None
+    """
+    images = load_sprites()['movables']
+    movs = [MovableType.DZIALO, MovableType.FABRYKA1, MovableType.DOM1, MovableType.DOM1]
+    terrain = Terrain(Movable.from_factory(movs, 400, images))
+    terrain[2].valid = False
+    terrain.compact()
+    assert isinstance(terrain, list)
+    right = terrain[-1].x + terrain[-1].w
+    for x in range(-10, right + 10):
+        assert terrain.bisect(x) == \
+            next((i for i, m in enumerate(terrain) if m.x + m.w > x), len(terrain))
+    assert Terrain().bisect(0) == 0
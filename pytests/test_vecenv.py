@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+"""
+Test vecenv module
+"""
+
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from spaceshooter.vecenv import VectorEnv, EnvParams, ACTIONS, OBSERVATION_SIZE
+from spaceshooter.stypes import Options
+
+
+def test_vecenv_1():
+    """
+    Check if a batch of games is stepped in lockstep and repeatable with the same seed
+    :return: None
+    """
+    envs = [VectorEnv(3, EnvParams(Options.NORMAL, seed=5)) for _ in range(2)]
+    observations = [env.reset() for env in envs]
+    assert observations[0].shape == (3, OBSERVATION_SIZE)
+    assert np.array_equal(observations[0], observations[1])
+    rng = np.random.default_rng(1)
+    total = np.zeros(3)
+    for _ in range(400):
+        actions = rng.integers(len(ACTIONS), size=3)
+        results = [env.step(actions) for env in envs]
+        for first, second in zip(results[0], results[1]):
+            assert np.array_equal(first, second)
+        total += results[0][1]
+    assert total.any()
+
+
+def test_vecenv_2():
+    """
+    Check if finished games are reported and reset
+    :return: None
+    """
+    env = VectorEnv(2, EnvParams(Options.HARD, seed=1, max_ticks=100))
+    env.reset()
+    dones = [env.step(np.zeros(2, dtype=int))[2] for _ in range(30)]
+    assert dones[19].all()
+    assert not dones[20].any()
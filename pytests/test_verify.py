@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+"""
+Test verify module
+"""
+
+
+import random
+from spaceshooter.replay import Recorder, HeadlessArena, RecordedMetrics, headless_game,\
+    game_header
+from spaceshooter.verify import verify_replay, verify_all, is_valid
+from spaceshooter.sconfig import ShooterConfig
+from spaceshooter.slocales import locales
+from spaceshooter.stypes import Key, Board, MouseButton, MouseEvent
+
+
+def __record(filename, cheat_at=None):
+    """
+    Record a random session
+    :param filename: file to record to
+    :param cheat_at: loop iteration to add points behind replay's back at (None: never)
+    :return: None
+    """
+    game = headless_game({
+        'seed': 3,
+        'config': ShooterConfig().dumps(),
+        'metrics': {}})
+    game.arena = HeadlessArena({
+        name: RecordedMetrics(40, {label: 30 * len(label)
+                                   for lang in ['pl', 'en']
+                                   for label in locales[name][lang]})
+        for name in ['menu', 'options']})
+    game.start_recording(Recorder(filename, game_header(game), check_every=50))
+    game.mouse_pressed(MouseEvent(10.5, 20.25, MouseButton.LEFT))
+    game.clock.run(300)
+    for key in [Key.KEY_ENTER, Key.KEY_ENTER]:
+        game.keyreleased(key)
+        game.clock.run(10)
+    assert game.board == Board.GAME
+    rng = random.Random(4)
+    for i in range(100):
+        if i == cheat_at:
+            game.state.points += 1000
+        game.clock.run(rng.randint(1, 60))
+        game.keypressed(rng.choice([Key.KEY_TOP, Key.KEY_BOTTOM, Key.KEY_LEFT, Key.KEY_RIGHT]))
+        game.keyreleased(Key.KEY_SPACE)
+    game.stop_recording()
+
+
+def test_verify_1(tmp_path):
+    """
+    Check if a recorded session verifies fine
+    :return: None
+    """
+    __record(tmp_path / "good.ssr")
+    result = verify_replay(tmp_path / "good.ssr")
+    assert result['checks'] > 10
+    assert result['divergence'] is None
+    assert result['expected'] == result['actual']
+    assert is_valid(result)
+
+
+def test_verify_2(tmp_path):
+    """
+    Check if divergent and broken sessions are found in a directory
+    :return: None
+    """
+    __record(tmp_path / "good.ssr")
+    __record(tmp_path / "cheat.ssr", cheat_at=50)
+    (tmp_path / "broken.ssr").write_bytes(b"nonsense")
+    results = {x['file'].rsplit('/', 1)[-1]: x for x in verify_all(tmp_path, processes=2)}
+    assert is_valid(results['good.ssr'])
+    cheat = results['cheat.ssr']
+    assert not is_valid(cheat)
+    assert cheat['last_match'] < cheat['divergence'] <= cheat['last_match'] + 50
+    assert cheat['expected'][0] == cheat['actual'][0] + 1000
+    assert results['broken.ssr']['error'] is not None
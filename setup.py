@@ -40,5 +40,6 @@ setup(
         "Topic :: Games/Entertainment :: Side-Scrolling/Arcade Games",
         "License :: OSI Approved :: GNU General Public License (GPL)",
     ],
-    install_requires=['PySide6']
+    install_requires=['PySide6'],
+    extras_require={'agents': ['numpy']}
 )